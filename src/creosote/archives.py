@@ -0,0 +1,173 @@
+"""Read distribution metadata from container images, without extracting them.
+
+Supports a single image layer (``.tar``, ``.tar.gz``) as well as the output of
+``docker save``, which holds one tarball per layer. The archive is streamed in
+a single sequential pass, and only the ``top_level.txt`` and ``RECORD`` files
+of ``*.dist-info`` directories are read.
+
+Layers are applied in the order given by the archive's ``manifest.json``, so
+that files deleted by a later layer (whiteouts) are not picked up.
+"""
+
+import csv
+import json
+import re
+import tarfile
+import zlib
+from dataclasses import dataclass, field
+from typing import IO, cast
+
+from loguru import logger
+
+from creosote.distributions import (
+    VenvIndex,
+    normalize_name,
+    parse_metadata_dir_name,
+    parse_record,
+    parse_top_level_txt,
+)
+from creosote.models import DistributionInfo
+
+METADATA_MEMBER_PATTERN = re.compile(
+    r"(?P<dist_info>(?:.*/)?(?P<dir_name>[^/]+\.dist-info))"
+    r"/(?P<filename>top_level\.txt|RECORD)"
+)
+
+WHITEOUT_PREFIX = ".wh."
+OPAQUE_WHITEOUT = ".wh..wh..opq"
+
+
+def get_member_path(member: tarfile.TarInfo) -> str:
+    return member.name.removeprefix("./").lstrip("/")
+
+
+@dataclass(slots=True)
+class Layer:
+    """The distribution metadata found in a single image layer."""
+
+    # path of the .dist-info directory -> distribution
+    distributions: dict[str, DistributionInfo] = field(default_factory=dict)
+    # paths removed from lower layers
+    removed_paths: list[str] = field(default_factory=list)
+
+    def add_member(self, archive: tarfile.TarFile, member: tarfile.TarInfo) -> bool:
+        """Read the member if it is distribution metadata or a whiteout.
+
+        Return False if the member is of no interest.
+        """
+        path = get_member_path(member)
+        directory, _, filename = path.rpartition("/")
+        if filename == OPAQUE_WHITEOUT:
+            self.removed_paths.append(directory)
+            return True
+        if filename.startswith(WHITEOUT_PREFIX):
+            self.removed_paths.append(
+                f"{directory}/{filename[len(WHITEOUT_PREFIX) :]}".lstrip("/")
+            )
+            return True
+
+        match = METADATA_MEMBER_PATTERN.fullmatch(path)
+        if match is None or not member.isfile():
+            return False
+        parsed = parse_metadata_dir_name(match.group("dir_name"))
+        fileobj = archive.extractfile(member)
+        if parsed is None or fileobj is None:
+            return True
+
+        distribution = self.distributions.get(match.group("dist_info"))
+        if distribution is None:
+            name, version = parsed
+            distribution = DistributionInfo(
+                name=name, normalized_name=normalize_name(name), version=version
+            )
+            self.distributions[match.group("dist_info")] = distribution
+        # members of a streamed archive cannot be wrapped in io.TextIOWrapper,
+        # as they do not support seekable(), so decode line by line instead
+        with fileobj:
+            lines = (line.decode("utf-8", errors="replace") for line in fileobj)
+            if match.group("filename") == "top_level.txt":
+                distribution.top_level_import_names = parse_top_level_txt(lines)
+            else:
+                distribution.record_import_names = parse_record(lines)
+        return True
+
+
+def read_layer(fileobj: IO[bytes], name: str) -> Layer | None:
+    """Stream a (possibly compressed) layer tarball, or None if it is not one."""
+    layer = Layer()
+    archive: tarfile.TarFile | None = None
+    try:
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for member in archive:
+                _ = layer.add_member(archive, member)
+    except (EOFError, zlib.error, csv.Error, tarfile.TarError) as e:
+        # a file which is not a tarball at all, e.g. the image configuration
+        # stored with the layers of OCI images, is skipped silently
+        if archive is not None:
+            logger.warning(f"Cannot read image layer {name}: {e}")
+        return None
+    return layer
+
+
+def get_layer_order(fileobj: IO[bytes]) -> list[str]:
+    """Return the layer paths listed in the manifest.json of ``docker save``."""
+    try:
+        manifest = cast(list[dict[str, list[str]]], json.load(fileobj))
+        return list(manifest[0]["Layers"])
+    except (ValueError, LookupError, TypeError):
+        return []
+
+
+def apply_layers(layers: list[Layer]) -> dict[str, DistributionInfo]:
+    """Stack the layers, where later layers delete and replace earlier files."""
+    distributions: dict[str, DistributionInfo] = {}
+    for layer in layers:
+        for removed_path in layer.removed_paths:
+            prefix = f"{removed_path}/" if removed_path else ""
+            distributions = {
+                path: distribution
+                for path, distribution in distributions.items()
+                if path != removed_path and not path.startswith(prefix)
+            }
+        distributions.update(layer.distributions)
+    return distributions
+
+
+def index_image_archive(path: str) -> VenvIndex:
+    """Index the distributions in an image layer or ``docker save`` archive.
+
+    When a distribution is installed in more than one location in the image,
+    the one with the first path (in sorted order) is used.
+    """
+    archive_layer = Layer()
+    layers: dict[str, Layer] = {}
+    layer_order: list[str] = []
+    try:
+        with tarfile.open(path, mode="r|*") as archive:
+            for member in archive:
+                if archive_layer.add_member(archive, member) or not member.isfile():
+                    continue
+                fileobj = archive.extractfile(member)
+                if fileobj is None:
+                    continue
+                name = get_member_path(member)
+                if name == "manifest.json":
+                    layer_order = get_layer_order(fileobj)
+                elif name.endswith((".tar", ".tar.gz", ".tgz")) or name.startswith(
+                    "blobs/"
+                ):
+                    layer = read_layer(fileobj, name)
+                    if layer is not None:
+                        layers[name] = layer
+    except (OSError, EOFError, zlib.error, csv.Error, tarfile.TarError) as e:
+        logger.warning(f"Cannot read image archive {path}: {e}")
+        return VenvIndex(path)
+
+    ordered = [layers.pop(name) for name in layer_order if name in layers]
+    distributions = apply_layers([archive_layer, *ordered, *layers.values()])
+
+    index = VenvIndex(path)
+    for dist_info in sorted(distributions):
+        index.add(distributions[dist_info])
+    logger.debug(f"Found {len(index.distributions)} distributions in {path}")
+    return index
@@ -0,0 +1,252 @@
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import cast
+
+from loguru import logger
+
+from creosote.__about__ import __version__
+from creosote.distributions import (
+    VenvIndex,
+    distribution_from_json,
+    distribution_to_json,
+)
+from creosote.models import ImportInfo
+
+DEFAULT_CACHE_DIR = ".creosote_cache"
+# bumped whenever the structure or the meaning of the cache files changes
+CACHE_FORMAT_VERSION = 4
+# the files written by creosote, the only ones removed by clear_cache
+CACHE_FILE_PATTERNS = ("imports-*.json", "venvs.json", "*.tmp")
+GITIGNORE_CONTENTS = "# Automatically created by creosote.\n*\n"
+
+CachedImport = tuple[list[str], list[str], str | None]
+CachedVenv = dict[str, object]
+
+
+def write_json_atomically(path: Path, data: object) -> None:
+    """Write JSON to a temporary file first, so readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    gitignore = path.parent / ".gitignore"
+    if not gitignore.exists():
+        _ = gitignore.write_text(GITIGNORE_CONTENTS)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as outfile:
+            json.dump(data, outfile, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def read_cache_file(path: Path, key: str) -> dict[str, object] | None:
+    """Return the entries of a cache file, or None if it cannot be used."""
+    try:
+        with open(path, encoding="utf-8") as infile:
+            contents = cast(dict[str, object], json.load(infile))
+        if (contents["version"], contents["format"]) != (
+            __version__,
+            CACHE_FORMAT_VERSION,
+        ):
+            logger.debug(f"Ignoring cache {path} from another creosote version")
+            return None
+        entries = contents[key]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(entries, dict):
+        return None
+    return cast(dict[str, object], entries)
+
+
+def write_cache_file(path: Path, key: str, entries: dict[str, object]) -> None:
+    try:
+        write_json_atomically(
+            path,
+            {"version": __version__, "format": CACHE_FORMAT_VERSION, key: entries},
+        )
+    except OSError as e:
+        logger.warning(f"Could not write cache {path}: {e}")
+
+
+def clear_cache(cache_dir: str) -> None:
+    """Remove the cache files, but nothing else which is in the directory.
+
+    The directory itself is only removed if creosote created it.
+    """
+    directory = Path(cache_dir)
+    if not directory.is_dir():
+        return
+    logger.debug(f"Clearing cache in {cache_dir}")
+    for pattern in CACHE_FILE_PATTERNS:
+        for path in directory.glob(pattern):
+            path.unlink(missing_ok=True)
+    gitignore = directory / ".gitignore"
+    try:
+        if gitignore.read_text(encoding="utf-8") == GITIGNORE_CONTENTS and list(
+            directory.iterdir()
+        ) == [gitignore]:
+            gitignore.unlink()
+            directory.rmdir()
+    except OSError:
+        pass
+
+
+class ImportCache:
+    """On-disk cache of the imports found in each source file.
+
+    Entries are keyed by the absolute file path and validated against the
+    file's mtime and size. The whole cache is discarded when the creosote
+    version or the format of the cache changes. Deferred and top-level-only
+    scans (and each engine used for the latter, or notebook reader) use
+    separate files, as does each Python version, whose grammar the parsing
+    depends on.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        include_deferred: bool,
+        engine: str = "ast",
+        notebook_reader: str = "json",
+    ) -> None:
+        mode = "deferred" if include_deferred else f"top-level-{engine}"
+        if notebook_reader != "json":
+            mode += f"-{notebook_reader}"
+        mode += "-py{}{}".format(*sys.version_info[:2])
+        self.path: Path = Path(cache_dir) / f"imports-{mode}.json"
+        self.entries: dict[str, tuple[int, int, list[CachedImport]]] = {}
+        self.stats: dict[str, tuple[int, int]] = {}
+        self.modified: bool = False
+
+    def load(self) -> None:
+        entries = read_cache_file(self.path, "files")
+        if entries is not None:
+            self.entries = cast(dict[str, tuple[int, int, list[CachedImport]]], entries)
+
+    def save(self) -> None:
+        """Write the cache, without the entries of files which were removed."""
+        if not self.modified:
+            return
+        self.entries = {
+            path: entry for path, entry in self.entries.items() if os.path.exists(path)
+        }
+        write_cache_file(self.path, "files", cast(dict[str, object], self.entries))
+
+    def lookup(self, path: str) -> list[ImportInfo] | None:
+        """Return the cached imports, or None if the file is new or changed."""
+        key = os.path.abspath(path)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+        self.stats[key] = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self.entries.get(key)
+        try:
+            if entry is None or (entry[0], entry[1]) != self.stats[key]:
+                return None
+            return [
+                ImportInfo(module=tuple(module), name=tuple(name), alias=alias)
+                for module, name, alias in entry[2]
+            ]
+        except (LookupError, TypeError, ValueError):
+            # a malformed entry is a cache miss
+            return None
+
+    def store(self, path: str, imports: list[ImportInfo]) -> None:
+        key = os.path.abspath(path)
+        if key not in self.stats:
+            return
+        mtime_ns, size = self.stats[key]
+        self.entries[key] = (
+            mtime_ns,
+            size,
+            [(list(imp.module), list(imp.name), imp.alias) for imp in imports],
+        )
+        self.modified = True
+
+
+class VenvCache:
+    """On-disk cache of the distributions installed in each venv.
+
+    Entries are keyed by the absolute venv path and hold the distributions
+    found, along with the import names read from their metadata so far. An
+    entry is only used while the mtimes of the site-packages directories and
+    of every metadata directory are unchanged, so that validating it does not
+    require listing or opening any files.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.path: Path = Path(cache_dir) / "venvs.json"
+        self.entries: dict[str, CachedVenv] = {}
+        self.modified: bool = False
+        self.loaded: bool = False
+
+    def load(self) -> None:
+        if self.loaded:
+            return
+        self.loaded = True
+        entries = read_cache_file(self.path, "venvs")
+        if entries is not None:
+            self.entries = cast(dict[str, CachedVenv], entries)
+
+    def save(self) -> None:
+        """Write the cache, without the entries of venvs which were removed."""
+        if not self.modified:
+            return
+        self.entries = {
+            venv: entry for venv, entry in self.entries.items() if os.path.exists(venv)
+        }
+        write_cache_file(self.path, "venvs", cast(dict[str, object], self.entries))
+        self.modified = False
+
+    @staticmethod
+    def is_valid(stamps: dict[str, int]) -> bool:
+        for directory, mtime_ns in stamps.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def lookup(self, venv: str) -> VenvIndex | None:
+        """Return the cached index, or None if the venv is new or changed."""
+        self.load()
+        entry = self.entries.get(os.path.abspath(venv))
+        try:
+            if entry is None or not self.is_valid(
+                cast(dict[str, int], entry["stamps"])
+            ):
+                return None
+
+            index = VenvIndex(venv)
+            index.site_packages = [
+                Path(path) for path in cast(list[str], entry["site_packages"])
+            ]
+            for cached in cast(list[dict[str, object]], entry["distributions"]):
+                index.add(distribution_from_json(cached))
+        except (LookupError, TypeError, ValueError, AttributeError):
+            # a malformed entry is a cache miss
+            return None
+        logger.debug(f"Using cached index of venv {venv}")
+        return index
+
+    def store(self, index: VenvIndex) -> None:
+        if not index.site_packages:
+            return
+        key = os.path.abspath(index.venv)
+        entry: CachedVenv = {
+            "stamps": index.get_stamps(),
+            "site_packages": [str(path) for path in index.site_packages],
+            "distributions": [
+                distribution_to_json(distribution)
+                for distribution in index.distributions
+            ],
+        }
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.modified = True
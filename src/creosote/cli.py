@@ -3,29 +3,45 @@ from collections.abc import Sequence
 
 from loguru import logger
 
-from creosote import formatters, models, parsers, resolvers
+from creosote import cache, formatters, models, parsers, resolvers
 from creosote.__about__ import __version__
-from creosote.config import Features, fail_fast, parse_args
+from creosote.config import (
+    Config,
+    ConfigError,
+    Features,
+    fail_fast,
+    parse_args,
+    parse_index_args,
+)
+from creosote.distributions import VenvIndex
+
+
+def get_excluded_deps_which_are_not_installed(
+    deps_resolver: resolvers.DepsResolver, exclude_deps: list[str]
+) -> list[str]:
+    """Return excluded deps missing from a venv, with a warning if there are any."""
+    dependency_names = sorted(
+        {
+            parsers.canonicalize_module_name(d)
+            for d in deps_resolver.get_uninstalled_dependency_names(exclude_deps)
+        }
+    )
+    if dependency_names:
+        logger.warning(
+            "Excluded dependencies not found in virtual environment: "
+            + f"{', '.join(dependency_names)}"
+        )
+    return dependency_names
 
 
 def get_redundant_excludes(
-    deps_reader: parsers.DependencyReader,
-    imports: list[models.ImportInfo],
+    all_dep_names: list[str],
     exclude_deps: list[str],
-    venvs: list[str],
+    unused_dep_names: list[str],
     deps_file: str,
 ) -> list[str]:
     """Return excluded deps that are redundant, with a warning per entry."""
     redundant: list[str] = []
-    all_dep_names = deps_reader.read_all()
-    excluded_direct_deps = [d for d in exclude_deps if d in all_dep_names]
-    excluded_unused = set(
-        resolvers.DepsResolver(
-            imports=imports,
-            dependency_names=excluded_direct_deps,
-            venvs=venvs,
-        ).resolve_unused_dependency_names()
-    )
     for d in exclude_deps:
         if d not in all_dep_names:
             redundant.append(d)
@@ -33,13 +49,87 @@ def get_redundant_excludes(
                 f"Redundant exclusion '{d}': not found in {deps_file} "
                 "(transitive dependency or typo)"
             )
-        elif d not in excluded_unused:
+        elif d not in unused_dep_names:
             redundant.append(d)
             logger.warning(f"Redundant exclusion '{d}': import detected in source code")
     return redundant
 
 
-def main(args_: Sequence[str] | None = None) -> int:
+def build_index(args_: Sequence[str]) -> int:
+    """Write the distributions installed in the venv(s) to an index file."""
+    args = parse_index_args(args_)
+    formatters.configure_logger(verbose=args.verbose, format_="default")
+
+    deps_resolver = resolvers.DepsResolver(
+        imports=[],
+        dependency_names=[],
+        venvs=args.venvs,
+        wheelhouses=args.wheelhouses,
+        image_archives=args.image_archives,
+    )
+    deps_resolver.gather_distributions()
+    index = VenvIndex(", ".join(args.venvs + args.wheelhouses + args.image_archives))
+    for distribution in deps_resolver.distributions.values():
+        index.add(distribution)
+    try:
+        index.dump(args.output)
+    except OSError as e:
+        logger.error(f"Cannot write venv index {args.output}: {e}")
+        return 1
+    logger.info(f"Wrote {len(index.distributions)} distributions to {args.output}")
+    return 0
+
+
+def get_import_cache(args: Config) -> cache.ImportCache | None:
+    if args.no_cache:
+        return None
+    return cache.ImportCache(
+        args.cache_dir,
+        include_deferred=args.include_deferred,
+        engine=args.engine,
+        notebook_reader=args.notebook_reader,
+    )
+
+
+def load_venv_index(path: str) -> VenvIndex | None:
+    """Return the index file, or None with an error if it cannot be read."""
+    try:
+        return VenvIndex.load(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Cannot read venv index {path}: {e}")
+        return None
+
+
+def get_django_imports(args: Config) -> list[models.ImportInfo]:
+    if not args.django_settings:
+        return []
+    return [
+        models.ImportInfo.from_module_name(django_import)
+        for django_import in parsers.get_modules_from_django_settings(
+            args.django_settings
+        )
+    ]
+
+
+def get_exit_code(
+    args: Config,
+    *,
+    unused_dependency_names: list[str],
+    excluded_deps_and_not_installed: list[str],
+    redundant_excludes: list[str],
+) -> int:
+    if unused_dependency_names:
+        return 1
+    elif excluded_deps_and_not_installed:
+        if Features.FAIL_EXCLUDED_AND_NOT_INSTALLED.value in args.features:
+            return 1
+    elif redundant_excludes:  # noqa: SIM102
+        if Features.FAIL_REDUNDANT_EXCLUDES.value in args.features:
+            return 1
+    return 0
+
+
+def find_unused_dependencies(args_: Sequence[str]) -> int:
     args = parse_args(args_)
     if fail_fast(args):
         return 1
@@ -52,54 +142,76 @@ def main(args_: Sequence[str] | None = None) -> int:
     if args.features:
         logger.info(f"Feature(s) enabled: {', '.join(args.features)}")
 
+    if args.clear_cache:
+        cache.clear_cache(args.cache_dir)
+
+    venv_index = None
+    if args.venv_index is not None:
+        venv_index = load_venv_index(args.venv_index)
+        if venv_index is None:
+            return 1
+
+    if args.section_paths:
+        return find_unused_dependencies_per_section(args, venv_index=venv_index)
+
     # Get imports from source code
     imports = parsers.get_module_names_from_code(
-        args.paths, include_deferred=args.include_deferred
+        args.paths,
+        include_deferred=args.include_deferred,
+        engine=args.engine,
+        notebook_reader=args.notebook_reader,
+        jobs=args.jobs,
+        exclude_paths=args.exclude_paths,
+        cache=get_import_cache(args),
     )
 
     # Get imports from Django settings file
-    if args.django_settings:
-        django_imports = parsers.get_modules_from_django_settings(args.django_settings)
-        imports.extend(
-            [
-                models.ImportInfo.from_module_name(django_import)
-                for django_import in django_imports
-            ]
-        )
+    imports.extend(get_django_imports(args))
 
     # Read dependencies from pyproject.toml or requirements.txt
     deps_reader = parsers.DependencyReader(
         deps_file=args.deps_file,
         sections=args.sections,
         exclude_deps=args.exclude_deps,
+        all_sections=args.all_sections,
     )
     dependency_names = deps_reader.read()
+    all_dep_names = deps_reader.read_all()
 
-    # Warn if excluded dependencies are not installed
-    excluded_deps_and_not_installed = parsers.get_excluded_deps_which_are_not_installed(
-        excluded_deps=args.exclude_deps, venvs=args.venvs
+    # Resolve the dependencies together with the excluded ones, so that the
+    # distributions are gathered, and imports associated, only once
+    excluded_direct_deps = [d for d in args.exclude_deps if d in all_dep_names]
+    deps_to_scan_for = list(
+        dict.fromkeys(
+            [d for d in dependency_names if d not in args.exclude_deps]
+            + excluded_direct_deps
+        )
     )
-
-    # Resolve
-    deps_to_scan_for = list(set(dependency_names) - set(args.exclude_deps))
     deps_resolver = resolvers.DepsResolver(
         imports=imports,
         dependency_names=deps_to_scan_for,
         venvs=args.venvs,
+        venv_cache=None if args.no_cache else cache.VenvCache(args.cache_dir),
+        venv_index=venv_index,
+        wheelhouses=args.wheelhouses,
+        image_archives=args.image_archives,
+    )
+    all_unused_dependency_names = deps_resolver.resolve_unused_dependency_names()
+    unused_dependency_names = [
+        d for d in all_unused_dependency_names if d not in args.exclude_deps
+    ]
+
+    # Warn if excluded dependencies are not installed
+    excluded_deps_and_not_installed = get_excluded_deps_which_are_not_installed(
+        deps_resolver, args.exclude_deps
     )
-    unused_dependency_names = deps_resolver.resolve_unused_dependency_names()
 
     # Check for redundant excludes (experimental feature)
-    redundant_excludes = (
-        get_redundant_excludes(
-            deps_reader=deps_reader,
-            imports=imports,
-            exclude_deps=args.exclude_deps,
-            venvs=args.venvs,
-            deps_file=args.deps_file,
-        )
-        if args.exclude_deps
-        else []
+    redundant_excludes = get_redundant_excludes(
+        all_dep_names=all_dep_names,
+        exclude_deps=args.exclude_deps,
+        unused_dep_names=all_unused_dependency_names,
+        deps_file=args.deps_file,
     )
 
     # Print final results
@@ -107,16 +219,138 @@ def main(args_: Sequence[str] | None = None) -> int:
         unused_dependency_names=unused_dependency_names, format_=args.format
     )
 
-    # Return with exit code
-    if unused_dependency_names:
+    return get_exit_code(
+        args,
+        unused_dependency_names=unused_dependency_names,
+        excluded_deps_and_not_installed=excluded_deps_and_not_installed,
+        redundant_excludes=redundant_excludes,
+    )
+
+
+def find_unused_dependencies_per_section(
+    args: Config, *, venv_index: VenvIndex | None = None
+) -> int:
+    """Check the dependencies of each section against the section's own paths.
+
+    Each source file is scanned once, and the distributions are gathered once,
+    for all sections.
+    """
+    defaults = Config()
+    ignored_options = [
+        option
+        for option, is_set in [
+            ("--section", args.sections != defaults.sections),
+            ("--path", args.paths != defaults.paths),
+            ("--all-sections", args.all_sections),
+        ]
+        if is_set
+    ]
+    if ignored_options:
+        logger.warning(
+            f"Ignoring {', '.join(ignored_options)}, as section-paths is configured"
+        )
+
+    section_paths = {
+        section: [paths] if isinstance(paths, str) else paths
+        for section, paths in args.section_paths.items()
+    }
+
+    # Get imports from source code, and tag them with the sections using them
+    imports_per_file = parsers.get_imports_per_file(
+        list(dict.fromkeys(path for paths in section_paths.values() for path in paths)),
+        include_deferred=args.include_deferred,
+        engine=args.engine,
+        notebook_reader=args.notebook_reader,
+        jobs=args.jobs,
+        exclude_paths=args.exclude_paths,
+        cache=get_import_cache(args),
+    )
+    django_imports = get_django_imports(args)
+    section_imports = {
+        section: parsers.get_imports_in_paths(imports_per_file, paths) + django_imports
+        for section, paths in section_paths.items()
+    }
+
+    # Read the dependencies of each section, along with the excluded ones
+    all_dep_names: list[str] = []
+    section_dependency_names: dict[str, list[str]] = {}
+    for section in section_paths:
+        deps_reader = parsers.DependencyReader(
+            deps_file=args.deps_file,
+            sections=[section],
+            exclude_deps=args.exclude_deps,
+        )
+        dependency_names = deps_reader.read()
+        section_dep_names = deps_reader.read_all()
+        all_dep_names.extend(section_dep_names)
+        section_dependency_names[section] = list(
+            dict.fromkeys(
+                dependency_names
+                + [d for d in args.exclude_deps if d in section_dep_names]
+            )
+        )
+
+    # Resolve all sections together
+    deps_resolver = resolvers.DepsResolver(
+        imports=[],
+        dependency_names=list(
+            dict.fromkeys(
+                name for names in section_dependency_names.values() for name in names
+            )
+        ),
+        venvs=args.venvs,
+        venv_cache=None if args.no_cache else cache.VenvCache(args.cache_dir),
+        venv_index=venv_index,
+        wheelhouses=args.wheelhouses,
+        image_archives=args.image_archives,
+    )
+    all_unused_per_section = deps_resolver.resolve_unused_dependency_names_per_section(
+        section_dependency_names, section_imports
+    )
+    unused_per_section = {
+        section: [d for d in names if d not in args.exclude_deps]
+        for section, names in all_unused_per_section.items()
+    }
+
+    # Warn if excluded dependencies are not installed
+    excluded_deps_and_not_installed = get_excluded_deps_which_are_not_installed(
+        deps_resolver, args.exclude_deps
+    )
+
+    # An exclusion is redundant if the dep is used in all of its sections
+    redundant_excludes = get_redundant_excludes(
+        all_dep_names=all_dep_names,
+        exclude_deps=args.exclude_deps,
+        unused_dep_names=[
+            name for names in all_unused_per_section.values() for name in names
+        ],
+        deps_file=args.deps_file,
+    )
+
+    # Print final results
+    formatters.print_results_per_section(
+        unused_dependency_names_per_section=unused_per_section, format_=args.format
+    )
+
+    return get_exit_code(
+        args,
+        unused_dependency_names=[
+            name for names in unused_per_section.values() for name in names
+        ],
+        excluded_deps_and_not_installed=excluded_deps_and_not_installed,
+        redundant_excludes=redundant_excludes,
+    )
+
+
+def main(args_: Sequence[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if args_ is None else args_)
+    try:
+        if argv[:1] == ["index"]:
+            return build_index(argv[1:])
+        return find_unused_dependencies(argv)
+    except ConfigError as e:
+        logger.error(str(e))
         return 1
-    elif excluded_deps_and_not_installed:
-        if Features.FAIL_EXCLUDED_AND_NOT_INSTALLED.value in args.features:
-            return 1
-    elif redundant_excludes:  # noqa: SIM102
-        if Features.FAIL_REDUNDANT_EXCLUDES.value in args.features:
-            return 1
-    return 0
 
 
 if __name__ == "__main__":
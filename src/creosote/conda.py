@@ -0,0 +1,68 @@
+"""Read the packages installed in a conda environment.
+
+Packages installed by conda may lack ``*.dist-info`` metadata, but conda keeps
+a record of every installed package, including its files, in
+``<env>/conda-meta/*.json``.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import cast
+
+from loguru import logger
+
+from creosote.distributions import get_import_names_from_paths, normalize_name
+from creosote.models import DistributionInfo
+
+CONDA_META_FIELDS = frozenset({"name", "version", "files"})
+
+# e.g. lib/python3.12/site-packages/yaml/__init__.py on Linux and macOS, or
+# Lib/site-packages/yaml/__init__.py on Windows
+SITE_PACKAGES_FILE_PATTERN = re.compile(r"(?:.*/)?site-packages/(?P<path>.+)")
+
+
+def keep_conda_meta_fields(pairs: list[tuple[str, object]]) -> dict[str, object]:
+    """Drop all but the needed fields of each JSON object as soon as it is parsed.
+
+    The stdlib has no streaming JSON parser, but this way the large nested
+    objects (e.g. ``paths_data``) are discarded while the file is read.
+    """
+    return {key: value for key, value in pairs if key in CONDA_META_FIELDS}
+
+
+def read_conda_package(path: Path) -> DistributionInfo | None:
+    """Return the conda package, with the import names of its Python files."""
+    try:
+        with open(path, encoding="utf-8") as infile:
+            package = cast(
+                dict[str, object],
+                json.load(infile, object_pairs_hook=keep_conda_meta_fields),
+            )
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot read conda package metadata {path}: {e}")
+        return None
+
+    name = package.get("name")
+    if not isinstance(name, str):
+        return None
+    files = cast(list[str], package.get("files", []))
+    site_packages_files = (
+        match.group("path")
+        for match in map(SITE_PACKAGES_FILE_PATTERN.fullmatch, files)
+        if match
+    )
+    version = package.get("version")
+    return DistributionInfo(
+        name=name,
+        normalized_name=normalize_name(name),
+        version=version if isinstance(version, str) else None,
+        metadata_path=path,
+        record_import_names=get_import_names_from_paths(site_packages_files),
+    )
+
+
+def read_conda_packages(conda_meta: Path) -> list[DistributionInfo]:
+    """Return the packages of a conda-meta directory."""
+    packages = (read_conda_package(path) for path in sorted(conda_meta.glob("*.json")))
+    return [package for package in packages if package is not None]
@@ -5,16 +5,15 @@ from collections.abc import Sequence
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Literal, get_args
-
-if sys.version_info >= (3, 11):
-    import tomllib  # pyright: ignore[reportUnreachable]
-else:
-    import tomli as tomllib
+from typing import Any, Literal, cast, get_args
 
 from loguru import logger
 
 from creosote.__about__ import __version__
+from creosote.cache import DEFAULT_CACHE_DIR
+from creosote.projects import get_section, load_project_document
+
+DEFAULT_INDEX_FILE = "deps-index.json"
 
 
 @dataclass(slots=True)
@@ -28,7 +27,12 @@ class Config:
     verbose: bool = False
     format: Literal["default", "no-color", "porcelain"] = "default"
     paths: list[str] = field(default_factory=lambda: ["src"])
+    exclude_paths: list[str] = field(default_factory=list)
     sections: list[str] = field(default_factory=lambda: ["project.dependencies"])
+    all_sections: bool = False
+    # section -> paths of the source code using its dependencies, only
+    # configurable in pyproject.toml
+    section_paths: dict[str, str | list[str]] = field(default_factory=dict)
     exclude_deps: list[str] = field(default_factory=list)
     deps_file: str = "pyproject.toml"
     venvs: list[str] = field(
@@ -37,6 +41,28 @@ class Config:
     features: list[str] = field(default_factory=list)
     django_settings: str | None = None
     include_deferred: bool = False
+    engine: Literal["ast", "fast"] = "ast"
+    notebook_reader: Literal["json", "nbconvert"] = "json"
+    # "auto" in pyproject.toml is resolved to the number of CPUs by parse_args
+    jobs: int = 1
+    no_cache: bool = False
+    cache_dir: str = DEFAULT_CACHE_DIR
+    clear_cache: bool = False
+    venv_index: str | None = None
+    wheelhouses: list[str] = field(default_factory=list)
+    image_archives: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class IndexConfig:
+    """Configuration of the ``creosote index`` command."""
+
+    command: Literal["build"]
+    venvs: list[str]
+    output: str = DEFAULT_INDEX_FILE
+    wheelhouses: list[str] = field(default_factory=list)
+    image_archives: list[str] = field(default_factory=list)
+    verbose: bool = False
 
 
 class Features(Enum):
@@ -80,6 +106,23 @@ class CustomAppendAction(argparse.Action):
         self.called_times += 1
 
 
+def parse_jobs(value: int | str) -> int:
+    """Parse the number of parallel jobs, where ``auto`` means one per CPU."""
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"invalid jobs value: {value!r} (expected a positive integer or 'auto')"
+        ) from e
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(
+            f"invalid jobs value: {value!r} (expected a positive integer or 'auto')"
+        )
+    return jobs
+
+
 def show_migration_message() -> None:
     """Show warning if you are using v2.x args with v3.x code."""
 
@@ -139,6 +182,14 @@ def parse_args(args: Sequence[str] | None) -> Config:
         default=defaults.paths,
         help="path(s) to Python source code to scan for imports",
     )
+    _ = parser.add_argument(
+        "--exclude-path",
+        dest="exclude_paths",
+        metavar="GLOB",
+        action="append",
+        default=defaults.exclude_paths,
+        help="gitignore-style glob pattern(s) of source paths to skip",
+    )
     _ = parser.add_argument(
         "-s",
         "--section",
@@ -148,6 +199,13 @@ def parse_args(args: Sequence[str] | None) -> Config:
         default=defaults.sections,
         help="pyproject.toml section(s) to scan for dependencies",
     )
+    _ = parser.add_argument(
+        "--all-sections",
+        dest="all_sections",
+        action="store_true",
+        default=defaults.all_sections,
+        help="scan all dependency sections of the toml file, instead of --section",
+    )
     _ = parser.add_argument(
         "--exclude-dep",
         dest="exclude_deps",
@@ -198,33 +256,205 @@ def parse_args(args: Sequence[str] | None) -> Config:
         default=defaults.include_deferred,
         help="detect deferred imports inside functions and methods",
     )
+    _ = parser.add_argument(
+        "--engine",
+        dest="engine",
+        choices=get_args(Config.__annotations__["engine"]),
+        default=defaults.engine,
+        help=(
+            "how to find top-level imports: 'ast' parses every file, 'fast' "
+            "scans for import statements and only falls back to 'ast' if needed"
+        ),
+    )
+    _ = parser.add_argument(
+        "--notebook-reader",
+        dest="notebook_reader",
+        choices=get_args(Config.__annotations__["notebook_reader"]),
+        default=defaults.notebook_reader,
+        help=(
+            "how to read Jupyter notebooks: 'json' reads the code cells directly, "
+            "'nbconvert' exports the notebook using nbconvert (slower)"
+        ),
+    )
+    _ = parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        metavar="N",
+        type=parse_jobs,
+        default=str(defaults.jobs),
+        help="number of processes used to scan source files, or 'auto' for one per CPU",
+    )
+    _ = parser.add_argument(
+        "--no-cache",
+        dest="no_cache",
+        action="store_true",
+        default=defaults.no_cache,
+        help="do not read or write the cache of imports and venv metadata",
+    )
+    _ = parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        metavar="PATH",
+        default=defaults.cache_dir,
+        help="path to the cache directory",
+    )
+    _ = parser.add_argument(
+        "--clear-cache",
+        dest="clear_cache",
+        action="store_true",
+        default=defaults.clear_cache,
+        help="remove the cache files from the cache directory before scanning",
+    )
+    _ = parser.add_argument(
+        "--venv-index",
+        dest="venv_index",
+        metavar="PATH",
+        default=defaults.venv_index,
+        help="path to a file written by 'creosote index build', used instead of --venv",
+    )
+    _ = parser.add_argument(
+        "--wheelhouse",
+        dest="wheelhouses",
+        metavar="DIR",
+        action="append",
+        default=defaults.wheelhouses,
+        help="director(ies) of wheel files to read distribution metadata from",
+    )
+    _ = parser.add_argument(
+        "--image-archive",
+        dest="image_archives",
+        metavar="PATH",
+        action="append",
+        default=defaults.image_archives,
+        help=(
+            "container image layer tarball(s) or 'docker save' archive(s) to read "
+            "distribution metadata from"
+        ),
+    )
+    parser.set_defaults(section_paths=defaults.section_paths)
 
     parsed_args = parser.parse_args(args)
     return Config(**vars(parsed_args))  # pyright: ignore[reportAny]
 
 
+def parse_index_args(args: Sequence[str]) -> IndexConfig:
+    defaults = load_defaults()
+
+    parser = argparse.ArgumentParser(
+        prog="creosote index",
+        description="Manage portable indexes of installed distributions",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser(
+        "build",
+        description=(
+            "Write the name, version and import names of each distribution "
+            "installed in the venv(s) to a file, for use with --venv-index"
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    _ = build_parser.add_argument(
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        default=defaults.verbose,
+        help="increase output verbosity",
+    )
+    _ = build_parser.add_argument(
+        "-v",
+        "--venv",
+        dest="venvs",
+        metavar="PATH",
+        action=CustomAppendAction,
+        default=defaults.venvs,
+        help="path(s) to the virtual environment (or site-packages)",
+    )
+    _ = build_parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        metavar="PATH",
+        default=DEFAULT_INDEX_FILE,
+        help="path of the index file to write",
+    )
+    _ = build_parser.add_argument(
+        "--wheelhouse",
+        dest="wheelhouses",
+        metavar="DIR",
+        action="append",
+        default=[],
+        help="director(ies) of wheel files to read distribution metadata from",
+    )
+    _ = build_parser.add_argument(
+        "--image-archive",
+        dest="image_archives",
+        metavar="PATH",
+        action="append",
+        default=[],
+        help=(
+            "container image layer tarball(s) or 'docker save' archive(s) to read "
+            "distribution metadata from"
+        ),
+    )
+
+    parsed_args = parser.parse_args(args)
+    return IndexConfig(**vars(parsed_args))  # pyright: ignore[reportAny]
+
+
+class ConfigError(ValueError):
+    """Invalid user configuration in pyproject.toml."""
+
+
 def load_defaults(src: str | Path = "pyproject.toml") -> Config:
     """Load pyproject.toml defaults from user config.
 
     Expects user configuration at ``[tool.creosote]``.
+
+    Raises:
+        ConfigError: if the configuration is invalid.
     """
 
     try:
-        with open(src, "rb") as f:
-            project_config = tomllib.load(f)
-    except FileNotFoundError:
-        project_config = {}
-    creosote_config = project_config.get("tool", {}).get("creosote", {})  # pyright: ignore[reportAny]
+        creosote_config = cast(
+            dict[str, Any],  # pyright: ignore[reportExplicitAny]
+            get_section(load_project_document(src), "tool.creosote"),
+        )
+    except (FileNotFoundError, KeyError):
+        creosote_config = {}
     # Convert all hyphens to underscores
     creosote_config = {k.replace("-", "_"): v for k, v in creosote_config.items()}  # pyright: ignore[reportAny]
+    if not is_section_paths(creosote_config.get("section_paths", {})):
+        raise ConfigError(
+            f"Invalid section-paths in {src}: "
+            + "expected a path, or a list of paths, per section"
+        )
     return Config(**creosote_config)  # pyright: ignore[reportAny]
 
 
+def is_section_paths(value: object) -> bool:
+    """Return whether the value maps sections to a path or a list of paths."""
+    if not isinstance(value, dict):
+        return False
+    return all(
+        isinstance(paths, str)
+        or (
+            isinstance(paths, list)
+            and all(isinstance(p, str) for p in cast(list[object], paths))
+        )
+        for paths in cast(dict[str, object], value).values()
+    )
+
+
 def fail_fast(args: Config) -> bool:
     """Check if we should fail fast."""
     if is_missing_file(args.deps_file):
         logger.error(f"File not found: {args.deps_file}")
         return True
+    if args.venv_index is not None and is_missing_file(args.venv_index):
+        logger.error(f"File not found: {args.venv_index}")
+        return True
     return False
 
 
@@ -0,0 +1,531 @@
+import ast
+import csv
+import importlib.machinery
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import cast
+
+from loguru import logger
+
+from creosote.models import DistributionInfo
+
+# Define the PEP 440 compliant version pattern (non-capturing)
+# https://packaging.python.org/en/latest/specifications/version-specifiers/
+VERSION_PATTERN_STR = (
+    r"v?(?:(?:[0-9]+!)?"  # epoch
+    r"(?:[0-9]+(?:\.[0-9]+)*)"  # release
+    r"(?:(?:[-_\.]?(?:a|b|c|rc|alpha|beta|pre|preview)[-_\.]?(?:[0-9]+)?))?"  # pre
+    r"(?:(?:-(?:[0-9]+))|(?:[-_\.]?(?:post|rev|r)[-_\.]?(?:[0-9]+)?))?"  # post
+    r"(?:(?:[-_\.]?(?:dev)[-_\.]?(?:[0-9]+)?))?)"  # dev
+    r"(?:\+[a-z0-9]+(?:[-_\.][a-z0-9]+)*)?"  # local
+)
+
+# Capture package names before PEP 440 compliant versions.
+# Package name allows letters, numbers, underscore, dot, hyphen.
+# re.IGNORECASE handles version specifier case (e.g., rc vs RC).
+# Egg-info directories may have a Python version suffix, or no version at all.
+METADATA_DIR_PATTERN = re.compile(
+    rf"(?P<name>[\w\.-]+?)(?:-(?P<version>{VERSION_PATTERN_STR}))?"
+    r"(?:-py[0-9]+(?:\.[0-9]+)*)?\.(?:dist|egg)-info",
+    re.IGNORECASE,
+)
+
+# RECORD entries of metadata directories, which do not provide modules
+RECORD_METADATA_SUFFIXES = (".dist-info", ".egg-info", ".data")
+
+# e.g. "import __editable___foo_1_0_finder; __editable___foo_1_0_finder.install()"
+# in the .pth file of a setuptools editable install
+EDITABLE_FINDER_PATTERN = re.compile(r"import\s+(?P<module>__editable___\w+_finder)\b")
+
+# Top-level modules of editable installs, which hook the project into sys.path
+# rather than providing any import names, e.g. __editable___foo_1_0_finder.py
+# of setuptools or _editable_impl_foo.py of hatchling
+EDITABLE_MODULE_PREFIXES = ("__editable__", "_editable_impl_")
+
+# Files which can be imported, including C extensions like foo.cpython-312-*.so
+MODULE_SUFFIXES = (".py", ".pyc", ".so", ".pyd")
+
+# Version of the file format written by ``creosote index build``
+INDEX_FORMAT_VERSION = 1
+
+# Where site-packages are found, relative to the venv (or prefix) directory.
+SITE_PACKAGES_GLOBS = [
+    "lib/python*/site-packages",
+    "lib/pypy*/site-packages",
+    "lib64/python*/site-packages",
+    "Lib/site-packages",
+]
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name according to PEP 503."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_metadata_dir_name(dir_name: str) -> tuple[str, str | None] | None:
+    """Return the name and version of a *.dist-info or *.egg-info directory."""
+    match = METADATA_DIR_PATTERN.fullmatch(dir_name)
+    if not match:
+        return None
+    return match.group("name"), match.group("version")
+
+
+def find_site_packages(venv: Path) -> list[Path]:
+    """Return the site-packages directories of a venv.
+
+    Supports virtual environments (and conda environments), the
+    ``__pypackages__`` folder of PEP-582, and a site-packages folder given
+    directly.
+    """
+    globs = ["*/lib"] if venv.name == "__pypackages__" else SITE_PACKAGES_GLOBS
+
+    site_packages: dict[Path, Path] = {}
+    for glob_str in globs:
+        for path in sorted(venv.glob(glob_str)):
+            # lib64 is often a symlink to lib
+            _ = site_packages.setdefault(path.resolve(), path)
+    if site_packages:
+        return list(site_packages.values())
+    return [venv]
+
+
+def read_distribution(site_packages: Path, dir_name: str) -> DistributionInfo | None:
+    parsed = parse_metadata_dir_name(dir_name)
+    if parsed is None:
+        logger.debug(f"Cannot parse metadata directory name {dir_name}")
+        return None
+    name, version = parsed
+    metadata_path = site_packages / dir_name
+    distribution = DistributionInfo(
+        name=name,
+        normalized_name=normalize_name(name),
+        version=version,
+        metadata_path=metadata_path,
+    )
+    try:
+        with os.scandir(metadata_path) as iterator:
+            filenames = {entry.name for entry in iterator}
+    except OSError:
+        # e.g. a single-file egg-info (PKG-INFO) has no further metadata
+        return distribution
+    if "top_level.txt" in filenames:
+        distribution.top_level_txt_path = metadata_path / "top_level.txt"
+    if "RECORD" in filenames:
+        distribution.record_path = metadata_path / "RECORD"
+    return distribution
+
+
+def read_editable_finder_paths(finder: Path) -> list[Path]:
+    """Return the directories of the packages mapped by an editable finder.
+
+    setuptools' editable installs may write a finder module instead of a path,
+    with a ``MAPPING`` of top-level names to their paths. The module is parsed,
+    not imported, and the parent directory of each mapped path is returned.
+    """
+    try:
+        tree = ast.parse(finder.read_text(encoding="utf-8", errors="replace"))
+    except (OSError, SyntaxError, ValueError):
+        return []
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        if not any(isinstance(t, ast.Name) and t.id == "MAPPING" for t in targets):
+            continue
+        try:
+            mapping = cast(object, ast.literal_eval(value))
+        except (ValueError, TypeError):
+            return []
+        if not isinstance(mapping, dict):
+            return []
+        paths = (
+            Path(path).parent for path in mapping.values() if isinstance(path, str)
+        )
+        return [path for path in dict.fromkeys(paths) if path.is_dir()]
+    return []
+
+
+def read_pth_paths(site_packages: Path) -> list[Path]:
+    """Return the directories which .pth files in site-packages add to sys.path.
+
+    Lines starting with ``import`` are executed by the site module, and are
+    skipped here, except for the import of a setuptools editable finder, whose
+    mapped paths are read instead.
+    """
+    paths: list[Path] = []
+    for pth_file in sorted(site_packages.glob("*.pth")):
+        try:
+            lines = pth_file.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            continue
+        for line in map(str.strip, lines):
+            if line.startswith(("import ", "import\t")):
+                match = EDITABLE_FINDER_PATTERN.match(line)
+                if match is not None:
+                    finder = site_packages / f"{match.group('module')}.py"
+                    paths.extend(read_editable_finder_paths(finder))
+                continue
+            if not line or line.startswith("#"):
+                continue
+            path = site_packages / line
+            if path.is_dir():
+                paths.append(path)
+    return paths
+
+
+def find_module(module_name: str, search_paths: list[str]) -> bool:
+    """Return whether a top-level module can be found in the search paths.
+
+    The path-based finders only look at the file system, so nothing is
+    imported or executed. C extensions are only found if they were built for
+    the running Python version.
+    """
+    return (
+        importlib.machinery.PathFinder.find_spec(module_name, search_paths) is not None
+    )
+
+
+def parse_top_level_txt(lines: Iterable[str]) -> list[str]:
+    """Return the import names listed in the lines of a top_level.txt file."""
+    return [name for name in (line.strip() for line in lines) if name]
+
+
+def read_top_level_txt(path: Path) -> list[str]:
+    """Return the import names listed in a top_level.txt file."""
+    with open(path, encoding="utf-8", errors="replace") as infile:
+        return parse_top_level_txt(infile)
+
+
+def get_record_module_path(record_path: str) -> tuple[str, ...] | None:
+    """Return the path of an importable file listed in a RECORD file.
+
+    Metadata, scripts, bytecode caches and data files are not importable, and
+    yield None. So do paths which are not valid Python identifiers, and the
+    finder modules of editable installs.
+    """
+    parts = tuple(record_path.replace("\\", "/").split("/"))
+    if (
+        parts[0] in {"", ".", ".."}
+        or parts[0].endswith(RECORD_METADATA_SUFFIXES)
+        or "__pycache__" in parts
+        or not parts[-1].endswith(MODULE_SUFFIXES)
+    ):
+        return None
+    module_path = (*parts[:-1], parts[-1].split(".", 1)[0])
+    if not all(part.isidentifier() for part in module_path):
+        return None
+    if len(module_path) == 1 and module_path[0].startswith(EDITABLE_MODULE_PREFIXES):
+        return None
+    return module_path
+
+
+def iter_record_paths(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the path of each file listed in a RECORD file.
+
+    The file is streamed row by row with the csv module, as the RECORD of
+    large distributions can be several megabytes.
+    """
+    for row in csv.reader(lines):
+        if row:
+            yield row[0]
+
+
+def parse_record(lines: Iterable[str]) -> list[str]:
+    """Return the dotted names of the packages and modules in a RECORD file."""
+    return get_import_names_from_paths(iter_record_paths(lines))
+
+
+def get_import_names_from_paths(paths: Iterable[str]) -> list[str]:
+    """Return the dotted names of the packages and modules of the files.
+
+    The paths are relative to site-packages. The import names are the
+    top-level packages, modules and C extensions, e.g. ``yaml``, ``six`` and
+    ``_yaml``. Namespace packages (directories without an ``__init__.py``)
+    are shared by several distributions, so the regular packages inside of
+    them are returned instead, e.g. ``google.cloud.storage`` rather than
+    ``google``. Likewise, modules directly inside a namespace package are
+    returned themselves, e.g. ``google.cloud.client`` rather than
+    ``google.cloud``.
+
+    Only directory paths, and the modules of directories not known to be
+    within a regular package, are kept in memory, not the paths of all files.
+    """
+    top_level_modules: dict[tuple[str, ...], None] = {}
+    directories: dict[tuple[str, ...], None] = {}
+    packages: set[tuple[str, ...]] = set()
+    # directory -> its modules, until the directory is found to be a package
+    namespace_modules: dict[tuple[str, ...], dict[str, None]] = {}
+    for path in paths:
+        module_path = get_record_module_path(path)
+        if module_path is None:
+            continue
+        directory = module_path[:-1]
+        if not directory:
+            top_level_modules[module_path] = None
+            continue
+        directories[directory] = None
+        if module_path[-1] == "__init__":
+            packages.add(directory)
+            _ = namespace_modules.pop(directory, None)
+        elif directory not in packages:
+            namespace_modules.setdefault(directory, {})[module_path[-1]] = None
+
+    roots = dict.fromkeys(".".join(module) for module in top_level_modules)
+    for directory in directories:
+        # the outermost regular package, or the namespace package's modules
+        root = next(
+            (
+                directory[:depth]
+                for depth in range(1, len(directory) + 1)
+                if directory[:depth] in packages
+            ),
+            None,
+        )
+        if root is not None:
+            roots[".".join(root)] = None
+            continue
+        for module in namespace_modules.get(directory, {}):
+            roots[".".join((*directory, module))] = None
+    return list(roots)
+
+
+def read_record_import_names(path: Path) -> list[str]:
+    """Return the dotted names of the packages and modules in a RECORD file."""
+    with open(path, encoding="utf-8", errors="replace", newline="") as infile:
+        return parse_record(infile)
+
+
+def distribution_to_json(
+    distribution: DistributionInfo, *, include_paths: bool = True
+) -> dict[str, object]:
+    paths = {
+        "metadata_path": distribution.metadata_path,
+        "top_level_txt_path": distribution.top_level_txt_path,
+        "record_path": distribution.record_path,
+    }
+    return {
+        "name": distribution.name,
+        "normalized_name": distribution.normalized_name,
+        "version": distribution.version,
+        **{
+            key: None if path is None or not include_paths else str(path)
+            for key, path in paths.items()
+        },
+        "top_level_import_names": distribution.top_level_import_names,
+        "record_import_names": distribution.record_import_names,
+    }
+
+
+def distribution_from_json(data: dict[str, object]) -> DistributionInfo:
+    def optional_path(key: str) -> Path | None:
+        value = data.get(key)
+        return None if value is None else Path(cast(str, value))
+
+    def optional_names(key: str) -> list[str] | None:
+        value = data.get(key)
+        return None if value is None else list(cast(list[str], value))
+
+    name = cast(str, data["name"])
+    return DistributionInfo(
+        name=name,
+        normalized_name=normalize_name(name),
+        version=cast(str | None, data.get("version")),
+        metadata_path=optional_path("metadata_path"),
+        top_level_txt_path=optional_path("top_level_txt_path"),
+        record_path=optional_path("record_path"),
+        top_level_import_names=optional_names("top_level_import_names"),
+        record_import_names=optional_names("record_import_names"),
+    )
+
+
+class VenvIndex:
+    """Index of the distributions installed in a venv.
+
+    Each site-packages directory is listed once with ``os.scandir``, instead
+    of recursively globbing the whole venv for metadata files.
+    """
+
+    def __init__(self, venv: str) -> None:
+        self.venv: str = venv
+        self.site_packages: list[Path] = []
+        self.distributions: list[DistributionInfo] = []
+        # PEP 503 normalized name -> distribution, the first one found wins
+        self.distributions_by_name: dict[str, DistributionInfo] = {}
+
+    @classmethod
+    def from_venv(cls, venv: str) -> "VenvIndex":
+        index = cls(venv)
+        venv_path = Path(venv)
+        if not venv_path.is_dir():
+            return index
+
+        index.site_packages = find_site_packages(venv_path)
+        for site_packages in index.site_packages:
+            index.scan_site_packages(site_packages)
+
+        conda_meta = venv_path / "conda-meta"
+        is_conda_env = conda_meta.is_dir()
+        if (
+            index.site_packages == [venv_path]
+            and not index.distributions
+            and not is_conda_env
+        ):
+            # Unknown layout, fall back to searching the whole directory
+            logger.debug(f"No site-packages with metadata found in {venv}")
+            for dirpath, dirnames, _filenames in os.walk(venv_path):
+                for dirname in dirnames:
+                    if dirname.endswith((".dist-info", ".egg-info")):
+                        index.add(read_distribution(Path(dirpath), dirname))
+                dirnames[:] = [
+                    d for d in dirnames if not d.endswith((".dist-info", ".egg-info"))
+                ]
+
+        if is_conda_env:
+            # conda imports this module, so import it on demand
+            from creosote.conda import read_conda_packages  # noqa: PLC0415
+
+            # packages with *.dist-info metadata take precedence
+            for package in read_conda_packages(conda_meta):
+                index.add(package)
+
+        logger.debug(
+            f"Found {len(index.distributions)} distributions in "
+            + f"{', '.join(str(p) for p in index.site_packages)}"
+        )
+        return index
+
+    def scan_site_packages(self, site_packages: Path) -> None:
+        try:
+            with os.scandir(site_packages) as iterator:
+                dir_names = sorted(
+                    entry.name
+                    for entry in iterator
+                    if entry.name.endswith((".dist-info", ".egg-info"))
+                )
+        except OSError as e:
+            logger.warning(f"Cannot list {site_packages}: {e}")
+            return
+        for dir_name in dir_names:
+            self.add(read_distribution(site_packages, dir_name))
+
+    def add(self, distribution: DistributionInfo | None) -> None:
+        if distribution is not None:
+            logger.debug(f"Found {distribution.metadata_path or distribution.name}")
+            self.distributions.append(distribution)
+            _ = self.distributions_by_name.setdefault(
+                distribution.normalized_name, distribution
+            )
+
+    def get(self, name: str) -> DistributionInfo | None:
+        """Look up an installed distribution by (any spelling of) its name."""
+        return self.distributions_by_name.get(normalize_name(name))
+
+    def get_search_paths(self) -> list[str]:
+        """Return the paths a Python interpreter of the venv imports from."""
+        search_paths: list[str] = []
+        for site_packages in self.site_packages:
+            search_paths.append(str(site_packages))
+            search_paths.extend(str(path) for path in read_pth_paths(site_packages))
+        return list(dict.fromkeys(search_paths))
+
+    def get_stamps(self) -> dict[str, int]:
+        """Return the mtime of each site-packages and metadata directory.
+
+        Installing or removing a distribution changes the mtime of the
+        directory holding its metadata directory, and reinstalling it
+        recreates the metadata directory itself.
+        """
+        directories = [str(path) for path in self.site_packages]
+        for distribution in self.distributions:
+            if distribution.metadata_path is not None:
+                directories.append(str(distribution.metadata_path.parent))
+                directories.append(str(distribution.metadata_path))
+
+        stamps: dict[str, int] = {}
+        for directory in dict.fromkeys(directories):
+            try:
+                stamps[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+        return stamps
+
+    def read_import_names(self) -> None:
+        """Read the import names of all distributions from their metadata."""
+        for distribution in self.distributions:
+            if (
+                distribution.top_level_import_names is None
+                and distribution.top_level_txt_path is not None
+            ):
+                distribution.top_level_import_names = read_top_level_txt(
+                    distribution.top_level_txt_path
+                )
+            if (
+                distribution.record_import_names is None
+                and distribution.record_path is not None
+            ):
+                distribution.record_import_names = read_record_import_names(
+                    distribution.record_path
+                )
+
+    @classmethod
+    def merge(cls, indexes: Sequence["VenvIndex"], venv: str) -> "VenvIndex":
+        """Merge indexes, where distributions of earlier indexes win."""
+        merged = cls(venv)
+        for index in indexes:
+            merged.site_packages.extend(index.site_packages)
+            for distribution in index.distributions_by_name.values():
+                if distribution.normalized_name not in merged.distributions_by_name:
+                    merged.add(distribution)
+        return merged
+
+    def dump(self, path: str) -> None:
+        """Write a portable index file, which can be used instead of the venv.
+
+        The file holds the name, version and import names of each
+        distribution, but no paths into the venv.
+        """
+        self.read_import_names()
+        contents = {
+            "format": INDEX_FORMAT_VERSION,
+            "distributions": [
+                distribution_to_json(distribution, include_paths=False)
+                for distribution in self.distributions_by_name.values()
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as outfile:
+            json.dump(contents, outfile, indent=2)
+            _ = outfile.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "VenvIndex":
+        """Read an index file written by ``dump``.
+
+        Raises:
+            OSError: if the file cannot be read.
+            ValueError: if the file is not a valid index.
+        """
+        with open(path, encoding="utf-8") as infile:
+            contents = cast(object, json.load(infile))
+        if not isinstance(contents, dict):
+            raise ValueError(f"Invalid venv index {path}: not a JSON object")
+        contents = cast(dict[str, object], contents)
+        if contents.get("format") != INDEX_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported venv index format in {path}: "
+                + f"{contents.get('format')!r} (expected {INDEX_FORMAT_VERSION})"
+            )
+
+        index = cls(path)
+        try:
+            for data in cast(list[dict[str, object]], contents["distributions"]):
+                index.add(distribution_from_json(data))
+        except (LookupError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid venv index {path}: {e!r}") from e
+        logger.debug(f"Loaded {len(index.distributions)} distributions from {path}")
+        return index
@@ -0,0 +1,104 @@
+"""Fast extraction of top-level import statements.
+
+Building the full AST of a large (often generated) module just to look at its
+top-level import statements is wasteful. Instead, the source is scanned with a
+single regular expression which skips over string literals and comments, and
+stops at every ``import``/``from`` keyword found at the start of a line. Only
+the text of those statements is then handed to ``ast.parse``.
+
+Whenever the scanner comes across something it cannot handle with confidence,
+it gives up and the caller is expected to fall back to parsing the whole file.
+"""
+
+import ast
+import re
+
+_SCANNER = re.compile(
+    r"""
+    (?P<string>
+        \"\"\"(?:[^\"\\]|\\.|\"(?!\"\"))*\"\"\"
+        |'''(?:[^'\\]|\\.|'(?!''))*'''
+        |"(?:[^"\\\n]|\\.)*"
+        |'(?:[^'\\\n]|\\.)*'
+    )
+    |(?P<comment>\#[^\n]*)
+    |(?P<statement>^(?:import|from)\b)
+    """,
+    re.MULTILINE | re.VERBOSE | re.DOTALL,
+)
+
+# An import statement following a semicolon is a top-level statement which
+# does not start a line, e.g. ``import os; import sys``.
+_IMPORT_AFTER_SEMICOLON = re.compile(r";[ \t]*(?:import|from)\b")
+
+
+def find_statement_end(source: str, start: int) -> int | None:
+    """Return the end of the logical line starting at ``start``.
+
+    Handles parenthesised and backslash-continued statements as well as
+    trailing comments. Returns None for anything an import statement would
+    not contain, such as string literals or multiple statements on one line.
+    """
+    depth = 0
+    i = start
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 1
+            if source.startswith("\r\n", i):
+                i += 1
+            elif not source.startswith("\n", i):
+                return None
+        elif char in "()":
+            depth += 1 if char == "(" else -1
+        elif char == "#":
+            newline = source.find("\n", i)
+            if newline == -1:
+                return len(source)
+            i = newline
+            continue
+        elif char == "\n" and depth <= 0:
+            return i
+        elif char in "'\";":
+            return None
+        i += 1
+    return len(source)
+
+
+def extract_top_level_imports(
+    source: str, filename: str = "<unknown>"
+) -> list[ast.Import | ast.ImportFrom] | None:
+    """Return the module's top-level import statements, in source order.
+
+    Returns None when the source cannot be handled with confidence, in which
+    case the whole file should be parsed with ``ast.parse`` instead.
+    """
+    if _IMPORT_AFTER_SEMICOLON.search(source):
+        return None
+
+    statements: list[str] = []
+    position = 0
+    while match := _SCANNER.search(source, position):
+        if match.lastgroup != "statement":
+            position = match.end()
+            continue
+        end = find_statement_end(source, match.start())
+        if end is None:
+            return None
+        statements.append(source[match.start() : end])
+        position = end
+
+    if not statements:
+        return []
+
+    try:
+        module = ast.parse("\n".join(statements), filename)
+    except SyntaxError:
+        return None
+
+    nodes = [
+        node for node in module.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    if len(nodes) != len(statements):
+        return None
+    return nodes
@@ -2,8 +2,13 @@ import sys
 
 from loguru import logger
 
+# the arguments of the last configure_logger call, for worker processes
+logger_settings: tuple[bool, str] | None = None
+
 
 def configure_logger(verbose: bool, format_: str) -> None:
+    global logger_settings  # noqa: PLW0603
+    logger_settings = (verbose, format_)
     logger.remove()
 
     if format_ == "porcelain":
@@ -37,3 +42,32 @@ def print_results(unused_dependency_names: list[str], format_: str) -> None:
             )
     else:
         logger.info("No unused dependencies found! ✨")
+
+
+def print_results_per_section(
+    unused_dependency_names_per_section: dict[str, list[str]], format_: str
+) -> None:
+    sections = {
+        section: names
+        for section, names in unused_dependency_names_per_section.items()
+        if names
+    }
+    if sections:
+        if format_ == "porcelain":
+            print(
+                "\n".join(
+                    f"{section} {name}"
+                    for section, names in sections.items()
+                    for name in names
+                )
+            )
+        else:
+            logger.error(
+                "Oh no, bloated venv! 🤢 🪣\n"
+                + "\n".join(
+                    f"Unused dependencies found in {section}: {', '.join(names)}"
+                    for section, names in sections.items()
+                )
+            )
+    else:
+        logger.info("No unused dependencies found! ✨")
@@ -0,0 +1,245 @@
+"""Import names of well-known distributions, for when they are not installed.
+
+Each entry holds a PEP 503 normalized distribution name followed by its
+(dotted) import names, separated by spaces. The entries are sorted, so that a
+distribution can be looked up with a binary search, without building a dict.
+
+Only distributions whose import names cannot be guessed from the distribution
+name are listed, e.g. ``pillow`` (``PIL``), ``pyyaml`` (``yaml``) and
+distributions which are commonly spelled with capitals, like ``Django``.
+
+This module is only imported when a dependency is missing from the venv.
+"""
+
+import bisect
+
+# Bump when entries are changed in a way which affects the results
+VERSION = 1
+
+ENTRIES = (
+    "absl-py absl",
+    "adafruit-blinka board busio digitalio microcontroller",
+    "ansible-core ansible",
+    "antlr4-python3-runtime antlr4",
+    "apache-airflow airflow",
+    "apache-beam apache_beam",
+    "apscheduler apscheduler",
+    "argon2-cffi argon2",
+    "attrs attr attrs",
+    "azure-core azure.core",
+    "azure-cosmos azure.cosmos",
+    "azure-eventhub azure.eventhub",
+    "azure-functions azure.functions",
+    "azure-identity azure.identity",
+    "azure-keyvault-secrets azure.keyvault.secrets",
+    "azure-mgmt-resource azure.mgmt.resource",
+    "azure-monitor-opentelemetry azure.monitor.opentelemetry",
+    "azure-servicebus azure.servicebus",
+    "azure-storage-blob azure.storage.blob",
+    "azure-storage-file-datalake azure.storage.filedatalake",
+    "azure-storage-file-share azure.storage.fileshare",
+    "azure-storage-queue azure.storage.queue",
+    "babel babel",
+    "backports-zoneinfo backports.zoneinfo",
+    "beautifulsoup BeautifulSoup",
+    "beautifulsoup4 bs4",
+    "biopython Bio BioSQL",
+    "box2d-py Box2D",
+    "cassandra-driver cassandra",
+    "cupy-cuda11x cupy",
+    "cupy-cuda12x cupy",
+    "cx-freeze cx_Freeze",
+    "cx-oracle cx_Oracle",
+    "cython Cython cython pyximport",
+    "databricks-sdk databricks.sdk",
+    "databricks-sql-connector databricks.sql",
+    "dbus-python dbus",
+    "discord-py discord",
+    "django django",
+    "django-cors-headers corsheaders",
+    "django-crispy-forms crispy_forms",
+    "django-debug-toolbar debug_toolbar",
+    "django-environ environ",
+    "django-filter django_filters",
+    "django-storages storages",
+    "djangorestframework rest_framework",
+    "djangorestframework-simplejwt rest_framework_simplejwt",
+    "dnspython dns",
+    "elastic-apm elasticapm",
+    "faiss-cpu faiss",
+    "faiss-gpu faiss",
+    "ffmpeg-python ffmpeg",
+    "flask flask",
+    "fonttools fontTools",
+    "gdal osgeo",
+    "gitpython git",
+    "google-api-core google.api_core",
+    "google-api-python-client apiclient googleapiclient",
+    "google-auth google.auth google.oauth2",
+    "google-cloud-aiplatform google.cloud.aiplatform vertexai",
+    "google-cloud-bigquery google.cloud.bigquery",
+    "google-cloud-datastore google.cloud.datastore",
+    "google-cloud-firestore google.cloud.firestore",
+    "google-cloud-logging google.cloud.logging",
+    "google-cloud-pubsub google.cloud.pubsub google.cloud.pubsub_v1",
+    "google-cloud-secret-manager google.cloud.secretmanager",
+    "google-cloud-spanner google.cloud.spanner",
+    "google-cloud-storage google.cloud.storage",
+    "google-cloud-tasks google.cloud.tasks",
+    "google-cloud-translate google.cloud.translate",
+    "google-cloud-vision google.cloud.vision",
+    "google-genai google.genai",
+    "google-generativeai google.generativeai",
+    "googleapis-common-protos google.api google.longrunning google.rpc google.type",
+    "gputil GPUtil",
+    "grpcio grpc",
+    "grpcio-status grpc_status",
+    "grpcio-tools grpc_tools",
+    "gtts gtts",
+    "hidapi hid",
+    "imbalanced-learn imblearn",
+    "ipython IPython",
+    "jinja2 jinja2",
+    "kafka-python kafka",
+    "levenshtein Levenshtein",
+    "mako mako",
+    "markdown markdown",
+    "markdown-it-py markdown_it",
+    "markupsafe markupsafe",
+    "mecab-python3 MeCab",
+    "mkdocs-material material",
+    "msgpack-python msgpack",
+    "mysql-connector-python mysql.connector",
+    "mysqlclient MySQLdb",
+    "neptune-client neptune",
+    "netcdf4 netCDF4",
+    "nvidia-ml-py pynvml",
+    "onnxruntime-gpu onnxruntime",
+    "openai-whisper whisper",
+    "opencc-python-reimplemented opencc",
+    "opencv-contrib-python cv2",
+    "opencv-contrib-python-headless cv2",
+    "opencv-python cv2",
+    "opencv-python-headless cv2",
+    "opensearch-py opensearchpy",
+    "opentelemetry-sdk opentelemetry.sdk",
+    "paho-mqtt paho.mqtt",
+    "pdfminer-six pdfminer",
+    "pdm-backend pdm.backend",
+    "peewee peewee playhouse",
+    "pillow PIL",
+    "pinecone-client pinecone",
+    "poetry-core poetry.core",
+    "protobuf google.protobuf",
+    "psycopg2-binary psycopg2",
+    "py-cpuinfo cpuinfo",
+    "pyaudio pyaudio",
+    "pyautogui pyautogui",
+    "pybluez bluetooth",
+    "pycairo cairo",
+    "pycrypto Crypto",
+    "pycryptodome Crypto",
+    "pycryptodomex Cryptodome",
+    "pyenchant enchant",
+    "pyerfa erfa",
+    "pygetwindow pygetwindow",
+    "pygithub github",
+    "pygments pygments",
+    "pygobject gi",
+    "pyhamcrest hamcrest",
+    "pyinstaller PyInstaller",
+    "pyjwt jwt",
+    "pyldap ldap",
+    "pymongo bson gridfs pymongo",
+    "pymupdf fitz pymupdf",
+    "pymysql pymysql",
+    "pynacl nacl",
+    "pyobjc-core objc",
+    "pyopengl OpenGL",
+    "pyopengl-accelerate OpenGL_accelerate",
+    "pyopenssl OpenSSL",
+    "pypdf2 PyPDF2",
+    "pyqt5 PyQt5",
+    "pyqt6 PyQt6",
+    "pyserial serial",
+    "pyside2 PySide2",
+    "pyside6 PySide6",
+    "pysocks socks",
+    "pysoundfile soundfile",
+    "pyspellchecker spellchecker",
+    "pytest-xdist xdist",
+    "python-barcode barcode",
+    "python-binance binance",
+    "python-box box",
+    "python-consul consul",
+    "python-crontab cronlog crontab",
+    "python-daemon daemon",
+    "python-dateutil dateutil",
+    "python-docx docx",
+    "python-dotenv dotenv",
+    "python-engineio engineio",
+    "python-gnupg gnupg",
+    "python-igraph igraph",
+    "python-jose jose",
+    "python-json-logger pythonjsonlogger",
+    "python-keycloak keycloak",
+    "python-ldap ldap ldapurl ldif",
+    "python-levenshtein Levenshtein",
+    "python-magic magic",
+    "python-markdown-math mdx_math",
+    "python-multipart multipart python_multipart",
+    "python-nmap nmap",
+    "python-pptx pptx",
+    "python-slugify slugify",
+    "python-socketio socketio",
+    "python-telegram-bot telegram",
+    "pyusb usb",
+    "pyvmomi pyVim pyVmomi",
+    "pywavelets pywt",
+    (
+        "pywin32 pythoncom pywintypes win32api win32clipboard win32com win32con "
+        "win32event win32file win32gui win32process win32service win32serviceutil"
+    ),
+    "pywinrm winrm",
+    "pyxdg xdg",
+    "pyyaml _yaml yaml",
+    "pyzmq zmq",
+    "rpi-gpio RPi",
+    "ruamel-yaml ruamel.yaml",
+    "scikit-build skbuild",
+    "scikit-image skimage",
+    "scikit-learn sklearn",
+    "scikit-optimize skopt",
+    "setuptools _distutils_hack pkg_resources setuptools",
+    "shapely shapely",
+    "smbprotocol smbclient smbprotocol",
+    "snowflake-connector-python snowflake.connector",
+    "snowflake-sqlalchemy snowflake.sqlalchemy",
+    "speechrecognition speech_recognition",
+    "sphinx sphinx",
+    "sqlalchemy sqlalchemy",
+    "ta-lib talib",
+    "tensorflow-cpu tensorflow",
+    "tensorflow-gpu tensorflow",
+    "tf-nightly tensorflow",
+    "tortoise-orm tortoise",
+    "twisted twisted",
+    "unidecode unidecode",
+    "vadersentiment vaderSentiment",
+    "weaviate-client weaviate",
+    "websocket-client websocket",
+    "werkzeug werkzeug",
+    "wxpython wx",
+    "xlsxwriter xlsxwriter",
+    "zope-event zope.event",
+    "zope-interface zope.interface",
+)
+
+
+def lookup_import_names(normalized_name: str) -> list[str] | None:
+    """Return the import names of a distribution, or None if it is not known."""
+    prefix = normalized_name + " "
+    position = bisect.bisect_left(ENTRIES, prefix)
+    if position < len(ENTRIES) and ENTRIES[position].startswith(prefix):
+        return ENTRIES[position].split()[1:]
+    return None
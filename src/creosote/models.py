@@ -1,16 +1,23 @@
 import dataclasses
+from pathlib import Path
 
 
-@dataclasses.dataclass(slots=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class ImportInfo:
-    module: list[str]
-    name: list[str]
+    """A single imported name, as found in the source code.
+
+    Instances are immutable and hashable, so that they can be de-duplicated
+    and looked up using sets and dicts.
+    """
+
+    module: tuple[str, ...]
+    name: tuple[str, ...]
     alias: str | None = None
 
     @classmethod
     def from_module_name(cls, module_name: str) -> "ImportInfo":
         """Create ImportInfo from a simple module name (e.g., for Django apps)."""
-        return cls(module=[], name=[module_name], alias=None)
+        return cls(module=(), name=(module_name,), alias=None)
 
 
 @dataclasses.dataclass(slots=True)
@@ -18,5 +25,20 @@ class DependencyInfo:
     name: str  # as defined in the dependencies specification file
     top_level_import_names: list[str] | None = None
     record_import_names: list[str] | None = None
+    known_import_names: list[str] | None = None
+    probed_import_names: list[str] | None = None
     canonicalized_dep_name: str | None = None
     associated_imports: list[ImportInfo] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass(slots=True)
+class DistributionInfo:
+    name: str  # as found in the metadata directory name, e.g. "GitPython"
+    normalized_name: str  # PEP 503 normalized, e.g. "gitpython"
+    version: str | None = None
+    metadata_path: Path | None = None  # the *.dist-info or *.egg-info directory
+    top_level_txt_path: Path | None = None
+    record_path: Path | None = None
+    # import names read from top_level.txt and RECORD, None until read
+    top_level_import_names: list[str] | None = None
+    record_import_names: list[str] | None = None
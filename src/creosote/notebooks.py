@@ -0,0 +1,152 @@
+"""Read the Python source code of Jupyter notebooks.
+
+The code cells are read straight from the notebook's JSON, and IPython-only
+syntax (magics, shell commands and help queries) is blanked out so that the
+result can be parsed by the ``ast`` module.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from typing import cast
+
+# Lines which are valid IPython, but not valid Python:
+#   %magic, !shell, files = !ls, result = %time f(), obj?, ??obj
+_IPYTHON_LINE = re.compile(
+    r"""
+    ^(?P<indent>[ \t]*)
+    (?:
+        [%!]
+        |[\w.,\s]+=[ \t]*[%!]
+        |\?{1,2}[\w.]+[ \t]*$
+        |[\w.]+(?:\(\))?\?{1,2}[ \t]*$
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+# The tokens changing whether a line continues a statement; single-quoted
+# strings and comments are matched so that the brackets within are skipped
+_TOKEN = re.compile(
+    r"""
+    (?P<triple>\"\"\"|''')
+    |"(?:\\.|[^"\\])*"?
+    |'(?:\\.|[^'\\])*'?
+    |\#
+    |(?P<open>[([{])
+    |(?P<close>[)\]}])
+    """,
+    re.VERBOSE,
+)
+
+
+@dataclass(slots=True)
+class _LineState:
+    """Whether the next line continues a statement of the previous lines."""
+
+    # number of open brackets
+    depth: int = 0
+    # the quotes of an unterminated triple-quoted string
+    open_string: str | None = None
+    # whether the line ended with a backslash
+    continued: bool = False
+
+    @property
+    def at_statement_start(self) -> bool:
+        return not self.depth and self.open_string is None and not self.continued
+
+    def update(self, line: str) -> None:
+        """Track the brackets and strings of a line of Python code."""
+        pos = 0
+        while pos < len(line):
+            if self.open_string is not None:
+                end = line.find(self.open_string, pos)
+                if end == -1:
+                    return
+                pos = end + 3
+                self.open_string = None
+                continue
+            token = _TOKEN.search(line, pos)
+            if token is None or token.group() == "#":
+                break
+            pos = token.end()
+            if token.group("triple"):
+                self.open_string = token.group("triple")
+            elif token.group("open"):
+                self.depth += 1
+            elif token.group("close"):
+                self.depth = max(self.depth - 1, 0)
+        self.continued = line.endswith("\\")
+
+
+def strip_ipython_syntax(cell_source: str) -> str:
+    """Replace IPython-only lines with ``pass``, keeping the line count.
+
+    Only lines starting a statement are replaced, so that e.g. a line starting
+    with ``!=`` within brackets is kept.
+    """
+    if cell_source.lstrip().startswith("%%"):
+        # Cell magics (e.g. %%bash) mean the cell body is not Python code
+        return ""
+
+    lines: list[str] = []
+    state = _LineState()
+    for line in cell_source.splitlines():
+        match = _IPYTHON_LINE.match(line) if state.at_statement_start else None
+        if match:
+            lines.append(match.group("indent") + "pass")
+        else:
+            lines.append(line)
+            state.update(line)
+    return "\n".join(lines)
+
+
+def get_code_cell_sources(notebook: dict[str, object]) -> list[str]:
+    """Return the source of each code cell, for nbformat v4 and v3 notebooks."""
+    cells = notebook.get("cells")
+    source_key = "source"
+    if cells is None:
+        # nbformat v3 keeps the cells in worksheets, with the source in "input"
+        worksheets = cast(list[dict[str, list[object]]], notebook.get("worksheets", []))
+        cells = [cell for sheet in worksheets for cell in sheet.get("cells", [])]
+        source_key = "input"
+
+    sources: list[str] = []
+    for cell in cast(list[dict[str, object]], cells):
+        if cell.get("cell_type") != "code":
+            continue
+        source = cell.get(source_key, "")
+        if isinstance(source, list):
+            source = "".join(cast(list[str], source))
+        sources.append(cast(str, source))
+    return sources
+
+
+def read_notebook_source(path: str) -> str:
+    """Return the Python code of all code cells in the notebook."""
+    with open(path, encoding="utf-8") as infile:
+        notebook = cast(dict[str, object], json.load(infile))
+    return "\n\n".join(
+        strip_ipython_syntax(source) for source in get_code_cell_sources(notebook)
+    )
+
+
+def read_notebook_source_with_nbconvert(path: str) -> str:
+    """Return the notebook's Python code, as exported by nbconvert.
+
+    This is slower than ``read_notebook_source``, but kept for compatibility.
+    """
+    # nbconvert pulls in Jinja2, mistune, bleach etc. so only import on demand
+    import nbformat  # noqa: PLC0415
+    from nbconvert import PythonExporter  # noqa: PLC0415
+
+    with open(path) as f:
+        notebook_content = nbformat.read(  # type: ignore[no-untyped-call]  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+            f,
+            as_version=4,
+        )
+    body, _ = PythonExporter().from_notebook_node(  # type: ignore[no-untyped-call]
+        notebook_content  # pyright: ignore[reportUnknownArgumentType]
+    )
+    return body
@@ -1,28 +1,26 @@
 import ast
+import functools
+import os
 import re
-import sys
-import tempfile
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from pathlib import Path
-from typing import TypeGuard, cast
+from typing import Literal, TypeGuard, cast
 
-import nbformat
-from typing_extensions import override
-
-if sys.version_info >= (3, 11):
-    import tomllib  # pyright: ignore[reportUnreachable]
-else:
-    import tomli as tomllib
-
-import dotty_dict  # pyright: ignore[reportMissingTypeStubs]
 from loguru import logger
-from nbconvert import PythonExporter
-from pip_requirements_parser import (  # pyright: ignore[reportMissingTypeStubs]
-    RequirementsFile,
-)
+from typing_extensions import override
 
+from creosote import formatters
+from creosote.cache import ImportCache
+from creosote.distributions import normalize_name
+from creosote.extractors import extract_top_level_imports
 from creosote.models import ImportInfo
+from creosote.notebooks import read_notebook_source, read_notebook_source_with_nbconvert
+from creosote.projects import ProjectDocument, get_section, load_project_document
+from creosote.requirements import read_requirements
+from creosote.walkers import walk_source_files
 
+Engine = Literal["ast", "fast"]
+NotebookReader = Literal["json", "nbconvert"]
 GroupName = str
 PackageName = str
 PEP621Type1 = list[PackageName]
@@ -98,6 +96,72 @@ def is_dict_of_union(
     return all(isinstance(v, (str, dict)) for v in var.values())
 
 
+def find_dependency_sections(document: ProjectDocument) -> list[tuple[str, object]]:
+    """Return all sections of the toml document which list dependencies.
+
+    Each extra and dependency group is a section of its own. The sections are
+    returned along with their contents, as their names may contain dots.
+    """
+
+    def existing(*sections: str) -> list[tuple[str, object]]:
+        found: list[tuple[str, object]] = []
+        for section in sections:
+            try:
+                found.append((section, get_section(document, section)))
+            except KeyError:
+                continue
+        return found
+
+    def subsections(section: str, key: str | None = None) -> list[tuple[str, object]]:
+        try:
+            contents = get_section(document, section)
+        except KeyError:
+            return []
+        if not isinstance(contents, dict):
+            return []
+        found: list[tuple[str, object]] = []
+        for name, value in cast(dict[str, object], contents).items():
+            if key is None:
+                found.append((f"{section}.{name}", value))
+            elif isinstance(value, dict) and key in value:
+                found.append(
+                    (f"{section}.{name}.{key}", cast(dict[str, object], value)[key])
+                )
+        return found
+
+    return [
+        *existing("project.dependencies"),
+        *subsections("project.optional-dependencies"),
+        *subsections("dependency-groups"),
+        *existing("tool.poetry.dependencies", "tool.poetry.dev-dependencies"),
+        *subsections("tool.poetry.group", "dependencies"),
+        *subsections("tool.pdm.dev-dependencies"),
+        *existing("packages", "dev-packages"),
+    ]
+
+
+def get_dependency_section(document: ProjectDocument, section: str) -> object:
+    """Return the contents of a section, e.g. ``dependency-groups.test``.
+
+    Dependency group names may contain dots, and are compared normalized, as
+    specified by PEP 735.
+
+    Raises:
+        KeyError: if the section does not exist.
+    """
+    prefix, _, group = section.partition(".")
+    if prefix != "dependency-groups" or not group:
+        return get_section(document, section)
+    groups = get_section(document, prefix)
+    if not isinstance(groups, dict):
+        raise KeyError(section)
+    name = normalize_name(group)
+    for key, value in cast(dict[str, object], groups).items():
+        if normalize_name(key) == name:
+            return value
+    raise KeyError(section)
+
+
 class DependencyReader:
     """Read dependencies from various dependency file formats."""
 
@@ -106,12 +170,19 @@ class DependencyReader:
         deps_file: str,
         sections: list[str],
         exclude_deps: list[str],
+        *,
+        all_sections: bool = False,
     ) -> None:
         always_excluded_deps = ["python"]  # occurs in Poetry setup
 
         self.deps_file: str = deps_file
         self.sections: list[str] = sections
+        # discover the sections of the toml file, instead of using sections
+        self.all_sections: bool = all_sections
         self.exclude_deps: list[str] = exclude_deps + always_excluded_deps
+        self.all_dep_names: list[str] | None = None
+        # normalized PEP 735 group name -> its dependency strings, includes expanded
+        self.dependency_groups: dict[str, list[str]] = {}
 
     def read(self) -> list[str]:
         """Read dependency names from the spec file, with exclusions applied."""
@@ -128,7 +199,15 @@ class DependencyReader:
         return dep_names
 
     def read_all(self) -> list[str]:
-        """Read dependency names from the spec file, without exclusions applied."""
+        """Read dependency names from the spec file, without exclusions applied.
+
+        The spec file is only parsed once per reader.
+        """
+        if self.all_dep_names is None:
+            self.all_dep_names = self.parse_deps_file()
+        return list(self.all_dep_names)
+
+    def parse_deps_file(self) -> list[str]:
         if self.deps_file.endswith(".toml") or self.deps_file.endswith("Pipfile"):
             return self.read_toml(self.deps_file, self.sections)
         elif self.deps_file.endswith(".txt") or self.deps_file.endswith(".in"):
@@ -168,27 +247,25 @@ class DependencyReader:
         return section_deps
 
     def get_deps_from_pep735_toml(
-        self, section_contents: PEP735Types
+        self,
+        section_contents: PEP735Types,
+        groups: PEP735Type2 | None = None,
     ) -> list[PackageName]:
         """Get dependency names from toml file using the PEP735 spec.
 
-        The dependency strings are expected to follow PEP508.
+        The dependency strings are expected to follow PEP508. Groups included
+        with ``{include-group = "..."}`` are looked up in ``groups``.
         """
 
         dep_strings: list[str] = []
         if is_list_type(section_contents):
-            for item in section_contents:
-                if type(item) is not str:
-                    logger.debug(f"Skipping non-string entry: {item}")
-                    continue
-                dep_strings.append(item)
+            dep_strings = self.expand_pep735_items(
+                cast(PEP735Type3, section_contents), groups or {}
+            )
         elif is_dict_of_lists(section_contents):
-            for _, dep_string_list in section_contents.items():
-                for dep_string in dep_string_list:
-                    if type(dep_string) is not str:
-                        logger.debug(f"Skipping non-string entry: {dep_string}")
-                        continue
-                    dep_strings.append(dep_string)
+            groups = cast(PEP735Type2, section_contents)
+            for group in groups:
+                dep_strings.extend(self.expand_dependency_group(group, groups))
         else:
             raise TypeError("Unexpected dependency format, list expected.")
 
@@ -202,6 +279,52 @@ class DependencyReader:
 
         return section_deps
 
+    def expand_pep735_items(
+        self,
+        items: PEP735Type3,
+        groups: PEP735Type2,
+        including: tuple[str, ...] = (),
+    ) -> list[str]:
+        """Return the dependency strings of a group, with included groups."""
+        dep_strings: list[str] = []
+        for item in items:
+            if isinstance(item, str):
+                dep_strings.append(item)
+            elif isinstance(item, dict) and "include-group" in item:
+                dep_strings.extend(
+                    self.expand_dependency_group(
+                        item["include-group"], groups, including
+                    )
+                )
+            else:
+                logger.debug(f"Skipping unsupported entry: {item}")
+        return dep_strings
+
+    def expand_dependency_group(
+        self,
+        group: str,
+        groups: PEP735Type2,
+        including: tuple[str, ...] = (),
+    ) -> list[str]:
+        """Return the dependency strings of a group, expanding each group once.
+
+        Group names are compared normalized, as specified by PEP 735.
+        """
+        name = normalize_name(group)
+        if name in self.dependency_groups:
+            return self.dependency_groups[name]
+        if name in including:
+            cycle = " -> ".join([*including, name])
+            logger.warning(f"Ignoring circular include-group: {cycle}")
+            return []
+        items = next((v for k, v in groups.items() if normalize_name(k) == name), None)
+        if items is None:
+            logger.warning(f"Ignoring non-existing dependency group: {group}")
+            return []
+        dep_strings = self.expand_pep735_items(items, groups, (*including, name))
+        self.dependency_groups[name] = dep_strings
+        return dep_strings
+
     def assert_is_dict(self, obj: object) -> None:
         if not isinstance(obj, dict):
             raise TypeError("Unexpected dependency format, dict expected.")
@@ -214,21 +337,34 @@ class DependencyReader:
         self.assert_is_dict(section_contents)
         return list(section_contents.keys())
 
-    def read_toml(self, deps_file: str, sections: list[str]) -> list[str]:
-        """Read dependency names from toml spec file."""
-        with open(deps_file, "rb") as infile:
-            contents = tomllib.load(infile)
-
-        dotty_contents = dotty_dict.dotty(contents)  # pyright: ignore[reportUnknownMemberType]
-        dep_names: list[str] = []
-
+    def find_toml_sections(
+        self, contents: ProjectDocument, sections: list[str]
+    ) -> list[tuple[str, object]]:
+        """Return the given (or discovered) sections, along with their contents."""
+        if self.all_sections:
+            found_sections = find_dependency_sections(contents)
+            found = ", ".join(section for section, _ in found_sections)
+            logger.debug(f"Found sections in {self.deps_file}: {found}")
+            return found_sections
+
+        found_sections = []
         for section in sections:
             try:
-                section_contents = cast(AllSupportedTypes, dotty_contents[section])
+                found_sections.append(
+                    (section, get_dependency_section(contents, section))
+                )
             except KeyError:
                 logger.warning(f"Ignoring non-existing section: {section}")
-                continue
+        return found_sections
 
+    def read_toml(self, deps_file: str, sections: list[str]) -> list[str]:
+        """Read dependency names from toml spec file."""
+        contents = load_project_document(deps_file)
+        found_sections = self.find_toml_sections(contents, sections)
+        dep_names: list[str] = []
+
+        for section, value in found_sections:
+            section_contents = cast(AllSupportedTypes, value)
             logger.debug(f"{sections}: {section_contents}")
 
             section_dep_names: list[str] = []
@@ -245,7 +381,8 @@ class DependencyReader:
             elif section.startswith("dependency-groups"):
                 logger.debug(f"Detected PEP-735 toml section in {deps_file}")
                 section_dep_names = self.get_deps_from_pep735_toml(
-                    cast(PEP735Types, section_contents)
+                    cast(PEP735Types, section_contents),
+                    groups=cast(PEP735Type2, contents.get("dependency-groups", {})),
                 )
             elif section.startswith("tool.poetry"):
                 logger.debug(f"Detected Poetry toml section in {deps_file}")
@@ -265,10 +402,26 @@ class DependencyReader:
             else:
                 dep_names.extend(section_dep_names)
 
-        return sorted(dep_names)
+        # groups may include other groups, and extras may overlap
+        return sorted(set(dep_names))
 
     def read_requirements(self, deps_file: str) -> list[str]:
-        """Read dependency names from requirements.txt-format file."""
+        """Read dependency names from requirements.txt-format file.
+
+        Files included with ``-r`` are read too. If the file cannot be parsed
+        with confidence, pip-requirements-parser is used instead.
+        """
+        try:
+            return sorted(read_requirements(deps_file))
+        except (OSError, ValueError) as e:
+            logger.debug(
+                f"Falling back to pip-requirements-parser for {deps_file}: {e}"
+            )
+
+        from pip_requirements_parser import (  # noqa: PLC0415  # pyright: ignore[reportMissingTypeStubs]
+            RequirementsFile,
+        )
+
         dep_from_req = RequirementsFile.from_file(deps_file).requirements
         return sorted([dep.name for dep in dep_from_req if dep.name is not None])
 
@@ -308,124 +461,282 @@ class DependencyReader:
         return None
 
 
+def get_import_nodes(
+    source: str, path: str, *, include_deferred: bool, engine: Engine
+) -> Iterable[ast.AST]:
+    """Get the AST nodes which may hold import statements."""
+    if engine == "fast" and not include_deferred:
+        nodes = extract_top_level_imports(source, path)
+        if nodes is not None:
+            return nodes
+        logger.debug(f"Falling back to AST-parsing {path}")
+
+    try:
+        root = ast.parse(source, path)
+    except SyntaxError as e:
+        logger.warning(f"Syntax error, cannot AST-parse {path}: {e}")
+        return []
+    # TODO(v6): always use ast.walk and make --include-deferred flag a no-op
+    return ast.walk(root) if include_deferred else ast.iter_child_nodes(root)
+
+
+def read_source(path: str, notebook_reader: NotebookReader = "json") -> str:
+    """Read the Python source code of a file or Jupyter notebook."""
+    if Path(path).suffix == ".ipynb":
+        if notebook_reader == "nbconvert":
+            return read_notebook_source_with_nbconvert(path)
+        return read_notebook_source(path)
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        return fh.read()
+
+
 def get_module_info_from_python_file(
-    path: str, *, include_deferred: bool = False
+    path: str,
+    *,
+    include_deferred: bool = False,
+    engine: Engine = "ast",
+    notebook_reader: NotebookReader = "json",
 ) -> Generator[ImportInfo, None, None]:
     """Get imports, based on given filepath.
 
+    With the "fast" engine, top-level imports are extracted without parsing
+    the whole file (see ``creosote.extractors``), falling back to the AST
+    parser when the scanner is not confident. The fast engine does not apply
+    to deferred imports, which always require the full AST.
+
     Credit:
         https://stackoverflow.com/a/9049549/2448495
     """
-    is_notebook = False
-    if Path(path).suffix == ".ipynb":
-        with open(path) as f:
-            notebook_content = nbformat.read(  # type: ignore[no-untyped-call]  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
-                f,
-                as_version=4,
+    try:
+        source = read_source(path, notebook_reader=notebook_reader)
+    except ValueError as e:
+        logger.warning(f"Cannot read notebook {path}: {e}")
+        return
+
+    for node in get_import_nodes(
+        source, path, include_deferred=include_deferred, engine=engine
+    ):
+        if isinstance(node, ast.Import):
+            module: tuple[str, ...] = ()
+        elif isinstance(node, ast.ImportFrom):
+            module = tuple(node.module.split(".")) if node.module else ()
+        else:
+            continue
+
+        for n in node.names:
+            yield ImportInfo(
+                module=module,
+                name=tuple(n.name.split(".")),
+                alias=n.asname,
+            )
+
+
+def get_module_info_from_python_files(
+    paths: list[str],
+    include_deferred: bool,
+    engine: Engine,
+    notebook_reader: NotebookReader,
+) -> list[list[ImportInfo]]:
+    """Get imports for a chunk of files, one list of imports per file.
+
+    This is the unit of work handed to each worker process when scanning
+    in parallel, so it must stay a picklable module-level function.
+    """
+    return [
+        list(
+            get_module_info_from_python_file(
+                path,
+                include_deferred=include_deferred,
+                engine=engine,
+                notebook_reader=notebook_reader,
             )
-        # Convert the notebook to a temporary .py file
-        body, _ = PythonExporter().from_notebook_node(  # type: ignore[no-untyped-call]
-            notebook_content  # pyright: ignore[reportUnknownArgumentType]
         )
+        for path in paths
+    ]
 
-        # delete_on_close parameter only supported in Python 3.12+
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".py") as temp_file:
-            _ = temp_file.write(body.encode("utf-8"))
-            path = temp_file.name
-            is_notebook = True
 
-    root = None
-    with open(path, encoding="utf-8", errors="replace") as fh:
-        try:
-            root = ast.parse(fh.read(), path)
-        except SyntaxError as e:
-            logger.warning(f"Syntax error, cannot AST-parse {path}: {e}")
-
-    if root:
-        # TODO(v6): always use ast.walk and make --include-deferred flag a no-op
-        iter_nodes = ast.walk if include_deferred else ast.iter_child_nodes
-        for node in iter_nodes(root):
-            if isinstance(node, ast.Import):
-                module = []
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module.split(".") if node.module else []
-            else:
-                continue
+def configure_worker(logger_settings: tuple[bool, str] | None) -> None:
+    """Configure the logger of a worker process like the main process.
 
-            if hasattr(node, "names"):
-                for n in node.names:
-                    yield ImportInfo(
-                        module=module,
-                        name=n.name.split("."),
-                        alias=n.asname,
-                    )
-    if is_notebook:
-        Path(path).unlink()
+    Spawned workers start with loguru's default handler, which would log
+    everything to stderr, whatever the verbosity and format.
+    """
+    if logger_settings is not None:
+        formatters.configure_logger(*logger_settings)
 
 
-def get_module_names_from_code(
-    paths: list[str], *, include_deferred: bool = False
-) -> list[ImportInfo]:
-    resolved_paths: list[Path] = []
-    imports: list[ImportInfo] = []
+def chunked(items: list[str], size: int) -> Generator[list[str], None, None]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
 
-    for path in paths:
-        if Path(path).is_dir():
-            resolved_paths.extend(list(Path(path).glob("**/*.py")))
-            resolved_paths.extend(list(Path(path).glob("**/*.ipynb")))
-        else:
-            resolved_paths.append(Path(path).resolve())
 
-    for resolved_path in resolved_paths:
-        logger.debug(f"Parsing {resolved_path}")
-        for import_info in get_module_info_from_python_file(
-            path=str(resolved_path), include_deferred=include_deferred
-        ):
-            imports.append(import_info)
+def scan_files(
+    paths: list[str],
+    *,
+    include_deferred: bool,
+    jobs: int,
+    engine: Engine = "ast",
+    notebook_reader: NotebookReader = "json",
+) -> Iterable[list[ImportInfo]]:
+    """Yield the imports of each file, in the same order as the given paths.
 
-    imports_with_dupes_removed: list[ImportInfo] = []
-    for import_info in imports:
-        if import_info not in imports_with_dupes_removed:
-            imports_with_dupes_removed.append(import_info)
+    With more than one job, files are parsed in chunks by a process pool.
+    ``Executor.map`` returns results in submission order, so the merged
+    result is identical to the serial scan.
+    """
+    if jobs <= 1 or len(paths) < 2:  # noqa: PLR2004
+        for path in paths:
+            yield list(
+                get_module_info_from_python_file(
+                    path,
+                    include_deferred=include_deferred,
+                    engine=engine,
+                    notebook_reader=notebook_reader,
+                )
+            )
+        return
 
-    logger.debug("Imports found in code:")
-    for imp in imports_with_dupes_removed:
-        logger.debug(f"- {imp}")
+    workers = min(jobs, len(paths))
+    chunk_size = max(1, min(64, len(paths) // (workers * 4)))
+    logger.debug(
+        f"Scanning {len(paths)} files using {workers} processes "
+        + f"(chunk size {chunk_size})"
+    )
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=configure_worker,
+        initargs=(formatters.logger_settings,),
+    ) as executor:
+        parse_chunk = functools.partial(
+            get_module_info_from_python_files,
+            include_deferred=include_deferred,
+            engine=engine,
+            notebook_reader=notebook_reader,
+        )
+        for chunk_result in executor.map(parse_chunk, chunked(paths, chunk_size)):
+            yield from chunk_result
+
+
+def get_imports_per_file(  # noqa: PLR0913
+    paths: list[str],
+    *,
+    include_deferred: bool = False,
+    jobs: int = 1,
+    exclude_paths: list[str] | None = None,
+    cache: ImportCache | None = None,
+    engine: Engine = "ast",
+    notebook_reader: NotebookReader = "json",
+) -> dict[str, list[ImportInfo]]:
+    """Return the imports of each source file found in the paths.
+
+    The files are ordered as they were found.
+    """
+    resolved_paths = [
+        str(resolved_path)
+        for resolved_path in walk_source_files(paths, exclude_paths=exclude_paths or [])
+    ]
 
-    return imports_with_dupes_removed
+    # Only parse files which are new or changed since they were cached
+    imports_per_file: dict[str, list[ImportInfo]] = {}
+    if cache is not None:
+        cache.load()
+        for resolved_path in resolved_paths:
+            cached_imports = cache.lookup(resolved_path)
+            if cached_imports is not None:
+                imports_per_file[resolved_path] = cached_imports
+        logger.debug(
+            f"Using cached imports for {len(imports_per_file)} "
+            + f"of {len(resolved_paths)} files"
+        )
 
+    paths_to_parse = [p for p in resolved_paths if p not in imports_per_file]
+    for path_to_parse in paths_to_parse:
+        logger.debug(f"Parsing {path_to_parse}")
+
+    for path_to_parse, file_imports in zip(
+        paths_to_parse,
+        scan_files(
+            paths_to_parse,
+            include_deferred=include_deferred,
+            jobs=jobs,
+            engine=engine,
+            notebook_reader=notebook_reader,
+        ),
+        strict=True,
+    ):
+        imports_per_file[path_to_parse] = file_imports
+        if cache is not None:
+            cache.store(path_to_parse, file_imports)
+
+    if cache is not None:
+        cache.save()
+
+    return {
+        resolved_path: imports_per_file[resolved_path]
+        for resolved_path in resolved_paths
+    }
+
+
+def get_module_names_from_code(  # noqa: PLR0913
+    paths: list[str],
+    *,
+    include_deferred: bool = False,
+    jobs: int = 1,
+    exclude_paths: list[str] | None = None,
+    cache: ImportCache | None = None,
+    engine: Engine = "ast",
+    notebook_reader: NotebookReader = "json",
+) -> list[ImportInfo]:
+    imports_per_file = get_imports_per_file(
+        paths,
+        include_deferred=include_deferred,
+        jobs=jobs,
+        exclude_paths=exclude_paths,
+        cache=cache,
+        engine=engine,
+        notebook_reader=notebook_reader,
+    )
+    return get_unique_imports(imports_per_file.values())
 
-def get_installed_dependency_names(venv: str) -> list[str]:
-    dep_names: list[str] = []
-    for path in Path(venv).glob("**/*.dist-info"):
-        dep_names.append(path.name.split("-")[0])
-    return dep_names
 
+def get_imports_in_paths(
+    imports_per_file: dict[str, list[ImportInfo]], paths: list[str]
+) -> list[ImportInfo]:
+    """Return the imports of the source files within any of the paths."""
+    roots = [os.path.abspath(path) for path in paths]
+
+    def is_within_paths(file_path: str) -> bool:
+        absolute_path = os.path.abspath(file_path)
+        return any(
+            absolute_path == root or absolute_path.startswith(os.path.join(root, ""))
+            for root in roots
+        )
+
+    return get_unique_imports(
+        file_imports
+        for file_path, file_imports in imports_per_file.items()
+        if is_within_paths(file_path)
+    )
 
-def get_excluded_deps_which_are_not_installed(
-    excluded_deps: list[str], venvs: list[str]
-) -> list[str]:
-    dependency_names: list[str] = []
-    if not excluded_deps:
-        return dependency_names
 
-    excluded_deps_canonicalized = [
-        canonicalize_module_name(arg) for arg in excluded_deps
+def get_unique_imports(
+    imports_per_file: Iterable[list[ImportInfo]],
+) -> list[ImportInfo]:
+    imports = [
+        import_info for file_imports in imports_per_file for import_info in file_imports
     ]
 
-    for excluded_dep_name in excluded_deps_canonicalized:
-        for venv in venvs:
-            if excluded_dep_name not in get_installed_dependency_names(venv):
-                dependency_names.append(excluded_dep_name)
+    # dict preserves insertion order, which keeps the first occurrence of each
+    # import while de-duplicating in linear time
+    imports_with_dupes_removed = list(dict.fromkeys(imports))
 
-    dependency_names = list(set(dependency_names))
+    logger.debug("Imports found in code:")
+    for imp in imports_with_dupes_removed:
+        logger.debug(f"- {imp}")
 
-    if dependency_names:
-        logger.warning(
-            "Excluded dependencies not found in virtual environment: "
-            + f"{', '.join(dependency_names)}"
-        )
-    return dependency_names
+    return imports_with_dupes_removed
 
 
 def canonicalize_module_name(module_name: str) -> str:
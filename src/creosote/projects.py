@@ -0,0 +1,58 @@
+"""Load TOML project files, like pyproject.toml or Pipfile, once.
+
+The configuration and the dependencies are read from the same document, so it
+is parsed once and then shared, for as long as the file is not modified.
+"""
+
+import sys
+from pathlib import Path
+from typing import cast
+
+if sys.version_info >= (3, 11):
+    import tomllib  # pyright: ignore[reportUnreachable]
+else:
+    import tomli as tomllib
+
+ProjectDocument = dict[str, object]
+
+# resolved path -> (modification time, size, document)
+_documents: dict[Path, tuple[int, int, ProjectDocument]] = {}
+
+
+def load_project_document(path: str | Path) -> ProjectDocument:
+    """Return the parsed TOML file, parsing it only if it changed.
+
+    The returned document is shared, and must not be modified.
+
+    Raises:
+        FileNotFoundError: if the file does not exist.
+        tomllib.TOMLDecodeError: if the file is not valid TOML.
+    """
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    cached = _documents.get(resolved)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(resolved, "rb") as infile:
+        document = cast(ProjectDocument, tomllib.load(infile))
+    _documents[resolved] = (stat.st_mtime_ns, stat.st_size, document)
+    return document
+
+
+def get_section(document: ProjectDocument, section: str) -> object:
+    """Return the value at the dotted path, e.g. ``tool.poetry.dependencies``.
+
+    Raises:
+        KeyError: if the section does not exist.
+    """
+    value: object = document
+    for key in section.split("."):
+        if not isinstance(value, dict):
+            raise KeyError(section)
+        value = cast(dict[str, object], value)[key]
+    return value
+
+
+def clear_project_documents() -> None:
+    """Forget the loaded documents."""
+    _documents.clear()
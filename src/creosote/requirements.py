@@ -0,0 +1,194 @@
+"""Read dependency names from requirements files, without pip's parser.
+
+Each file is streamed line by line, and files included with ``-r`` are
+followed. Every file is parsed once, and kept for as long as it is not
+modified, so a file included from many others is only read once.
+
+Lines which cannot be handled with confidence raise a ``ValueError``, so that
+the caller can fall back to a full parser.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+# pip strips comments starting at the beginning of a line or after whitespace
+COMMENT_PATTERN = re.compile(r"(?:^|\s+)#.*$")
+# per-requirement options, like --hash, start after the requirement
+REQUIREMENT_OPTIONS_PATTERN = re.compile(r"\s+--?[a-zA-Z].*$")
+INCLUDE_PATTERN = re.compile(
+    r"(?P<option>-r|--requirement|-c|--constraint|-e|--editable)(?:\s*=?\s*|\s+)"
+    r"(?P<value>.+)"
+)
+# PEP 508 name, followed by the extras, version specifier, marker or URL
+NAME_PATTERN = re.compile(
+    r"(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?:$|[\[(;@<>=!~,])"
+)
+EGG_FRAGMENT_PATTERN = re.compile(r"[#&]egg=(?P<name>[A-Za-z0-9._-]+)")
+URL_PATTERN = re.compile(r"(?:[A-Za-z][A-Za-z0-9+.-]*://|file:)")
+ARCHIVE_SUFFIXES = (".whl", ".zip", ".tar.gz", ".tgz", ".tar.bz2", ".tar")
+# e.g. pkg-1.0-py3-none-any.whl, where "-" in the name is escaped as "_"
+WHEEL_FILENAME_PATTERN = re.compile(r"(?P<name>[^-/]+)-[^-/]+(?:-[^-/]+){2,3}\.whl")
+# e.g. my-pkg-1.0.tar.gz, where the version is what follows the last "-"
+SDIST_FILENAME_PATTERN = re.compile(
+    r"(?P<name>[A-Za-z0-9._-]+)-[0-9][^-/]*(?:\.zip|\.tar\.gz|\.tgz|\.tar\.bz2|\.tar)"
+)
+
+
+@dataclass(slots=True)
+class RequirementsFile:
+    """The requirements and includes of a single file."""
+
+    names: list[str] = field(default_factory=list)
+    includes: list[Path] = field(default_factory=list)
+
+
+# resolved path -> (modification time, size, file)
+_files: dict[Path, tuple[int, int, RequirementsFile]] = {}
+
+
+def iter_logical_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the lines without comments, with continuation lines joined.
+
+    Like pip, a comment line ends a continued line, even if it ends with a
+    backslash itself.
+    """
+    parts: list[str] = []
+    for line in lines:
+        line_ = line.rstrip("\r\n")
+        is_comment = COMMENT_PATTERN.match(line_) is not None
+        if line_.endswith("\\") and not is_comment:
+            parts.append(line_[:-1])
+            continue
+        # the leading space makes sure that the comment is stripped when joined
+        parts.append(f" {line_}" if is_comment else line_)
+        logical_line = COMMENT_PATTERN.sub("", "".join(parts)).strip()
+        parts = []
+        if logical_line:
+            yield logical_line
+    if parts:
+        logical_line = COMMENT_PATTERN.sub("", "".join(parts)).strip()
+        if logical_line:
+            yield logical_line
+
+
+def get_name_from_url(url: str) -> str | None:
+    """Return the name of the requirement at a URL or path, if any.
+
+    The name is taken from the ``#egg=`` fragment, or else from the filename
+    of a wheel or source distribution.
+    """
+    match = EGG_FRAGMENT_PATTERN.search(url)
+    if match:
+        return match.group("name")
+    filename = re.split(r"[?#]", url, maxsplit=1)[0].rsplit("/", 1)[-1]
+    for pattern in (WHEEL_FILENAME_PATTERN, SDIST_FILENAME_PATTERN):
+        match = pattern.fullmatch(filename)
+        if match:
+            return match.group("name")
+    return None
+
+
+def parse_requirement(line: str) -> str | None:
+    """Return the name of a requirement, or None for URLs and paths without one.
+
+    Raises:
+        ValueError: if the line is not a requirement.
+    """
+    requirement = REQUIREMENT_OPTIONS_PATTERN.sub("", line)
+    if not URL_PATTERN.match(requirement) and not requirement.startswith(
+        (".", "/", "~")
+    ):
+        match = NAME_PATTERN.match(requirement)
+        if match is None:
+            raise ValueError(f"Cannot parse requirement: {line}")
+        # a bare archive filename, e.g. pkg-1.0-py3-none-any.whl, looks like
+        # a name, but a direct reference, e.g. pkg @ https://..., is named
+        if match.end("name") < len(requirement) or not requirement.endswith(
+            ARCHIVE_SUFFIXES
+        ):
+            return match.group("name")
+    return get_name_from_url(requirement)
+
+
+def parse_requirements_file(path: Path, lines: Iterable[str]) -> RequirementsFile:
+    """Parse the lines of a requirements file.
+
+    Raises:
+        ValueError: if a line cannot be parsed.
+    """
+    requirements_file = RequirementsFile()
+    for line in iter_logical_lines(lines):
+        if not line.startswith("-"):
+            name = parse_requirement(line)
+            if name is not None:
+                requirements_file.names.append(name)
+            continue
+
+        match = INCLUDE_PATTERN.fullmatch(line)
+        if match is None:
+            # global options, like --index-url or --require-hashes
+            continue
+        option, value = match.group("option", "value")
+        if option in ("-r", "--requirement"):
+            requirements_file.includes.append(path.parent / value.strip())
+        elif option in ("-e", "--editable"):
+            name = get_name_from_url(value)
+            if name is not None:
+                requirements_file.names.append(name)
+        # constraints files restrict versions, but do not add dependencies
+    return requirements_file
+
+
+def load_requirements_file(path: Path) -> RequirementsFile:
+    """Return the parsed file, parsing it only if it changed."""
+    resolved = path.resolve()
+    stat = resolved.stat()
+    cached = _files.get(resolved)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    logger.debug(f"Reading requirements from {path}")
+    with open(resolved, encoding="utf-8") as infile:
+        requirements_file = parse_requirements_file(resolved, infile)
+    _files[resolved] = (stat.st_mtime_ns, stat.st_size, requirements_file)
+    return requirements_file
+
+
+def read_requirements(path: str | Path) -> list[str]:
+    """Return the dependency names of the file and the files it includes.
+
+    Raises:
+        OSError: if a file cannot be read.
+        ValueError: if a line cannot be parsed.
+    """
+    names: list[str] = []
+    visited: set[Path] = set()
+    # files being read, from the given file to the current include
+    stack: list[Path] = []
+
+    def visit(path: Path) -> None:
+        resolved = path.resolve()
+        if resolved in stack:
+            cycle = " -> ".join(str(p) for p in [*stack, resolved])
+            logger.warning(f"Ignoring circular requirements include: {cycle}")
+            return
+        if resolved in visited:
+            return
+        visited.add(resolved)
+        stack.append(resolved)
+        requirements_file = load_requirements_file(resolved)
+        names.extend(requirements_file.names)
+        for include in requirements_file.includes:
+            visit(include)
+        _ = stack.pop()
+
+    visit(Path(path))
+    return list(dict.fromkeys(names))
+
+
+def clear_requirements_files() -> None:
+    """Forget the parsed files."""
+    _files.clear()
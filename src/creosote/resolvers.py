@@ -1,51 +1,55 @@
-import os
-import pathlib
-import re
+import functools
+import time
 from pathlib import Path
 
 from loguru import logger
 
-from creosote.models import DependencyInfo, ImportInfo
-
-# Define the PEP 440 compliant version pattern (non-capturing)
-# https://packaging.python.org/en/latest/specifications/version-specifiers/
-VERSION_PATTERN_STR = (
-    r"v?(?:(?:[0-9]+!)?"  # epoch
-    r"(?:[0-9]+(?:\.[0-9]+)*)"  # release
-    r"(?:(?:[-_\.]?(?:a|b|c|rc|alpha|beta|pre|preview)[-_\.]?(?:[0-9]+)?))?"  # pre
-    r"(?:(?:-(?:[0-9]+))|(?:[-_\.]?(?:post|rev|r)[-_\.]?(?:[0-9]+)?))?"  # post
-    r"(?:(?:[-_\.]?(?:dev)[-_\.]?(?:[0-9]+)?))?)"  # dev
-    r"(?:\+[a-z0-9]+(?:[-_\.][a-z0-9]+)*)?"  # local
+from creosote.cache import VenvCache
+from creosote.distributions import (
+    VenvIndex,
+    find_module,
+    normalize_name,
+    read_record_import_names,
+    read_top_level_txt,
 )
+from creosote.models import DependencyInfo, DistributionInfo, ImportInfo
+from creosote.trie import ModuleTrie
 
 
 class DepsResolver:
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         imports: list[ImportInfo],
         dependency_names: list[str],
         venvs: list[str],
+        *,
+        venv_cache: VenvCache | None = None,
+        venv_index: VenvIndex | None = None,
+        wheelhouses: list[str] | None = None,
+        image_archives: list[str] | None = None,
     ):
         self.imports: list[ImportInfo] = imports
         self.dependencies: list[DependencyInfo] = [
             DependencyInfo(name=dep) for dep in dependency_names
         ]
         self.venvs: list[str] = venvs
-
-        # Capture package names before PEP 440 compliant versions.
-        # Package name allows letters, numbers, underscore, dot, hyphen.
-        # Version part uses the non-capturing pattern defined above.
-        # re.IGNORECASE handles version specifier case (e.g., rc vs RC).
-        self.top_level_txt_pattern: re.Pattern[str] = re.compile(
-            rf"\/([\w\.-]+)-(?:{VERSION_PATTERN_STR})\.dist-info\/top_level\.txt",
-            re.IGNORECASE,
-        )
-        self.record_pattern: re.Pattern[str] = re.compile(
-            rf"\/([\w\.-]+)-(?:{VERSION_PATTERN_STR})\.dist-info\/RECORD", re.IGNORECASE
-        )
-
-        self.top_level_filepaths: list[pathlib.Path] = []
-        self.record_filepaths: list[pathlib.Path] = []
+        self.venv_cache: VenvCache | None = venv_cache
+        # index file written by "creosote index build", used instead of venvs
+        self.venv_index: VenvIndex | None = venv_index
+        # directories of wheel files, used in addition to venvs
+        self.wheelhouses: list[str] = wheelhouses or []
+        # container image (layer) tarballs, used in addition to venvs
+        self.image_archives: list[str] = image_archives or []
+
+        # PEP 503 normalized distribution name -> installed distribution
+        self.distributions: dict[str, DistributionInfo] = {}
+        self.venv_indexes: list[VenvIndex] = []
+        # wheelhouses and image archives, available in addition to each venv
+        self.extra_indexes: list[VenvIndex] = []
+        # where modules of the venvs are imported from, found on demand
+        self.search_paths: list[str] | None = None
+        # dotted import name -> dependencies providing it
+        self.module_trie: ModuleTrie[DependencyInfo] = ModuleTrie()
         self.unused_deps: list[DependencyInfo] = []
 
     @staticmethod
@@ -53,40 +57,152 @@ class DepsResolver:
         return module_name.replace("-", "_").replace(".", "_").strip()
 
     def is_importable(self, module_name: str) -> bool:
-        try:
-            __import__(self.canonicalize_module_name(module_name))
-            return True
-        except ImportError:
-            return False
+        """Return whether the module can be found in any of the venvs.
+
+        The venvs' site-packages (and the paths added by their .pth files)
+        are searched without importing anything.
+        """
+        if self.search_paths is None:
+            self.search_paths = list(
+                dict.fromkeys(
+                    path
+                    for index in self.venv_indexes
+                    for path in index.get_search_paths()
+                )
+            )
+        return bool(self.search_paths) and find_module(module_name, self.search_paths)
+
+    def index_venv(self, venv: str) -> VenvIndex:
+        start = time.perf_counter()
+        if not Path(venv).exists():
+            if self.wheelhouses or self.image_archives:
+                logger.debug(f"Virtual environment '{venv}' does not exist")
+            else:
+                logger.warning(
+                    f"Virtual environment '{venv}' does not exist, "
+                    + "cannot resolve top-level names. "
+                    + "This may lead to incorrect results."
+                )
+        index = self.venv_cache.lookup(venv) if self.venv_cache else None
+        if index is None:
+            logger.debug(f"Indexing installed distributions in venv {venv}...")
+            index = VenvIndex.from_venv(venv)
+        logger.debug(
+            f"Indexed {len(index.distributions)} distributions in venv {venv} "
+            + f"in {time.perf_counter() - start:.3f}s"
+        )
+        return index
 
-    def gather_filepaths(self, venv: str, glob_str: str) -> list[Path]:
-        logger.debug(f"Gathering all top_level.txt files in venv {venv}...")
-        venv_path = pathlib.Path(venv)
-        filepaths = list(venv_path.glob(glob_str))
-        for filepath in filepaths:
-            logger.debug(f"Found {filepath}")
-        return sorted(set(filepaths))
+    def index_wheelhouse(self, wheelhouse: str) -> VenvIndex:
+        from creosote.wheels import index_wheelhouse  # noqa: PLC0415
 
-    def gather_top_level_filepaths(self, venv: str) -> None:
-        """Gathers all top_level.txt filepaths in the venv.
+        start = time.perf_counter()
+        if not Path(wheelhouse).is_dir():
+            logger.warning(f"Wheelhouse '{wheelhouse}' does not exist")
+        index = index_wheelhouse(wheelhouse)
+        logger.debug(
+            f"Indexed {len(index.distributions)} distributions in wheelhouse "
+            + f"{wheelhouse} in {time.perf_counter() - start:.3f}s"
+        )
+        return index
 
-        Note:
-            The path may contain case sensitive variations of the
-            dependency name, like e.g. GitPython for gitpython.
-        """
+    def index_image_archive(self, image_archive: str) -> VenvIndex:
+        from creosote.archives import index_image_archive  # noqa: PLC0415
+
+        start = time.perf_counter()
+        index = index_image_archive(image_archive)
+        logger.debug(
+            f"Indexed {len(index.distributions)} distributions in image archive "
+            + f"{image_archive} in {time.perf_counter() - start:.3f}s"
+        )
+        return index
 
-        glob_str = "**/*.dist-info/top_level.txt"
-        self.top_level_filepaths = self.gather_filepaths(venv=venv, glob_str=glob_str)
+    def gather_distributions(self) -> None:
+        """Gathers all installed distributions in the venvs and other sources.
 
-    def gather_record_filepaths(self, venv: str) -> None:
-        """Gathers all RECORD filepaths in the venv.
+        The venvs, wheelhouses and image archives are indexed concurrently.
+        When a distribution is found in more than one of them, the one in the
+        venv given first is used, then wheelhouses, then image archives. When
+        a venv index file is given, its distributions are used instead.
 
         Note:
-            The path may contain case sensitive variations of the
-            dependency name, like e.g. GitPython for gitpython.
+            The metadata directory may contain case sensitive variations of
+            the dependency name, like e.g. GitPython for gitpython. Names are
+            therefore normalized, so that each dependency can be looked up
+            directly.
         """
-        glob_str = "**/*.dist-info/RECORD"
-        self.record_filepaths = self.gather_filepaths(venv=venv, glob_str=glob_str)
+        if self.venv_index is not None:
+            self.venv_indexes = []
+            self.distributions = self.venv_index.distributions_by_name
+            return
+
+        venvs = list(dict.fromkeys(self.venvs))
+        sources = (
+            [functools.partial(self.index_venv, venv) for venv in venvs]
+            + [
+                functools.partial(self.index_wheelhouse, wheelhouse)
+                for wheelhouse in dict.fromkeys(self.wheelhouses)
+            ]
+            + [
+                functools.partial(self.index_image_archive, image_archive)
+                for image_archive in dict.fromkeys(self.image_archives)
+            ]
+        )
+        if self.venv_cache is not None:
+            self.venv_cache.load()
+        if len(sources) > 1:
+            from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+            with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+                futures = [executor.submit(source) for source in sources]
+                indexes = [future.result() for future in futures]
+        else:
+            indexes = [source() for source in sources]
+
+        # only venvs are cached, wheels are cheap to read
+        self.venv_indexes = indexes[: len(venvs)]
+        self.extra_indexes = indexes[len(venvs) :]
+        self.distributions = VenvIndex.merge(indexes, venv="").distributions_by_name
+
+    def get_uninstalled_dependency_names(
+        self, dependency_names: list[str]
+    ) -> list[str]:
+        """Return the dependencies which are missing from any of the venvs.
+
+        Distributions in wheelhouses and image archives count as installed in
+        each venv. Must be called after gathering the distributions.
+        """
+        if self.venv_index is not None:
+            installed_per_venv = [set(self.distributions)]
+        else:
+            extra_names = {
+                name
+                for index in self.extra_indexes
+                for name in index.distributions_by_name
+            }
+            installed_per_venv = [
+                set(index.distributions_by_name) | extra_names
+                for index in self.venv_indexes
+            ] or ([extra_names] if self.extra_indexes else [])
+        return [
+            name
+            for name in dependency_names
+            if any(
+                normalize_name(name) not in installed
+                for installed in installed_per_venv
+            )
+        ]
+
+    def save_venv_cache(self) -> None:
+        """Persist the venv indexes, with the import names read so far."""
+        if self.venv_cache is None:
+            return
+        for index in self.venv_indexes:
+            self.venv_cache.store(index)
+        self.venv_cache.save()
+
+    def find_distribution(self, dep_info: DependencyInfo) -> DistributionInfo | None:
+        return self.distributions.get(normalize_name(dep_info.name))
 
     def map_dep_to_import_via_top_level_txt_file(
         self, dep_info: DependencyInfo
@@ -96,76 +212,113 @@ class DepsResolver:
         Return True if import name was found in the top_level.txt,
         otherwise return False.
         """
-
-        for top_level_filepath in self.top_level_filepaths:
-            normalized_top_level_filepath = top_level_filepath.as_posix()
-            matches: list[str] = self.top_level_txt_pattern.findall(
-                normalized_top_level_filepath
+        distribution = self.find_distribution(dep_info)
+        if (
+            distribution is not None
+            and distribution.top_level_import_names is None
+            and distribution.top_level_txt_path is not None
+        ):
+            distribution.top_level_import_names = read_top_level_txt(
+                distribution.top_level_txt_path
             )
-            for name_from_top_level in matches:
-                if (
-                    self.canonicalize_module_name(name_from_top_level).lower()
-                    == self.canonicalize_module_name(dep_info.name).lower()
-                ):
-                    with open(
-                        top_level_filepath, encoding="utf-8", errors="replace"
-                    ) as infile:
-                        lines = infile.readlines()
-                    dep_info.top_level_import_names = [line.strip() for line in lines]
-                    import_names = ", ".join(dep_info.top_level_import_names)
-                    logger.debug(
-                        f"[{dep_info.name}] found import name(s) "
-                        + f"via top_level.txt: {import_names} ⭐️"
-                    )
-                    return True
-        logger.debug(f"[{dep_info.name}] did not find dep in a top_level.txt file")
-        return False
+        if distribution is None or distribution.top_level_import_names is None:
+            logger.debug(f"[{dep_info.name}] did not find dep in a top_level.txt file")
+            return False
+
+        dep_info.top_level_import_names = list(distribution.top_level_import_names)
+        import_names = ", ".join(dep_info.top_level_import_names)
+        logger.debug(
+            f"[{dep_info.name}] found import name(s) "
+            + f"via top_level.txt: {import_names} ⭐️"
+        )
+        return True
 
     def map_dep_to_import_via_record_file(self, dep_info: DependencyInfo) -> bool:
-        for record_filepath in self.record_filepaths:
-            normalized_record_filepath = record_filepath.as_posix()
-            matches: list[str] = self.record_pattern.findall(normalized_record_filepath)
-            for name_from_record in matches:
-                if (
-                    self.canonicalize_module_name(name_from_record).lower()
-                    == self.canonicalize_module_name(dep_info.name).lower()
-                ):
-                    with open(
-                        record_filepath, encoding="utf-8", errors="replace"
-                    ) as infile:
-                        lines = infile.readlines()
-
-                    import_names_found: list[str] = []
-                    for line in lines:
-                        candidate, _hash, _size = line.split(",")
-                        if candidate.endswith(".py") and "__init__" in candidate:
-                            import_name = candidate.split(os.sep)[0]
-                            if import_name not in import_names_found:
-                                import_names_found.append(import_name)
-
-                            dep_info.record_import_names = import_names_found
-
-                            import_names = ",".join(dep_info.record_import_names)
-                            logger.debug(
-                                f"[{dep_info.name}] found import name "
-                                + f"via RECORD: {import_names} ⭐️"
-                            )
-                            return True
+        distribution = self.find_distribution(dep_info)
+        if distribution is not None:
+            if (
+                distribution.record_import_names is None
+                and distribution.record_path is not None
+            ):
+                distribution.record_import_names = read_record_import_names(
+                    distribution.record_path
+                )
+            if distribution.record_import_names:
+                dep_info.record_import_names = list(distribution.record_import_names)
+                import_names = ", ".join(dep_info.record_import_names)
+                logger.debug(
+                    f"[{dep_info.name}] found import name(s) "
+                    + f"via RECORD: {import_names} ⭐️"
+                )
+                return True
 
         logger.debug(f"[{dep_info.name}] did not find dep in a RECORD file")
         return False
 
+    def map_dep_to_import_via_known_import_names(
+        self, dep_info: DependencyInfo
+    ) -> bool:
+        """Map dependency to import via the bundled table of known import names.
+
+        This is used for dependencies which are not installed in the venv.
+        """
+        from creosote.known_import_names import (  # noqa: PLC0415
+            VERSION,
+            lookup_import_names,
+        )
+
+        import_names = lookup_import_names(normalize_name(dep_info.name))
+        if import_names is None:
+            return False
+        dep_info.known_import_names = import_names
+        logger.debug(
+            f"[{dep_info.name}] found import name(s) via known import names "
+            + f"(version {VERSION}): {', '.join(import_names)} ⭐️"
+        )
+        return True
+
+    @classmethod
+    def get_probable_module_names(cls, dep_name: str) -> list[str]:
+        canonical_name = cls.canonicalize_module_name(dep_name)
+        module_names = [
+            canonical_name,
+            canonical_name.lower(),
+            canonical_name.replace("_", ""),
+            canonical_name.lower().replace("_", ""),
+        ]
+        return [name for name in dict.fromkeys(module_names) if name.isidentifier()]
+
+    def map_dep_to_import_via_module_probe(self, dep_info: DependencyInfo) -> bool:
+        """Map dependency to import by looking for likely modules in the venv.
+
+        This is used for installed distributions whose metadata holds no
+        import names. Nothing is imported.
+        """
+        for module_name in self.get_probable_module_names(dep_info.name):
+            if self.is_importable(module_name):
+                dep_info.probed_import_names = [module_name]
+                logger.debug(
+                    f"[{dep_info.name}] found import name "
+                    + f"via the venv's paths: {module_name} ⭐️"
+                )
+                return True
+        return False
+
     def map_dep_to_canonical_name(self, dep_info: DependencyInfo) -> str:
         return self.canonicalize_module_name(dep_info.name)
 
     def populate_dependency_info(self) -> None:
         """Populate DependencyInfo object with import naming info.
 
-        There are three strategies from where the import name can be
+        There are five strategies from where the import name can be
         found:
             1. In the top_level.txt file in the venv.
             2. From the RECORD file in the venv.
-            3. Guess the import name by canonicalizing the dep name.
+            3. If neither is found, from the import names of well-known
+               distributions bundled with creosote.
+            4. If the dep is installed, but still no import name was found,
+               by looking for modules named like the dep in the venv.
+            5. Guess the import name by canonicalizing the dep name.
 
         Later, these gathered import names will be compared against the
         imports found in the source code by the AST parser.
@@ -181,26 +334,85 @@ class DepsResolver:
             # find the import name in the RECORD file
             found_via_record = self.map_dep_to_import_via_record_file(dep_info)
 
+            # look up well-known distributions which are not installed
+            found_via_known_import_names = (
+                not found_via_top_level_txt
+                and not found_via_record
+                and self.map_dep_to_import_via_known_import_names(dep_info)
+            )
+
+            # look for modules of installed distributions lacking metadata
+            found_via_module_probe = (
+                not found_via_top_level_txt
+                and not found_via_record
+                and not found_via_known_import_names
+                and self.find_distribution(dep_info) is not None
+                and self.map_dep_to_import_via_module_probe(dep_info)
+            )
+
             # this is really just guessing, but it's better than nothing
             dep_info.canonicalized_dep_name = self.map_dep_to_canonical_name(dep_info)
 
-            if not found_via_top_level_txt and not found_via_record:
+            if (
+                not found_via_top_level_txt
+                and not found_via_record
+                and not found_via_known_import_names
+                and not found_via_module_probe
+            ):
                 logger.debug(
                     f"[{dep_info.name}] relying on canonicalization "
                     + f"fallback: {dep_info.canonicalized_dep_name} 🤞"
                 )
 
-    def associate_dep_with_import(
-        self, dep_info: DependencyInfo, import_name: str
-    ) -> None:
-        for imp in self.imports.copy():
-            if not imp.module and import_name in imp.name:
-                # import <imp.name>
-                dep_info.associated_imports.append(imp)
+    @staticmethod
+    def get_candidate_import_names(dep_info: DependencyInfo) -> list[str]:
+        """Return the (dotted) import names which would mark the dep as used.
 
-            elif imp.name and import_name in imp.module:
-                # from <imp.name> import ...
-                dep_info.associated_imports.append(imp)
+        A top_level.txt lists namespace packages (e.g. "google"), which are
+        shared by many distributions. These are left out whenever the RECORD
+        tells which packages within the namespace package the dependency
+        actually provides (e.g. "google.cloud.storage").
+        """
+        import_names: list[str] = []
+        record_import_names = dep_info.record_import_names or []
+        namespaces = {
+            name.rsplit(".", depth)[0]
+            for name in record_import_names
+            for depth in range(1, name.count(".") + 1)
+        }
+        if dep_info.top_level_import_names:
+            import_names.extend(
+                name
+                for name in dep_info.top_level_import_names
+                if name not in namespaces or name in record_import_names
+            )
+        import_names.extend(record_import_names)
+        if dep_info.known_import_names:
+            import_names.extend(dep_info.known_import_names)
+        if dep_info.probed_import_names:
+            import_names.extend(dep_info.probed_import_names)
+        if dep_info.canonicalized_dep_name:
+            import_names.append(dep_info.canonicalized_dep_name)
+        return import_names
+
+    @classmethod
+    def make_module_trie(
+        cls, dependencies: list[DependencyInfo]
+    ) -> ModuleTrie[DependencyInfo]:
+        """Map each candidate import name to the dependencies providing it."""
+        module_trie: ModuleTrie[DependencyInfo] = ModuleTrie()
+        for dep_info in dependencies:
+            for import_name in cls.get_candidate_import_names(dep_info):
+                module_trie.insert(import_name.split("."), dep_info)
+        return module_trie
+
+    def build_module_trie(self) -> None:
+        self.module_trie = self.make_module_trie(self.dependencies)
+
+    @staticmethod
+    def get_module_path(imp: ImportInfo) -> list[str]:
+        # Django apps are dotted names in a single part
+        return ".".join(imp.module + imp.name).split(".")
 
     def resolve(self) -> None:
         """Associate dependency name with import (module) name.
@@ -209,18 +421,16 @@ class DepsResolver:
         will now attempt to associate these imports with the
         DependencyInfo data, gathered from the venv's top_level.txt,
         the RECORD and a best-guess.
+
+        Each import is attributed to the dependencies providing the longest
+        prefix of its full module path, e.g. ``from google.cloud import
+        storage`` to google-cloud-storage, but not to google-api-core.
         """
-        for dep_info in self.dependencies:
-            if dep_info.top_level_import_names:
-                for top_level_import_name in dep_info.top_level_import_names:
-                    self.associate_dep_with_import(dep_info, top_level_import_name)
-            if dep_info.record_import_names:
-                for record_import_name in dep_info.record_import_names:
-                    self.associate_dep_with_import(dep_info, record_import_name)
-            if dep_info.canonicalized_dep_name:
-                self.associate_dep_with_import(
-                    dep_info, dep_info.canonicalized_dep_name
-                )
+        self.build_module_trie()
+        for imp in self.imports:
+            module_path = self.get_module_path(imp)
+            for dep_info in self.module_trie.longest_prefix(module_path):
+                dep_info.associated_imports.append(imp)
 
     def get_unused_dependencies(self) -> None:
         self.unused_deps = [
@@ -230,17 +440,9 @@ class DepsResolver:
         ]
 
     def resolve_unused_dependency_names(self) -> list[str]:
-        for venv in self.venvs:
-            if not Path(venv).exists():
-                logger.warning(
-                    f"Virtual environment(s) '{', '.join(self.venvs)}' does not exist, "
-                    + "cannot resolve top-level names. "
-                    + "This may lead to incorrect results."
-                )
-            self.gather_top_level_filepaths(venv=venv)
-            self.gather_record_filepaths(venv=venv)
-
+        self.gather_distributions()
         self.populate_dependency_info()
+        self.save_venv_cache()
         self.resolve()
         self.get_unused_dependencies()
 
@@ -256,3 +458,37 @@ class DepsResolver:
         )
 
         return unused_dependency_names
+
+    def resolve_unused_dependency_names_per_section(
+        self,
+        section_dependency_names: dict[str, list[str]],
+        section_imports: dict[str, list[ImportInfo]],
+    ) -> dict[str, list[str]]:
+        """Return the unused dependencies of each section.
+
+        The distributions are gathered, and the import names of the
+        dependencies of all sections found, only once. The dependencies of
+        each section are then only associated with that section's imports.
+        """
+        self.gather_distributions()
+        self.populate_dependency_info()
+        self.save_venv_cache()
+
+        dependencies = {dep_info.name: dep_info for dep_info in self.dependencies}
+        unused_per_section: dict[str, list[str]] = {}
+        for section, dependency_names in section_dependency_names.items():
+            section_dependencies = [dependencies[name] for name in dependency_names]
+            module_trie = self.make_module_trie(section_dependencies)
+            used = {
+                dep_info.name
+                for imp in section_imports.get(section, [])
+                for dep_info in module_trie.longest_prefix(self.get_module_path(imp))
+            }
+            unused_per_section[section] = sorted(
+                name for name in dependency_names if name not in used
+            )
+            logger.debug(
+                f"Unused dependencies in {section}: "
+                + f"{', '.join(unused_per_section[section])}"
+            )
+        return unused_per_section
@@ -0,0 +1,36 @@
+from collections.abc import Sequence
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class ModuleTrie(Generic[T]):
+    """Map dotted module paths to their owners, matched by longest prefix.
+
+    Owning ``google.cloud.storage`` covers ``google.cloud.storage.blob``, but
+    not ``google.cloud.bigquery`` or ``google`` itself.
+    """
+
+    def __init__(self) -> None:
+        self.children: dict[str, ModuleTrie[T]] = {}
+        self.owners: list[T] = []
+
+    def insert(self, module_path: Sequence[str], owner: T) -> None:
+        node = self
+        for part in module_path:
+            node = node.children.setdefault(part, ModuleTrie())
+        if not any(existing is owner for existing in node.owners):
+            node.owners.append(owner)
+
+    def longest_prefix(self, module_path: Sequence[str]) -> list[T]:
+        """Return the owners of the longest prefix of the module path."""
+        owners: list[T] = []
+        node = self
+        for part in module_path:
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            if node.owners:
+                owners = node.owners
+        return owners
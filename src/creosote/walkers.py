@@ -0,0 +1,264 @@
+import os
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+SOURCE_SUFFIXES = (".py", ".ipynb")
+
+# Directories which never contain the project's own source code, but which can
+# be huge (e.g. a virtual environment created inside the project folder).
+# Generic names like "build" may be real packages, so those are left to
+# .gitignore and --exclude-path.
+PRUNED_DIRECTORY_NAMES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".mypy_cache",
+        ".nox",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".venv",
+        "__pycache__",
+        "node_modules",
+    }
+)
+
+
+def translate_glob(pattern: str) -> str:
+    """Translate a gitignore-style glob pattern into a regular expression.
+
+    Supports ``*``, ``?``, ``[...]`` and ``**`` (matching zero or more
+    directories). Unlike ``fnmatch``, ``*`` does not match ``/``.
+    """
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif char == "*":
+            regex += "[^/]*"
+            i += 1
+        elif char == "?":
+            regex += "[^/]"
+            i += 1
+        elif char == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            contents = pattern[i + 1 : end]
+            if contents.startswith("!"):
+                contents = "^" + contents[1:]
+            regex += f"[{contents}]"
+            i = end + 1
+        elif char == "\\" and i + 1 < len(pattern):
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(char)
+            i += 1
+    return regex
+
+
+@dataclass(frozen=True, slots=True)
+class IgnorePattern:
+    regex: re.Pattern[str]
+    negated: bool
+    directory_only: bool
+
+
+@dataclass(slots=True)
+class IgnoreRules:
+    """Gitignore-style patterns, relative to a base directory."""
+
+    base: str
+    patterns: list[IgnorePattern] = field(default_factory=list)
+
+    @classmethod
+    def from_lines(cls, base: str, lines: Sequence[str]) -> "IgnoreRules":
+        rules = cls(base=base)
+        for raw_line in lines:
+            line = raw_line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            directory_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # A pattern containing a slash (other than a trailing one) is
+            # relative to the base directory, otherwise it matches at any depth.
+            anchored = "/" in line
+            line = line.lstrip("/")
+            prefix = "" if anchored else "(?:.*/)?"
+            rules.patterns.append(
+                IgnorePattern(
+                    regex=re.compile(prefix + translate_glob(line) + r"\Z"),
+                    negated=negated,
+                    directory_only=directory_only,
+                )
+            )
+        return rules
+
+    @classmethod
+    def from_file(cls, path: str) -> "IgnoreRules | None":
+        try:
+            with open(path, encoding="utf-8", errors="replace") as infile:
+                lines = infile.readlines()
+        except OSError:
+            return None
+        return cls.from_lines(base=os.path.dirname(path), lines=lines)
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """Return whether the path is ignored, or None if no pattern applies."""
+        if not path.startswith(self.base + os.sep):
+            return None
+        relative_path = path[len(self.base) + 1 :].replace(os.sep, "/")
+        ignored = None
+        for pattern in self.patterns:
+            if pattern.directory_only and not is_dir:
+                continue
+            if pattern.regex.match(relative_path):
+                ignored = not pattern.negated
+        return ignored
+
+
+def is_ignored(rules: Sequence[IgnoreRules], path: str, is_dir: bool) -> bool:
+    """Evaluate rules from the outermost to the innermost, last match wins."""
+    ignored = False
+    for rule in rules:
+        matched = rule.match(path, is_dir)
+        if matched is not None:
+            ignored = matched
+    return ignored
+
+
+class SourceWalker:
+    """Find Python source files and notebooks in a single directory traversal.
+
+    Heavy directories (see ``PRUNED_DIRECTORY_NAMES``) and virtual
+    environments are never descended into, ``.gitignore`` files are honoured
+    and symlink loops are detected by tracking visited directory inodes.
+    """
+
+    def __init__(self, exclude_paths: Sequence[str] = ()) -> None:
+        self.exclude_rules: IgnoreRules = IgnoreRules.from_lines(
+            base=os.getcwd(), lines=exclude_paths
+        )
+        self.visited_directories: set[tuple[int, int]] = set()
+        self.visited_files: set[tuple[int, int]] = set()
+        self.source_files: list[Path] = []
+
+    def is_excluded(self, path: str, is_dir: bool) -> bool:
+        return bool(self.exclude_rules.match(path, is_dir))
+
+    def walk(self, paths: Sequence[str]) -> list[Path]:
+        for path in paths:
+            if Path(path).is_dir():
+                directory = os.path.abspath(path)
+                self.walk_directory(directory, self.gitignore_rules_above(directory))
+            else:
+                self.source_files.append(Path(path).resolve())
+        return self.source_files
+
+    @staticmethod
+    def gitignore_rules_above(directory: str) -> list[IgnoreRules]:
+        """Load .gitignore files of parent directories, up to the git repo root.
+
+        Nothing is loaded when the directory is not inside a git repository.
+        """
+        rules: list[IgnoreRules] = []
+        current = directory
+        while not os.path.exists(os.path.join(current, ".git")):
+            parent = os.path.dirname(current)
+            if parent == current:
+                return []
+            current = parent
+            rule = IgnoreRules.from_file(os.path.join(current, ".gitignore"))
+            if rule is not None:
+                rules.append(rule)
+        return list(reversed(rules))
+
+    def is_pruned(self, entry: os.DirEntry[str], rules: list[IgnoreRules]) -> bool:
+        return (
+            entry.name in PRUNED_DIRECTORY_NAMES
+            or is_ignored(rules, entry.path, is_dir=True)
+            or self.is_excluded(entry.path, is_dir=True)
+            or os.path.exists(os.path.join(entry.path, "pyvenv.cfg"))
+        )
+
+    def is_new_source_file(
+        self, entry: os.DirEntry[str], rules: list[IgnoreRules], device: int
+    ) -> bool:
+        if is_ignored(rules, entry.path, is_dir=False) or self.is_excluded(
+            entry.path, is_dir=False
+        ):
+            return False
+        try:
+            if entry.is_symlink():
+                entry_stat = entry.stat()
+                key = (entry_stat.st_dev, entry_stat.st_ino)
+            else:
+                key = (device, entry.inode())
+        except OSError:
+            return False
+        if key in self.visited_files:
+            logger.debug(f"Skipping already visited file {entry.path}")
+            return False
+        self.visited_files.add(key)
+        return True
+
+    def walk_directory(self, directory: str, rules: list[IgnoreRules]) -> None:
+        try:
+            stat = os.stat(directory)
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot list {directory}: {e}")
+            return
+
+        key = (stat.st_dev, stat.st_ino)
+        if key in self.visited_directories:
+            logger.debug(f"Skipping already visited directory {directory}")
+            return
+        self.visited_directories.add(key)
+
+        gitignore = IgnoreRules.from_file(os.path.join(directory, ".gitignore"))
+        if gitignore is not None:
+            rules = [*rules, gitignore]
+
+        subdirectories: list[str] = []
+        for entry in entries:
+            try:
+                entry_is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if entry_is_dir:
+                if self.is_pruned(entry, rules):
+                    logger.debug(f"Skipping directory {entry.path}")
+                else:
+                    subdirectories.append(entry.path)
+            elif entry.name.endswith(SOURCE_SUFFIXES) and self.is_new_source_file(
+                entry, rules, device=stat.st_dev
+            ):
+                self.source_files.append(Path(entry.path))
+
+        for subdirectory in subdirectories:
+            self.walk_directory(subdirectory, rules)
+
+
+def walk_source_files(
+    paths: Sequence[str], exclude_paths: Sequence[str] = ()
+) -> list[Path]:
+    """Return all Python source files and notebooks found in the given paths."""
+    return SourceWalker(exclude_paths=exclude_paths).walk(paths)
@@ -0,0 +1,97 @@
+"""Read distribution metadata from wheel files, without installing them.
+
+Only the zip file's central directory is read to find the ``*.dist-info``
+members, and only ``top_level.txt`` and ``RECORD`` are decompressed. Nothing
+is extracted to disk.
+"""
+
+import csv
+import io
+import os
+import zipfile
+import zlib
+from pathlib import Path
+
+from loguru import logger
+
+from creosote.distributions import (
+    VenvIndex,
+    normalize_name,
+    parse_metadata_dir_name,
+    parse_record,
+    parse_top_level_txt,
+)
+from creosote.models import DistributionInfo
+
+
+def find_dist_info_dir(wheel: zipfile.ZipFile, wheel_name: str) -> str | None:
+    """Return the name of the wheel's .dist-info directory."""
+    dist_info_dirs = sorted(
+        {
+            member.split("/", 1)[0]
+            for member in wheel.namelist()
+            if member.split("/", 1)[0].endswith(".dist-info")
+        }
+    )
+    # the name of the distribution is the first part of the wheel's file name
+    expected = normalize_name(wheel_name.split("-", 1)[0])
+    for dir_name in dist_info_dirs:
+        parsed = parse_metadata_dir_name(dir_name)
+        if parsed is not None and normalize_name(parsed[0]) == expected:
+            return dir_name
+    return dist_info_dirs[0] if dist_info_dirs else None
+
+
+def read_member(wheel: zipfile.ZipFile, member: str) -> io.TextIOWrapper:
+    return io.TextIOWrapper(
+        wheel.open(member), encoding="utf-8", errors="replace", newline=""
+    )
+
+
+def read_wheel(path: Path) -> DistributionInfo | None:
+    """Return the distribution in the wheel, with its import names read."""
+    try:
+        with zipfile.ZipFile(path) as wheel:
+            dir_name = find_dist_info_dir(wheel, path.name)
+            parsed = None if dir_name is None else parse_metadata_dir_name(dir_name)
+            if dir_name is None or parsed is None:
+                logger.warning(f"No .dist-info directory found in wheel {path}")
+                return None
+
+            name, version = parsed
+            distribution = DistributionInfo(
+                name=name, normalized_name=normalize_name(name), version=version
+            )
+            members = set(wheel.namelist())
+            if f"{dir_name}/top_level.txt" in members:
+                with read_member(wheel, f"{dir_name}/top_level.txt") as infile:
+                    distribution.top_level_import_names = parse_top_level_txt(infile)
+            if f"{dir_name}/RECORD" in members:
+                with read_member(wheel, f"{dir_name}/RECORD") as infile:
+                    distribution.record_import_names = parse_record(infile)
+    except (OSError, EOFError, zlib.error, csv.Error, zipfile.BadZipFile) as e:
+        logger.warning(f"Cannot read wheel {path}: {e}")
+        return None
+    return distribution
+
+
+def index_wheelhouse(wheelhouse: str) -> VenvIndex:
+    """Index the wheels in a directory, e.g. a wheelhouse or pip's wheel cache.
+
+    Subdirectories are searched too, as pip's cache nests wheels in them. When
+    a distribution is found in more than one wheel, the first one (sorted by
+    path) is used.
+    """
+    index = VenvIndex(wheelhouse)
+    wheel_paths: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(wheelhouse):
+        dirnames.sort()
+        wheel_paths.extend(
+            Path(dirpath) / filename
+            for filename in sorted(filenames)
+            if filename.endswith(".whl")
+        )
+    for wheel_path in wheel_paths:
+        index.add(read_wheel(wheel_path))
+    logger.debug(f"Found {len(index.distributions)} wheels in {wheelhouse}")
+    return index
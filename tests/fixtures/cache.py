@@ -0,0 +1,24 @@
+import dataclasses
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from creosote import cli
+from creosote.cache import DEFAULT_CACHE_DIR
+from creosote.config import Config, parse_args
+
+
+@pytest.fixture(autouse=True)
+def temporary_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Write the cache of CLI runs to a temporary directory, not the repo."""
+    cache_dir = tmp_path / DEFAULT_CACHE_DIR
+
+    def parse_args_with_temporary_cache(args: Sequence[str] | None) -> Config:
+        config = parse_args(args)
+        if config.cache_dir != DEFAULT_CACHE_DIR:
+            return config
+        return dataclasses.replace(config, cache_dir=str(cache_dir))
+
+    monkeypatch.setattr(cli, "parse_args", parse_args_with_temporary_cache)
+    return cache_dir
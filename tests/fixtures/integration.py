@@ -9,9 +9,9 @@ class VenvManager:
     def __init__(self, temporary_path: Path) -> None:
         self.temporary_path: Path = temporary_path
 
-    def create_venv(self) -> tuple[Path, Path]:
+    def create_venv(self, name: str = "venv") -> tuple[Path, Path]:
         """Create a simulated virtual environment."""
-        venv_path = self.temporary_path / "venv"
+        venv_path = self.temporary_path / name
         site_packages_path = venv_path / "lib" / "python3.10" / "site-packages"
         site_packages_path.mkdir(parents=True)
         return venv_path, site_packages_path
@@ -30,6 +30,23 @@ class VenvManager:
         _ = pyproject_path.write_text("\n".join(contents))
         return pyproject_path
 
+    def create_metadata_file(
+        self,
+        site_packages_path: Path,
+        metadata_dir_name: str,
+        filename: str,
+        contents: list[str],
+    ) -> Path:
+        """Simulate a file in the metadata folder of an installed dependency.
+
+        The folder is e.g. ``PyYAML-6.0.dist-info`` or ``six-1.16.0.egg-info``.
+        """
+        metadata_path = site_packages_path / metadata_dir_name
+        metadata_path.mkdir(parents=True, exist_ok=True)
+        filepath = metadata_path / filename
+        _ = filepath.write_text("\n".join(contents))
+        return filepath
+
     def create_record(
         self,
         site_packages_path: Path,
@@ -39,11 +56,12 @@ class VenvManager:
     ) -> Path:
         """Simulate an installed dependency and its RECORD file."""
         # Use the provided version in the directory name
-        dist_info_path = site_packages_path / f"{dependency_name}-{version}.dist-info"
-        dist_info_path.mkdir(parents=True, exist_ok=True)
-        record_path = dist_info_path / "RECORD"
-        _ = record_path.write_text("\n".join(contents))
-        return record_path
+        return self.create_metadata_file(
+            site_packages_path,
+            f"{dependency_name}-{version}.dist-info",
+            "RECORD",
+            contents,
+        )
 
     def create_top_level_txt(
         self,
@@ -54,11 +72,12 @@ class VenvManager:
     ) -> Path:
         """Simulate an installed dependency and its top_level.txt file."""
         # Use the provided version in the directory name
-        dist_info_path = site_packages_path / f"{dependency_name}-{version}.dist-info"
-        dist_info_path.mkdir(parents=True, exist_ok=True)
-        top_level_txt_path = dist_info_path / "top_level.txt"
-        _ = top_level_txt_path.write_text("\n".join(contents))
-        return top_level_txt_path
+        return self.create_metadata_file(
+            site_packages_path,
+            f"{dependency_name}-{version}.dist-info",
+            "top_level.txt",
+            contents,
+        )
 
     def create_source_file(
         self,
@@ -0,0 +1,136 @@
+import io
+import json
+import tarfile
+from pathlib import Path
+from typing import Literal
+
+import pytest
+from loguru import logger
+
+from creosote.archives import index_image_archive
+from creosote.models import ImportInfo
+from creosote.resolvers import DepsResolver
+
+SITE_PACKAGES = "usr/local/lib/python3.12/site-packages"
+
+
+Compression = Literal["", "gz"]
+
+
+def make_tar(members: dict[str, bytes], compression: Compression = "") -> bytes:
+    buffer = io.BytesIO()
+    mode: Literal["w", "w:gz"] = "w:gz" if compression == "gz" else "w"
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for name, contents in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(contents)
+            archive.addfile(info, io.BytesIO(contents))
+    return buffer.getvalue()
+
+
+def make_layer(dist_infos: dict[str, str], compression: Compression = "") -> bytes:
+    return make_tar(
+        {
+            f"{SITE_PACKAGES}/{dir_name}.dist-info/top_level.txt": top_level.encode()
+            for dir_name, top_level in dist_infos.items()
+        },
+        compression=compression,
+    )
+
+
+def test_index_single_layer(tmp_path: Path) -> None:
+    path = tmp_path / "layer.tar.gz"
+    _ = path.write_bytes(
+        make_tar(
+            {
+                f"./{SITE_PACKAGES}/PyYAML-6.0.dist-info/top_level.txt": b"yaml\n",
+                f"./{SITE_PACKAGES}/PyYAML-6.0.dist-info/RECORD": (
+                    b"yaml/__init__.py,sha256=abc,100\n"
+                ),
+                f"./{SITE_PACKAGES}/PyYAML-6.0.dist-info/METADATA": b"",
+                f"./{SITE_PACKAGES}/yaml/__init__.py": b"",
+            },
+            compression="gz",
+        )
+    )
+
+    index = index_image_archive(str(path))
+
+    distribution = index.get("pyyaml")
+    assert distribution is not None
+    assert distribution.version == "6.0"
+    assert distribution.top_level_import_names == ["yaml"]
+    assert distribution.record_import_names == ["yaml"]
+
+
+def test_index_docker_save_archive(tmp_path: Path) -> None:
+    path = tmp_path / "image.tar"
+    _ = path.write_bytes(
+        make_tar(
+            {
+                # the top layer is listed first, but applied last
+                "top/layer.tar": make_tar(
+                    {f"{SITE_PACKAGES}/.wh.six-1.16.0.dist-info": b""}
+                ),
+                "base/layer.tar": make_layer(
+                    {"six-1.16.0": "six\n", "loguru-0.7.2": "x\n"}, compression="gz"
+                ),
+                "config.json": b"{}",
+                "manifest.json": json.dumps(
+                    [{"Layers": ["base/layer.tar", "top/layer.tar"]}]
+                ).encode(),
+            }
+        )
+    )
+
+    index = index_image_archive(str(path))
+
+    assert sorted(index.distributions_by_name) == ["loguru"]
+
+
+def test_index_invalid_archive(tmp_path: Path) -> None:
+    path = tmp_path / "image.tar"
+    _ = path.write_text("not a tarball")
+
+    assert index_image_archive(str(path)).distributions == []
+
+
+def test_index_docker_save_archive_with_truncated_layer(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    logger.remove()
+    _ = logger.add(caplog.handler, format="{message}")
+    truncated_layer = make_tar(
+        {
+            f"{SITE_PACKAGES}/six-1.16.0.dist-info/RECORD": bytes(range(256)) * 400,
+            f"{SITE_PACKAGES}/six-1.16.0.dist-info/top_level.txt": b"six\n",
+        },
+        compression="gz",
+    )
+    path = tmp_path / "image.tar"
+    _ = path.write_bytes(
+        make_tar(
+            {
+                "base/layer.tar": make_layer({"loguru-0.7.2": "loguru\n"}),
+                "top/layer.tar": truncated_layer[: len(truncated_layer) // 2],
+            }
+        )
+    )
+
+    index = index_image_archive(str(path))
+
+    assert sorted(index.distributions_by_name) == ["loguru"]
+    assert "Cannot read image layer top/layer.tar" in caplog.text
+
+
+def test_resolve_using_image_archive_without_venv(tmp_path: Path) -> None:
+    path = tmp_path / "layer.tar"
+    _ = path.write_bytes(make_layer({"GitPython-3.1.0": "git\n"}))
+    resolver = DepsResolver(
+        imports=[ImportInfo(module=(), name=("git",))],
+        dependency_names=["GitPython", "unused"],
+        venvs=[str(tmp_path / "missing")],
+        image_archives=[str(path)],
+    )
+
+    assert resolver.resolve_unused_dependency_names() == ["unused"]
@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+
+from creosote.conda import read_conda_package, read_conda_packages
+from creosote.distributions import VenvIndex
+from creosote.models import ImportInfo
+from creosote.resolvers import DepsResolver
+
+
+def write_conda_meta(env: Path, filename: str, package: dict[str, object]) -> Path:
+    conda_meta = env / "conda-meta"
+    conda_meta.mkdir(parents=True, exist_ok=True)
+    path = conda_meta / filename
+    _ = path.write_text(json.dumps(package))
+    return path
+
+
+def make_conda_env(env: Path) -> None:
+    site_packages = env / "lib/python3.12/site-packages"
+    site_packages.mkdir(parents=True)
+    _ = write_conda_meta(
+        env,
+        "pyyaml-6.0-py312h5eee18b_0.json",
+        {
+            "name": "pyyaml",
+            "version": "6.0",
+            "files": [
+                "lib/python3.12/site-packages/PyYAML-6.0.dist-info/METADATA",
+                "lib/python3.12/site-packages/_yaml/__init__.py",
+                "lib/python3.12/site-packages/yaml/__init__.py",
+                "lib/python3.12/site-packages/yaml/reader.py",
+            ],
+            "paths_data": {"paths": [{"_path": "lib/python3.12/site-packages"}]},
+        },
+    )
+    _ = write_conda_meta(
+        env,
+        "libyaml-0.2.5-h7b6447c_0.json",
+        {"name": "libyaml", "version": "0.2.5", "files": ["lib/libyaml.so"]},
+    )
+
+
+def test_read_conda_package(tmp_path: Path) -> None:
+    make_conda_env(tmp_path)
+
+    package = read_conda_package(
+        tmp_path / "conda-meta/pyyaml-6.0-py312h5eee18b_0.json"
+    )
+
+    assert package is not None
+    assert (package.normalized_name, package.version) == ("pyyaml", "6.0")
+    assert package.record_import_names == ["_yaml", "yaml"]
+
+
+def test_read_conda_packages_skips_unreadable_metadata(tmp_path: Path) -> None:
+    make_conda_env(tmp_path)
+    _ = (tmp_path / "conda-meta/broken.json").write_text("{")
+    _ = (tmp_path / "conda-meta/history").write_text("")
+
+    packages = read_conda_packages(tmp_path / "conda-meta")
+
+    assert [p.name for p in packages] == ["libyaml", "pyyaml"]
+    assert packages[0].record_import_names == []
+
+
+def test_windows_conda_package(tmp_path: Path) -> None:
+    path = write_conda_meta(
+        tmp_path,
+        "pywin32-306.json",
+        {
+            "name": "pywin32",
+            "files": [
+                "Lib/site-packages/win32/win32api.pyd",
+                "Lib/site-packages/pythoncom.py",
+                "Scripts/pywin32_postinstall.py",
+            ],
+        },
+    )
+
+    package = read_conda_package(path)
+
+    assert package is not None
+    assert package.version is None
+    assert package.record_import_names == ["pythoncom", "win32.win32api"]
+
+
+def test_mixed_conda_and_pip_env(tmp_path: Path) -> None:
+    make_conda_env(tmp_path)
+    site_packages = tmp_path / "lib/python3.12/site-packages"
+    (site_packages / "requests-2.31.0.dist-info").mkdir()
+    _ = (site_packages / "requests-2.31.0.dist-info/top_level.txt").write_text(
+        "requests\n"
+    )
+    (site_packages / "PyYAML-6.0.dist-info").mkdir()
+    _ = (site_packages / "PyYAML-6.0.dist-info/top_level.txt").write_text("yaml\n")
+
+    index = VenvIndex.from_venv(str(tmp_path))
+
+    assert sorted(index.distributions_by_name) == ["libyaml", "pyyaml", "requests"]
+    # the pip metadata takes precedence over conda's
+    pyyaml = index.get("pyyaml")
+    assert pyyaml is not None
+    assert pyyaml.metadata_path == site_packages / "PyYAML-6.0.dist-info"
+
+
+def test_resolve_conda_env(tmp_path: Path) -> None:
+    make_conda_env(tmp_path)
+    imports = [ImportInfo(module=(), name=("_yaml",))]
+
+    resolver = DepsResolver(
+        imports=imports, dependency_names=["pyyaml"], venvs=[str(tmp_path)]
+    )
+    resolver.resolve_unused_dependency_names()
+
+    assert resolver.unused_deps == []
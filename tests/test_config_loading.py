@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+import pytest
+
 from creosote import config
 
 
@@ -58,6 +60,14 @@ def test_load_defaults_tool_creosote_section_complex(tmp_path: Path) -> None:
     )
 
 
+def test_load_defaults_jobs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pyproject = tmp_path / "pyproject.toml"
+    _ = pyproject.write_text('[tool.creosote]\njobs="auto"')
+    monkeypatch.chdir(tmp_path)
+    configuration = config.parse_args([])
+    assert configuration.jobs == (os.cpu_count() or 1)
+
+
 def test_load_defaults_no_venv() -> None:
     # Unset VIRTUAL_ENV environment variable
     _ = os.environ.pop("VIRTUAL_ENV", None)
@@ -69,3 +79,21 @@ def test_load_defaults_set_venv() -> None:
     os.environ["VIRTUAL_ENV"] = "foo"
     configuration = config.Config()
     assert configuration.venvs == ["foo"]
+
+
+@pytest.mark.parametrize(
+    "section_paths",
+    [
+        pytest.param('"project.dependencies" = 1', id="number"),
+        pytest.param('"project.dependencies" = ["src", 1]', id="list_of_numbers"),
+        pytest.param('"project.dependencies" = {path = "src"}', id="table"),
+    ],
+)
+def test_load_defaults_invalid_section_paths(
+    tmp_path: Path, section_paths: str
+) -> None:
+    pyproject = tmp_path / "pyproject.toml"
+    _ = pyproject.write_text(f"[tool.creosote.section-paths]\n{section_paths}\n")
+
+    with pytest.raises(config.ConfigError, match="Invalid section-paths"):
+        _ = config.load_defaults(pyproject)
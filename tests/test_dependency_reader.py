@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 
 from creosote.parsers import DependencyReader
@@ -58,7 +60,7 @@ def test_read_toml_pep621(
         ),
         (
             ["dependency-groups.typing-test"],
-            ["useful-types"],
+            ["coverage", "mypy", "pytest", "types-requests", "useful-types"],
         ),
     ],
 )
@@ -187,3 +189,127 @@ def test_all_non_existing_sections_returns_empty_list() -> None:
 
     # Should return empty list when no sections exist
     assert dependencies == []
+
+
+def test_deps_file_is_parsed_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    reader = DependencyReader(
+        deps_file="tests/deps_files/pyproject.pep621.toml",
+        sections=["project.dependencies"],
+        exclude_deps=["toml"],
+    )
+    assert reader.read() == ["dotty-dict", "loguru"]
+
+    def fail(*_args: object) -> list[str]:
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(reader, "read_toml", fail)
+
+    assert reader.read_all() == ["dotty-dict", "loguru", "toml"]
+
+
+@pytest.mark.parametrize(
+    ["deps_file", "expected_dependencies"],
+    [
+        (
+            "tests/deps_files/pyproject.pep621.toml",
+            [
+                "black",
+                "creosote",
+                "dotty-dict",
+                "loguru",
+                "loguru-mypy",
+                "mypy",
+                "pytest",
+                "ruff",
+                "toml",
+                "types-toml",
+                "typing_extensions",
+            ],
+        ),
+        (
+            "tests/deps_files/pyproject.pep735.toml",
+            [
+                "coverage",
+                "mypy",
+                "pytest",
+                "sphinx",
+                "sphinx-rtd-theme",
+                "types-requests",
+                "useful-types",
+            ],
+        ),
+        (
+            "tests/deps_files/pyproject.poetry.toml",
+            [
+                "black",
+                "dotty-dict",
+                "loguru",
+                "loguru-mypy",
+                "mypy",
+                "pytest",
+                "ruff",
+                "toml",
+                "types-toml",
+                "typing_extensions",
+            ],
+        ),
+        ("tests/deps_files/Pipfile", ["dotty-dict", "loguru", "pytest", "toml"]),
+    ],
+)
+def test_read_all_sections(deps_file: str, expected_dependencies: list[str]) -> None:
+    reader = DependencyReader(
+        deps_file=deps_file,
+        sections=[],
+        exclude_deps=[],
+        all_sections=True,
+    )
+    assert reader.read() == expected_dependencies
+
+
+def test_circular_include_group(tmp_path: Path) -> None:
+    deps_file = tmp_path / "pyproject.toml"
+    _ = deps_file.write_text(
+        "[dependency-groups]\n"
+        'a = ["foo", {include-group = "B"}]\n'
+        'b = ["bar", {include-group = "a"}, {include-group = "missing"}]\n'
+    )
+    reader = DependencyReader(
+        deps_file=str(deps_file),
+        sections=["dependency-groups.a"],
+        exclude_deps=[],
+    )
+    assert reader.read() == ["bar", "foo"]
+
+
+def test_read_all_sections_with_dotted_group_name(tmp_path: Path) -> None:
+    deps_file = tmp_path / "pyproject.toml"
+    _ = deps_file.write_text(
+        "[dependency-groups]\n"
+        'lint = ["a"]\n'
+        '"lint.strict" = ["b", {include-group = "lint"}]\n'
+        '[tool.poetry.group."docs.api".dependencies]\n'
+        'c = "*"\n'
+    )
+    reader = DependencyReader(
+        deps_file=str(deps_file),
+        sections=[],
+        exclude_deps=[],
+        all_sections=True,
+    )
+    assert reader.read() == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize(
+    "section", ["dependency-groups.test-group", "dependency-groups.lint.strict"]
+)
+def test_dependency_group_section_is_normalized(tmp_path: Path, section: str) -> None:
+    deps_file = tmp_path / "pyproject.toml"
+    _ = deps_file.write_text(
+        '[dependency-groups]\nTest_Group = ["a"]\n"Lint.Strict" = ["a"]\n'
+    )
+    reader = DependencyReader(
+        deps_file=str(deps_file),
+        sections=[section],
+        exclude_deps=[],
+    )
+    assert reader.read() == ["a"]
@@ -0,0 +1,175 @@
+from pathlib import Path
+
+import pytest
+
+from creosote.distributions import (
+    VenvIndex,
+    find_site_packages,
+    normalize_name,
+    parse_metadata_dir_name,
+    read_pth_paths,
+    read_record_import_names,
+)
+from tests.fixtures.integration import VenvManager
+
+
+@pytest.mark.parametrize(
+    ("dir_name", "expected"),
+    [
+        ("loguru-0.7.2.dist-info", ("loguru", "0.7.2")),
+        ("dotty-dict-1.2.3.dist-info", ("dotty-dict", "1.2.3")),
+        ("dotty_dict-1.3.1.dist-info", ("dotty_dict", "1.3.1")),
+        ("ruamel.yaml-0.18.6.dist-info", ("ruamel.yaml", "0.18.6")),
+        (
+            "google_cloud_storage-3.0.0rc1.dist-info",
+            ("google_cloud_storage", "3.0.0rc1"),
+        ),
+        ("torch-2.3.0+cu121.dist-info", ("torch", "2.3.0+cu121")),
+        ("PyYAML-6.0-py3.10.egg-info", ("PyYAML", "6.0")),
+        ("my_package.egg-info", ("my_package", None)),
+        ("not-metadata", None),
+    ],
+)
+def test_parse_metadata_dir_name(
+    dir_name: str, expected: tuple[str, str | None] | None
+) -> None:
+    assert parse_metadata_dir_name(dir_name) == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [("GitPython", "gitpython"), ("ruamel.yaml", "ruamel-yaml"), ("a__b-.c", "a-b-c")],
+)
+def test_normalize_name(name: str, expected: str) -> None:
+    assert normalize_name(name) == expected
+
+
+def test_find_site_packages_in_venv(tmp_path: Path) -> None:
+    site_packages = tmp_path / "lib" / "python3.12" / "site-packages"
+    site_packages.mkdir(parents=True)
+    (tmp_path / "lib64").symlink_to(tmp_path / "lib", target_is_directory=True)
+
+    assert find_site_packages(tmp_path) == [site_packages]
+
+
+def test_find_site_packages_in_pypackages(tmp_path: Path) -> None:
+    pypackages = tmp_path / "__pypackages__"
+    lib = pypackages / "3.12" / "lib"
+    lib.mkdir(parents=True)
+
+    assert find_site_packages(pypackages) == [lib]
+
+
+def test_find_site_packages_given_directly(tmp_path: Path) -> None:
+    assert find_site_packages(tmp_path) == [tmp_path]
+
+
+def test_venv_index(venv_manager: VenvManager) -> None:
+    venv, site_packages = venv_manager.create_venv()
+    _ = venv_manager.create_top_level_txt(site_packages, "GitPython", [], "3.1.0")
+    _ = venv_manager.create_record(site_packages, "loguru", [], "0.7.2")
+    _ = venv_manager.create_metadata_file(
+        site_packages, "six-1.16.0.egg-info", "top_level.txt", []
+    )
+    # dist-info directories within packages must not be picked up
+    _ = venv_manager.create_record(site_packages / "vendored", "nested", [], "1.0")
+
+    index = VenvIndex.from_venv(str(venv))
+
+    assert [(d.normalized_name, d.version) for d in index.distributions] == [
+        ("gitpython", "3.1.0"),
+        ("loguru", "0.7.2"),
+        ("six", "1.16.0"),
+    ]
+    gitpython = index.get("gitpython")
+    assert gitpython is not None
+    assert gitpython.top_level_txt_path == (
+        site_packages / "GitPython-3.1.0.dist-info" / "top_level.txt"
+    )
+    assert gitpython.record_path is None
+    loguru = index.get("Loguru")
+    assert loguru is not None
+    assert loguru.record_path == site_packages / "loguru-0.7.2.dist-info" / "RECORD"
+    assert index.get("nested") is None
+
+
+def test_venv_index_unknown_layout(venv_manager: VenvManager) -> None:
+    tmp_path = venv_manager.temporary_path
+    _ = venv_manager.create_record(tmp_path / "some" / "where", "foo", [], "1.0")
+
+    index = VenvIndex.from_venv(str(tmp_path))
+
+    assert [d.name for d in index.distributions] == ["foo"]
+
+
+def test_venv_index_missing_venv(tmp_path: Path) -> None:
+    assert VenvIndex.from_venv(str(tmp_path / "missing")).distributions == []
+
+
+def test_read_pth_paths(tmp_path: Path) -> None:
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    (tmp_path / "legacy").mkdir()
+    package = tmp_path / "project" / "src" / "strict"
+    package.mkdir(parents=True)
+    _ = (site_packages / "legacy.pth").write_text(
+        f"# comment\nimport sys\n{tmp_path / 'legacy'}\n{tmp_path / 'missing'}\n"
+    )
+    _ = (site_packages / "__editable__.strict-1.0.pth").write_text(
+        "import __editable___strict_1_0_finder; "
+        + "__editable___strict_1_0_finder.install()\n"
+    )
+    _ = (site_packages / "__editable___strict_1_0_finder.py").write_text(
+        "import sys\n"
+        + f"MAPPING: dict[str, str] = {{'strict': {str(package)!r}}}\n"
+        + "NAMESPACES: dict[str, list[str]] = {}\n"
+        + "raise SystemExit(1)\n"
+    )
+
+    assert read_pth_paths(site_packages) == [
+        tmp_path / "project" / "src",
+        tmp_path / "legacy",
+    ]
+
+
+def test_read_record_import_names(tmp_path: Path) -> None:
+    record = tmp_path / "RECORD"
+    _ = record.write_text(
+        "../../../bin/tool,sha256=abc,100\n"
+        "foo-1.0.dist-info/METADATA,sha256=abc,100\n"
+        "foo-1.0.dist-info/RECORD,,\n"
+        "foo-1.0.data/scripts/script.py,sha256=abc,100\n"
+        "foo/__init__.py,sha256=abc,100\n"
+        "foo/__pycache__/__init__.cpython-312.pyc,,\n"
+        "foo/sub/module.py,sha256=abc,100\n"
+        '"foo/data, with a comma.py",sha256=abc,100\n'
+        "six.py,sha256=abc,100\n"
+        "_foo_speedups.cpython-312-x86_64-linux-gnu.so,sha256=abc,100\n"
+        "_foo_win.cp312-win_amd64.pyd,sha256=abc,100\n"
+        "foo.pth,sha256=abc,100\n"
+        "README.md,sha256=abc,100\n"
+        "\n"
+    )
+
+    assert read_record_import_names(record) == [
+        "six",
+        "_foo_speedups",
+        "_foo_win",
+        "foo",
+    ]
+
+
+def test_read_record_import_names_in_namespace_package(tmp_path: Path) -> None:
+    record = tmp_path / "RECORD"
+    _ = record.write_text(
+        "google/cloud/storage/__init__.py,sha256=abc,100\n"
+        "google/cloud/storage/blob.py,sha256=abc,100\n"
+        "google/cloud/storage/_helpers/__init__.py,sha256=abc,100\n"
+        "google/_upb/_message.abi3.so,sha256=abc,100\n"
+        "google_cloud_storage-2.0.0-py3.12-nspkg.pth,sha256=abc,100\n"
+    )
+
+    assert read_record_import_names(record) == [
+        "google.cloud.storage",
+        "google._upb._message",
+    ]
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import pytest
+
+from creosote.extractors import extract_top_level_imports
+from creosote.parsers import Engine, get_module_info_from_python_file
+
+FIXTURE_FILES = sorted(
+    [
+        *Path("src").glob("**/*.py"),
+        *Path("tests").glob("**/*.py"),
+        *Path("tests").glob("**/*.ipynb"),
+    ]
+)
+
+
+def get_imports(path: Path, engine: Engine) -> list[str]:
+    return [
+        f"{'.'.join(i.module)}:{'.'.join(i.name)}:{i.alias}"
+        for i in get_module_info_from_python_file(str(path), engine=engine)
+    ]
+
+
+@pytest.mark.parametrize("path", FIXTURE_FILES, ids=str)
+def test_fast_engine_matches_ast_engine_on_fixtures(path: Path) -> None:
+    assert get_imports(path, "fast") == get_imports(path, "ast")
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("import a\nimport b.c as d, e\n", id="plain"),
+        pytest.param("from . import a\nfrom ..b import c as d\n", id="relative"),
+        pytest.param(
+            "from a import (\n    b,\n    c as d,  # comment\n)\n", id="parens"
+        ),
+        pytest.param("from a import b, \\\n    c\nimport d\n", id="backslash"),
+        pytest.param('"""\nimport not_an_import\n"""\nimport a\n', id="docstring"),
+        pytest.param("x = '''\nfrom fake import thing\n'''\n", id="string"),
+        pytest.param("# import commented\nimport a  # trailing\n", id="comment"),
+        pytest.param(
+            "if True:\n    import a\ntry:\n    import b\nexcept:\n    pass\nimport c\n",
+            id="nested",
+        ),
+        pytest.param("def f():\n    import a\n", id="function"),
+        pytest.param("import a; import b\n", id="semicolon"),
+        pytest.param("x = 1; from a import b\n", id="semicolon_after_statement"),
+        pytest.param("import a\r\nfrom b import (\r\n    c,\r\n)\r\n", id="crlf"),
+        pytest.param("import a", id="no_trailing_newline"),
+        pytest.param("", id="empty"),
+    ],
+)
+def test_fast_engine_matches_ast_engine(tmp_path: Path, source: str) -> None:
+    path = tmp_path / "example.py"
+    _ = path.write_bytes(source.encode())
+
+    assert get_imports(path, "fast") == get_imports(path, "ast")
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("import a; import b\n", id="semicolon"),
+        pytest.param("def f():\n    x = (yield\nfrom g)\n", id="yield_from"),
+    ],
+)
+def test_extract_top_level_imports_gives_up(source: str) -> None:
+    assert extract_top_level_imports(source) is None
+
+
+def test_extract_top_level_imports_skips_strings() -> None:
+    source = 's = "import x"\nt = """\nimport y\n"""\nimport z\n'
+
+    nodes = extract_top_level_imports(source)
+
+    assert nodes is not None
+    assert [alias.name for node in nodes for alias in node.names] == ["z"]
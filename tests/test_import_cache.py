@@ -0,0 +1,174 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from creosote import parsers
+from creosote.__about__ import __version__
+from creosote.cache import CACHE_FORMAT_VERSION, ImportCache, VenvCache, clear_cache
+from creosote.models import ImportInfo
+
+
+def scan(source: Path, cache_dir: Path, include_deferred: bool = False) -> list[str]:
+    imports = parsers.get_module_names_from_code(
+        [str(source)],
+        include_deferred=include_deferred,
+        cache=ImportCache(str(cache_dir), include_deferred=include_deferred),
+    )
+    return [".".join(imp.module + imp.name) for imp in imports]
+
+
+def test_unchanged_files_are_not_parsed_again(
+    tmp_path: Path, mocker: MockerFixture
+) -> None:
+    source = tmp_path / "src"
+    source.mkdir()
+    _ = (source / "a.py").write_text("import mod_a\n")
+    _ = (source / "b.py").write_text("from mod_b import thing\n")
+    cache_dir = tmp_path / "cache"
+
+    assert scan(source, cache_dir) == ["mod_a", "mod_b.thing"]
+
+    spy = mocker.spy(parsers, "get_module_info_from_python_file")
+    assert scan(source, cache_dir) == ["mod_a", "mod_b.thing"]
+    assert spy.call_count == 0
+
+    _ = (source / "b.py").write_text("from mod_c import other_thing\n")
+    assert scan(source, cache_dir) == ["mod_a", "mod_c.other_thing"]
+    assert [call.args[0] for call in spy.call_args_list] == [str(source / "b.py")]
+
+
+def test_deferred_and_top_level_imports_are_cached_separately(tmp_path: Path) -> None:
+    source = tmp_path / "a.py"
+    _ = source.write_text("import mod_a\n\ndef foo():\n    import mod_b\n")
+    cache_dir = tmp_path / "cache"
+
+    assert scan(source, cache_dir) == ["mod_a"]
+    assert scan(source, cache_dir, include_deferred=True) == ["mod_a", "mod_b"]
+    assert scan(source, cache_dir) == ["mod_a"]
+
+
+def test_cache_from_other_version_is_ignored(tmp_path: Path) -> None:
+    source = tmp_path / "a.py"
+    _ = source.write_text("import mod_a\n")
+    stat = source.stat()
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    cache = ImportCache(str(cache_dir), include_deferred=False)
+    _ = cache.path.write_text(
+        json.dumps(
+            {
+                "version": "0.0.0",
+                "files": {
+                    os.path.abspath(source): [
+                        stat.st_mtime_ns,
+                        stat.st_size,
+                        [[[], ["stale"], None]],
+                    ]
+                },
+            }
+        )
+    )
+
+    cache.load()
+
+    assert cache.lookup(str(source)) is None
+
+
+def test_cache_roundtrip_and_clear(tmp_path: Path) -> None:
+    source = tmp_path / "a.py"
+    _ = source.write_text("from x import y as z\n")
+    cache_dir = tmp_path / "cache"
+    imports = [ImportInfo(module=("x",), name=("y",), alias="z")]
+
+    cache = ImportCache(str(cache_dir), include_deferred=False)
+    assert cache.lookup(str(source)) is None
+    cache.store(str(source), imports)
+    cache.save()
+
+    reloaded = ImportCache(str(cache_dir), include_deferred=False)
+    reloaded.load()
+    assert reloaded.lookup(str(source)) == imports
+
+    clear_cache(str(cache_dir))
+    assert not cache_dir.exists()
+
+
+def test_malformed_cache_entries_are_cache_misses(tmp_path: Path) -> None:
+    source = tmp_path / "a.py"
+    _ = source.write_text("import mod_a\n")
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    header = {"version": __version__, "format": CACHE_FORMAT_VERSION}
+    cache = ImportCache(str(cache_dir), include_deferred=False)
+    _ = cache.path.write_text(
+        json.dumps({**header, "files": {os.path.abspath(source): [1]}})
+    )
+    _ = (cache_dir / "venvs.json").write_text(
+        json.dumps({**header, "venvs": {os.path.abspath(tmp_path): {"stamps": {}}}})
+    )
+
+    cache.load()
+    venv_cache = VenvCache(str(cache_dir))
+
+    assert cache.lookup(str(source)) is None
+    assert venv_cache.lookup(str(tmp_path)) is None
+
+
+def test_each_python_version_uses_its_own_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "a.py"
+    _ = source.write_text("import mod_a\n")
+    cache_dir = tmp_path / "cache"
+    assert scan(source, cache_dir) == ["mod_a"]
+
+    monkeypatch.setattr(sys, "version_info", (3, 99, 0, "final", 0))
+    cache = ImportCache(str(cache_dir), include_deferred=False)
+    cache.load()
+
+    assert cache.lookup(str(source)) is None
+
+
+def test_truncated_cache_file_is_ignored(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    _ = (cache_dir / "venvs.json").write_text('{"version": "1.0", "ven')
+
+    venv_cache = VenvCache(str(cache_dir))
+
+    assert venv_cache.lookup(str(tmp_path)) is None
+
+
+def test_entries_of_removed_files_are_pruned(tmp_path: Path) -> None:
+    removed = tmp_path / "removed.py"
+    kept = tmp_path / "kept.py"
+    cache_dir = tmp_path / "cache"
+    cache = ImportCache(str(cache_dir), include_deferred=False)
+    for source in (removed, kept):
+        _ = source.write_text("import mod_a\n")
+        assert cache.lookup(str(source)) is None
+        cache.store(str(source), [ImportInfo(module=(), name=("mod_a",))])
+    removed.unlink()
+    cache.save()
+
+    reloaded = ImportCache(str(cache_dir), include_deferred=False)
+    reloaded.load()
+
+    assert list(reloaded.entries) == [os.path.abspath(kept)]
+
+
+def test_clear_cache_only_removes_cache_files(tmp_path: Path) -> None:
+    _ = (tmp_path / "pyproject.toml").write_text("")
+    _ = (tmp_path / "imports-top-level-ast.json").write_text("{}")
+    _ = (tmp_path / ".gitignore").write_text(".venv\n")
+
+    clear_cache(str(tmp_path))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        ".gitignore",
+        "pyproject.toml",
+    ]
@@ -0,0 +1,48 @@
+import pytest
+
+from creosote.distributions import normalize_name
+from creosote.known_import_names import ENTRIES, lookup_import_names
+from creosote.models import ImportInfo
+from creosote.resolvers import DepsResolver
+
+
+def test_entries_are_sorted_and_normalized() -> None:
+    names = [entry.split()[0] for entry in ENTRIES]
+
+    assert list(ENTRIES) == sorted(ENTRIES)
+    assert len(names) == len(set(names))
+    assert [normalize_name(name) for name in names] == names
+    assert all(len(entry.split()) > 1 for entry in ENTRIES)
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("pillow", ["PIL"]),
+        ("pyyaml", ["_yaml", "yaml"]),
+        ("scikit-learn", ["sklearn"]),
+        ("beautifulsoup4", ["bs4"]),
+        ("beautifulsoup", ["BeautifulSoup"]),
+        ("google-cloud-storage", ["google.cloud.storage"]),
+        ("absl-py", ["absl"]),
+        ("zope-interface", ["zope.interface"]),
+        ("zzz-unknown", None),
+        ("pillo", None),
+        ("", None),
+    ],
+)
+def test_lookup_import_names(name: str, expected: list[str] | None) -> None:
+    assert lookup_import_names(name) == expected
+
+
+def test_known_import_names_of_dependencies_missing_from_venv() -> None:
+    resolver = DepsResolver(
+        imports=[
+            ImportInfo(module=("PIL",), name=("Image",)),
+            ImportInfo(module=(), name=("django",)),
+        ],
+        dependency_names=["Pillow", "Django", "scikit-learn"],
+        venvs=[],
+    )
+
+    assert resolver.resolve_unused_dependency_names() == ["scikit-learn"]
@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from creosote.notebooks import read_notebook_source, strip_ipython_syntax
+from creosote.parsers import get_module_info_from_python_file
+
+
+def write_notebook(path: Path, notebook: dict[str, object]) -> Path:
+    _ = path.write_text(json.dumps(notebook))
+    return path
+
+
+@pytest.mark.parametrize(
+    ("cell_source", "expected"),
+    [
+        pytest.param("import a\n%matplotlib inline\n", "import a\npass", id="magic"),
+        pytest.param("!pip install foo\nimport b", "pass\nimport b", id="shell"),
+        pytest.param("files = !ls\nx = %time f()", "pass\npass", id="assign"),
+        pytest.param("if x:\n    %time f()\n", "if x:\n    pass", id="indented"),
+        pytest.param("np.array?\n??os.path", "pass\npass", id="help"),
+        pytest.param("%%bash\nimport nothing\n", "", id="cell_magic"),
+        pytest.param("x = 'why?'  # really?", "x = 'why?'  # really?", id="question"),
+        pytest.param("a != b\n", "a != b", id="not_equal"),
+        pytest.param(
+            "ok = (1\n      != 2)\n!ls",
+            "ok = (1\n      != 2)\npass",
+            id="continued_brackets",
+        ),
+        pytest.param(
+            "ok = 1 \\\n    != 2\n%time f()",
+            "ok = 1 \\\n    != 2\npass",
+            id="continued_backslash",
+        ),
+        pytest.param(
+            's = """\n!not a command\n"""  # (\n%time f()',
+            's = """\n!not a command\n"""  # (\npass',
+            id="triple_quoted_string",
+        ),
+    ],
+)
+def test_strip_ipython_syntax(cell_source: str, expected: str) -> None:
+    assert strip_ipython_syntax(cell_source) == expected
+
+
+def test_read_notebook_source(tmp_path: Path) -> None:
+    notebook = write_notebook(
+        tmp_path / "nb.ipynb",
+        {
+            "nbformat": 4,
+            "nbformat_minor": 5,
+            "metadata": {},
+            "cells": [
+                {"cell_type": "markdown", "source": ["import not_code\n"]},
+                {"cell_type": "code", "source": ["%load_ext foo\n", "import a\n"]},
+                {"cell_type": "code", "source": "from b import c"},
+            ],
+        },
+    )
+
+    assert read_notebook_source(str(notebook)) == "pass\nimport a\n\nfrom b import c"
+
+
+def test_read_notebook_source_nbformat_v3(tmp_path: Path) -> None:
+    notebook = write_notebook(
+        tmp_path / "nb.ipynb",
+        {
+            "nbformat": 3,
+            "metadata": {},
+            "worksheets": [
+                {"cells": [{"cell_type": "code", "input": ["import a\n"]}]},
+            ],
+        },
+    )
+
+    assert read_notebook_source(str(notebook)) == "import a"
+
+
+def test_notebook_readers_find_the_same_imports() -> None:
+    path = "tests/notebook.ipynb"
+
+    from_json = list(get_module_info_from_python_file(path))
+    from_nbconvert = list(
+        get_module_info_from_python_file(path, notebook_reader="nbconvert")
+    )
+
+    assert from_json == from_nbconvert
+    assert [i.name for i in from_json] == [("nbconvert",), ("read",)]
+
+
+def test_invalid_notebook_is_skipped(tmp_path: Path) -> None:
+    notebook = tmp_path / "broken.ipynb"
+    _ = notebook.write_text("{not json")
+
+    assert list(get_module_info_from_python_file(str(notebook))) == []
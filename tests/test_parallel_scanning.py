@@ -0,0 +1,87 @@
+import argparse
+import multiprocessing
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+from creosote import formatters
+from creosote.config import parse_jobs
+from creosote.parsers import get_module_names_from_code
+
+
+@pytest.fixture()
+def source_tree(tmp_path: Path) -> Path:
+    """Create a source tree with enough files to be split into several chunks."""
+    for i in range(40):
+        package = tmp_path / f"pkg_{i % 4}"
+        package.mkdir(exist_ok=True)
+        _ = (package / f"mod_{i}.py").write_text(
+            f"import dep_{i}\nfrom shared.sub import thing_{i % 3}\nimport os\n"
+        )
+    _ = (tmp_path / "broken.py").write_text("import (\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("include_deferred", [False, True])
+def test_parallel_scan_matches_serial_scan(
+    source_tree: Path, include_deferred: bool
+) -> None:
+    serial = get_module_names_from_code(
+        [str(source_tree)], include_deferred=include_deferred, jobs=1
+    )
+    parallel = get_module_names_from_code(
+        [str(source_tree)], include_deferred=include_deferred, jobs=4
+    )
+
+    assert parallel == serial
+    assert len(serial) == 40 + 3 + 1
+
+
+@pytest.fixture()
+def spawn_start_method() -> Iterator[None]:
+    """Start worker processes like on macOS and Windows."""
+    start_method = multiprocessing.get_start_method(allow_none=True)
+    multiprocessing.set_start_method("spawn", force=True)
+    yield
+    multiprocessing.set_start_method(start_method, force=True)
+
+
+@pytest.mark.usefixtures("spawn_start_method")
+def test_spawned_workers_log_like_the_main_process(
+    source_tree: Path,
+    capfd: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # forget the logger settings of this test afterwards
+    monkeypatch.setattr(formatters, "logger_settings", None)
+    formatters.configure_logger(verbose=False, format_="porcelain")
+    try:
+        _ = get_module_names_from_code(
+            [str(source_tree)], include_deferred=False, jobs=2
+        )
+    finally:
+        logger.remove()
+        _ = logger.add(sys.stderr)
+
+    assert capfd.readouterr().err == ""
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("1", 1), ("8", 8), (3, 3)],
+)
+def test_parse_jobs(value: str | int, expected: int) -> None:
+    assert parse_jobs(value) == expected
+
+
+def test_parse_jobs_auto() -> None:
+    assert parse_jobs("auto") >= 1
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "many"])
+def test_parse_jobs_invalid(value: str) -> None:
+    with pytest.raises(argparse.ArgumentTypeError, match="invalid jobs value"):
+        _ = parse_jobs(value)
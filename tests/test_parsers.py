@@ -1,10 +1,15 @@
+import dataclasses
 import logging
 from pathlib import Path
 
 import pytest
 from loguru import logger
 
-from creosote.parsers import get_modules_from_django_settings
+from creosote.models import ImportInfo
+from creosote.parsers import (
+    get_module_names_from_code,
+    get_modules_from_django_settings,
+)
 
 
 @pytest.mark.parametrize(
@@ -254,3 +259,28 @@ def test_get_modules_from_django_settings_not_a_list_warning(
         f"Could not find INSTALLED_APPS or MIDDLEWARE in {settings_file}."
         in caplog.text
     )
+
+
+def test_get_module_names_from_code_removes_duplicates(tmp_path: Path) -> None:
+    """Duplicate imports are removed, keeping the order of first occurrence."""
+    _ = (tmp_path / "a.py").write_text("import b_mod\nimport a_mod\nimport b_mod\n")
+    _ = (tmp_path / "b.py").write_text("import a_mod\nfrom c_mod import x as y\n")
+
+    imports = get_module_names_from_code(
+        [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    )
+
+    assert imports == [
+        ImportInfo(module=(), name=("b_mod",)),
+        ImportInfo(module=(), name=("a_mod",)),
+        ImportInfo(module=("c_mod",), name=("x",), alias="y"),
+    ]
+    assert len(set(imports)) == len(imports)
+
+
+def test_import_info_is_immutable() -> None:
+    import_info = ImportInfo.from_module_name("foo")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        import_info.alias = "bar"  # type: ignore[misc]  # pyright: ignore[reportAttributeAccessIssue]
+    assert hash(import_info) == hash(ImportInfo(module=(), name=("foo",)))
@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from creosote.projects import get_section, load_project_document
+
+
+def test_document_is_parsed_once_until_modified(tmp_path: Path) -> None:
+    path = tmp_path / "pyproject.toml"
+    _ = path.write_text('[project]\ndependencies = ["loguru"]\n')
+
+    document = load_project_document(path)
+
+    assert load_project_document(str(path)) is document
+
+    _ = path.write_text('[project]\ndependencies = ["loguru", "requests"]\n')
+    os.utime(path, ns=(0, 0))
+
+    assert get_section(load_project_document(path), "project.dependencies") == [
+        "loguru",
+        "requests",
+    ]
+
+
+def test_get_section() -> None:
+    document: dict[str, object] = {
+        "tool": {"poetry": {"dependencies": {"python": "^3.10"}}}
+    }
+
+    assert get_section(document, "tool.poetry.dependencies") == {"python": "^3.10"}
+    with pytest.raises(KeyError):
+        _ = get_section(document, "tool.pdm.dev-dependencies")
+    with pytest.raises(KeyError):
+        _ = get_section(document, "tool.poetry.dependencies.python.version")
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from creosote import requirements
+from creosote.parsers import DependencyReader
+from creosote.requirements import (
+    clear_requirements_files,
+    parse_requirement,
+    read_requirements,
+)
+
+
+@pytest.fixture(autouse=True)
+def forget_parsed_files() -> None:
+    clear_requirements_files()
+
+
+@pytest.mark.parametrize(
+    ["line", "expected_name"],
+    [
+        ("requests", "requests"),
+        ("Zope.Interface>=1", "Zope.Interface"),
+        ("boto3 >= 1.26.0, < 2", "boto3"),
+        ('foo[bar,baz]==1.0 ; python_version < "3.11"', "foo"),
+        (
+            "typing_extensions @ git+https://github.com/python/t.git",
+            "typing_extensions",
+        ),
+        ("six==1.16.0 --hash=sha256:abc --hash=sha256:def", "six"),
+        ("https://example.org/Pkg-1.0.tar.gz#egg=Pkg", "Pkg"),
+        ("https://example.org/pkg-1.0-py3-none-any.whl", "pkg"),
+        ("./local/pkg", None),
+        ("./dist/my-pkg-1.0.tar.gz", "my-pkg"),
+        ("pkg-1.0-py3-none-any.whl", "pkg"),
+        (
+            "torch @ https://download.pytorch.org/whl/cu118/"
+            + "torch-2.0.0%2Bcu118-cp311-cp311-linux_x86_64.whl",
+            "torch",
+        ),
+        ("pkg @ file:///tmp/pkg-1.0.tar.gz", "pkg"),
+    ],
+)
+def test_parse_requirement(line: str, expected_name: str | None) -> None:
+    assert parse_requirement(line) == expected_name
+
+
+def test_comment_line_ends_continuation(tmp_path: Path) -> None:
+    path = tmp_path / "requirements.txt"
+    _ = path.write_text("six \\\n# note \\\nrequests\n")
+
+    assert read_requirements(path) == ["six", "requests"]
+
+
+def test_read_hashed_requirements(tmp_path: Path) -> None:
+    path = tmp_path / "requirements.txt"
+    _ = path.write_text(
+        "# generated by pip-compile\n"
+        "--index-url https://pypi.org/simple\n"
+        "--require-hashes\n"
+        "\n"
+        "certifi==2024.2.2 \\\n"
+        "    --hash=sha256:0569859f95fc761b \\\n"
+        "    --hash=sha256:dc383c07b76109f3\n"
+        "    # via requests\n"
+        "requests==2.31.0 ; python_version >= '3.8' \\\n"
+        "    --hash=sha256:58cd2187c01e70e6\n"
+        "-e git+https://github.com/psf/black.git@4a063a9#egg=black\n"
+        "-e ./editable\n"
+    )
+
+    assert read_requirements(path) == ["certifi", "requests", "black"]
+
+
+def test_includes_are_read_once(tmp_path: Path, mocker: MockerFixture) -> None:
+    _ = (tmp_path / "base.txt").write_text("requests\n-c constraints.txt\n")
+    _ = (tmp_path / "constraints.txt").write_text("urllib3<2\n")
+    (tmp_path / "envs").mkdir()
+    for name in ("dev", "test"):
+        _ = (tmp_path / "envs" / f"{name}.txt").write_text(f"-r ../base.txt\n{name}\n")
+    _ = (tmp_path / "requirements.txt").write_text(
+        "-r envs/dev.txt\n--requirement=envs/test.txt\n-rbase.txt\n"
+    )
+    parse = mocker.spy(requirements, "parse_requirements_file")
+
+    assert read_requirements(tmp_path / "requirements.txt") == [
+        "dev",
+        "requests",
+        "test",
+    ]
+    assert read_requirements(tmp_path / "envs" / "test.txt") == ["test", "requests"]
+    assert sorted(call.args[0].name for call in parse.call_args_list) == [
+        "base.txt",
+        "dev.txt",
+        "requirements.txt",
+        "test.txt",
+    ]
+
+
+def test_circular_includes(tmp_path: Path) -> None:
+    _ = (tmp_path / "a.txt").write_text("a\n-r b.txt\n")
+    _ = (tmp_path / "b.txt").write_text("b\n-r a.txt\n")
+
+    assert read_requirements(tmp_path / "a.txt") == ["a", "b"]
+
+
+def test_fall_back_to_pip_requirements_parser(tmp_path: Path) -> None:
+    path = tmp_path / "requirements.txt"
+    _ = path.write_text("requests\n-r missing.txt\n")
+    reader = DependencyReader(deps_file=str(path), sections=[], exclude_deps=[])
+
+    assert reader.read() == ["requests"]
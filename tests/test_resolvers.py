@@ -0,0 +1,222 @@
+import sys
+from pathlib import Path
+
+from creosote.models import DependencyInfo, ImportInfo
+from creosote.resolvers import DepsResolver
+from tests.fixtures.integration import VenvManager
+
+
+def associate(imports: list[ImportInfo], dep_info: DependencyInfo) -> list[ImportInfo]:
+    resolver = DepsResolver(imports=imports, dependency_names=[], venvs=[])
+    resolver.dependencies = [dep_info]
+    resolver.resolve()
+    return dep_info.associated_imports
+
+
+def test_associate_import_by_module_path_prefix() -> None:
+    imports = [
+        ImportInfo(module=(), name=("os", "path")),
+        ImportInfo(module=(), name=("yaml", "composer")),
+        ImportInfo(module=("yaml",), name=("safe_load",)),
+        ImportInfo(module=("ruamel",), name=("yaml",)),
+    ]
+    dep_info = DependencyInfo(name="pyyaml", top_level_import_names=["yaml"])
+
+    assert associate(imports, dep_info) == [imports[1], imports[2]]
+
+
+def test_associate_import_once_per_dependency() -> None:
+    imports = [ImportInfo(module=(), name=("loguru",))]
+    dep_info = DependencyInfo(
+        name="loguru",
+        top_level_import_names=["loguru"],
+        record_import_names=["loguru"],
+        canonicalized_dep_name="loguru",
+    )
+
+    assert associate(imports, dep_info) == imports
+
+
+def test_associate_django_app() -> None:
+    imports = [ImportInfo.from_module_name("rest_framework.authtoken")]
+    dep_info = DependencyInfo(
+        name="djangorestframework", top_level_import_names=["rest_framework"]
+    )
+
+    assert associate(imports, dep_info) == imports
+
+
+def test_namespace_package_distributions_are_told_apart() -> None:
+    imports = [
+        ImportInfo(module=("google", "cloud"), name=("storage",)),
+        ImportInfo(module=(), name=("google", "protobuf", "message")),
+    ]
+    storage = DependencyInfo(
+        name="google-cloud-storage",
+        top_level_import_names=["google"],
+        record_import_names=["google.cloud.storage"],
+        canonicalized_dep_name="google_cloud_storage",
+    )
+    api_core = DependencyInfo(
+        name="google-api-core",
+        top_level_import_names=["google"],
+        record_import_names=["google.api_core"],
+        canonicalized_dep_name="google_api_core",
+    )
+    protobuf = DependencyInfo(
+        name="protobuf",
+        top_level_import_names=["google"],
+        record_import_names=["google.protobuf", "google._upb"],
+        canonicalized_dep_name="protobuf",
+    )
+    resolver = DepsResolver(imports=imports, dependency_names=[], venvs=[])
+    resolver.dependencies = [storage, api_core, protobuf]
+    resolver.resolve()
+    resolver.get_unused_dependencies()
+
+    assert storage.associated_imports == [imports[0]]
+    assert protobuf.associated_imports == [imports[1]]
+    assert resolver.unused_deps == [api_core]
+
+
+def test_distributions_from_all_venvs_are_used(venv_manager: VenvManager) -> None:
+    first, site_packages = venv_manager.create_venv("first")
+    _ = venv_manager.create_top_level_txt(site_packages, "PyYAML", ["yaml"])
+    second, site_packages = venv_manager.create_venv("second")
+    _ = venv_manager.create_top_level_txt(site_packages, "GitPython", ["git"])
+    resolver = DepsResolver(
+        imports=[
+            ImportInfo(module=(), name=("yaml",)),
+            ImportInfo(module=(), name=("git",)),
+        ],
+        dependency_names=["pyyaml", "gitpython", "unused"],
+        venvs=[str(first), str(second), str(venv_manager.temporary_path / "missing")],
+    )
+
+    assert resolver.resolve_unused_dependency_names() == ["unused"]
+
+
+def test_first_venv_takes_precedence(venv_manager: VenvManager) -> None:
+    first, site_packages = venv_manager.create_venv("first")
+    _ = venv_manager.create_top_level_txt(site_packages, "foo", ["foo_v2"], "2.0")
+    second, site_packages = venv_manager.create_venv("second")
+    _ = venv_manager.create_top_level_txt(site_packages, "foo", ["foo_v1"], "1.0")
+    resolver = DepsResolver(
+        imports=[], dependency_names=["foo"], venvs=[str(first), str(second)]
+    )
+    resolver.gather_distributions()
+    resolver.populate_dependency_info()
+
+    assert resolver.dependencies[0].top_level_import_names == ["foo_v2"]
+
+
+def test_uninstalled_dependencies_are_missing_from_any_venv(
+    venv_manager: VenvManager,
+) -> None:
+    first, site_packages = venv_manager.create_venv("first")
+    _ = venv_manager.create_top_level_txt(site_packages, "foo", ["foo"])
+    _ = venv_manager.create_top_level_txt(site_packages, "Bar", [])
+    second, site_packages = venv_manager.create_venv("second")
+    _ = venv_manager.create_top_level_txt(site_packages, "foo", ["foo"])
+    resolver = DepsResolver(
+        imports=[], dependency_names=[], venvs=[str(first), str(second)]
+    )
+    resolver.gather_distributions()
+
+    assert resolver.get_uninstalled_dependency_names(["foo", "bar", "baz"]) == [
+        "bar",
+        "baz",
+    ]
+
+
+def test_probe_venv_for_modules_of_distributions_without_metadata(
+    tmp_path: Path,
+) -> None:
+    site_packages = tmp_path / "lib" / "python3.12" / "site-packages"
+    (site_packages / "Foo_Bar-1.0.egg-info").mkdir(parents=True)
+    (site_packages / "foobar").mkdir()
+    _ = (site_packages / "foobar" / "__init__.py").write_text("raise SystemExit(1)\n")
+    # an editable install, added to sys.path by a .pth file
+    (site_packages / "editable-2.0.dist-info").mkdir()
+    _ = (site_packages / "editable-2.0.dist-info" / "RECORD").write_text(
+        "__editable__.editable-2.0.pth,sha256=abc,100\n"
+        "editable-2.0.dist-info/METADATA,sha256=abc,100\n"
+        "editable-2.0.dist-info/RECORD,,\n"
+    )
+    (tmp_path / "src").mkdir()
+    _ = (tmp_path / "src" / "editable.py").write_text("raise SystemExit(1)\n")
+    _ = (site_packages / "__editable__.editable-2.0.pth").write_text(
+        f"import sys\n{tmp_path / 'src'}\n"
+    )
+    # an editable install, using a finder which maps mypkg to its directory
+    (site_packages / "My_Pkg-0.1.dist-info").mkdir()
+    _ = (site_packages / "My_Pkg-0.1.dist-info" / "RECORD").write_text(
+        "__editable__.My_Pkg-0.1.pth,sha256=abc,100\n"
+        "__editable___My_Pkg_0_1_finder.py,sha256=abc,100\n"
+        "My_Pkg-0.1.dist-info/METADATA,sha256=abc,100\n"
+        "My_Pkg-0.1.dist-info/RECORD,,\n"
+    )
+    (tmp_path / "project" / "mypkg").mkdir(parents=True)
+    _ = (tmp_path / "project" / "mypkg" / "__init__.py").write_text(
+        "raise SystemExit(1)\n"
+    )
+    _ = (site_packages / "__editable__.My_Pkg-0.1.pth").write_text(
+        "import __editable___My_Pkg_0_1_finder; "
+        + "__editable___My_Pkg_0_1_finder.install()\n"
+    )
+    _ = (site_packages / "__editable___My_Pkg_0_1_finder.py").write_text(
+        f"MAPPING = {{'mypkg': {str(tmp_path / 'project' / 'mypkg')!r}}}\n"
+    )
+    resolver = DepsResolver(
+        imports=[
+            ImportInfo(module=(), name=("foobar",)),
+            ImportInfo(module=("editable",), name=("thing",)),
+            ImportInfo(module=(), name=("mypkg",)),
+        ],
+        dependency_names=["Foo-Bar", "editable", "My-Pkg"],
+        venvs=[str(tmp_path)],
+    )
+
+    assert resolver.resolve_unused_dependency_names() == []
+    assert resolver.dependencies[0].probed_import_names == ["foobar"]
+    assert resolver.dependencies[1].probed_import_names == ["editable"]
+    assert resolver.dependencies[2].record_import_names is None
+    assert resolver.dependencies[2].probed_import_names == ["mypkg"]
+    assert "foobar" not in sys.modules
+    assert "editable" not in sys.modules
+    assert "mypkg" not in sys.modules
+
+
+def test_modules_in_shared_namespace_package(venv_manager: VenvManager) -> None:
+    venv, site_packages = venv_manager.create_venv()
+    _ = venv_manager.create_record(
+        site_packages,
+        "google_cloud_core",
+        [
+            "google/cloud/client.py,sha256=abc,100",
+            "google/cloud/_helpers.py,sha256=abc,100",
+        ],
+    )
+    _ = venv_manager.create_record(
+        site_packages,
+        "google_cloud_storage",
+        [
+            "google/cloud/storage/__init__.py,sha256=abc,100",
+            "google/cloud/storage/blob.py,sha256=abc,100",
+        ],
+    )
+    resolver = DepsResolver(
+        imports=[
+            ImportInfo(module=("google", "cloud"), name=("storage",)),
+            # provided by neither distribution, e.g. google-cloud-bigquery
+            ImportInfo(module=("google", "cloud"), name=("bigquery",)),
+        ],
+        dependency_names=["google-cloud-core", "google-cloud-storage"],
+        venvs=[str(venv)],
+    )
+
+    assert resolver.resolve_unused_dependency_names() == ["google-cloud-core"]
+    assert resolver.dependencies[0].record_import_names == [
+        "google.cloud.client",
+        "google.cloud._helpers",
+    ]
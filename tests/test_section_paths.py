@@ -0,0 +1,92 @@
+from typing import Any
+
+import pytest
+from _pytest.capture import CaptureFixture
+
+from creosote import cli
+from tests.fixtures.integration import VenvManager
+
+
+@pytest.fixture
+def project(venv_manager: VenvManager, monkeypatch: pytest.MonkeyPatch) -> str:
+    """A project whose sections are each used by their own paths."""
+    venv_path, site_packages_path = venv_manager.create_venv()
+    for dependency_name in ["loguru", "requests", "pytest", "sphinx"]:
+        _ = venv_manager.create_record(
+            site_packages_path=site_packages_path,
+            dependency_name=dependency_name,
+            contents=[f"{dependency_name}/__init__.py,,"],
+        )
+    _ = venv_manager.create_deps_file(
+        relative_filepath="pyproject.toml",
+        contents=[
+            "[project]",
+            'dependencies = ["loguru", "requests"]',
+            "",
+            "[dependency-groups]",
+            'test = ["pytest", "loguru"]',
+            'docs = ["sphinx"]',
+            "",
+            "[tool.creosote.section-paths]",
+            '"project.dependencies" = ["src"]',
+            '"dependency-groups.test" = ["tests"]',
+            '"dependency-groups.docs" = "docs"',
+        ],
+    )
+    _ = venv_manager.create_source_file("src/app.py", ["import loguru"])
+    _ = venv_manager.create_source_file("tests/test_app.py", ["import pytest"])
+    _ = venv_manager.create_source_file("docs/conf.py", ["import sphinx.ext"])
+    monkeypatch.chdir(venv_manager.temporary_path)
+    return str(venv_path)
+
+
+def test_unused_dependencies_per_section(
+    project: str,
+    capsys: CaptureFixture[Any],  # pyright: ignore[reportExplicitAny]
+) -> None:
+    exit_code = cli.main(["--venv", project, "--format", "no-color"])
+    actual_output = capsys.readouterr().err.splitlines()
+
+    assert "Unused dependencies found in project.dependencies: requests" in (
+        actual_output
+    )
+    assert "Unused dependencies found in dependency-groups.test: loguru" in (
+        actual_output
+    )
+    assert not [line for line in actual_output if "dependency-groups.docs:" in line]
+    assert exit_code == 1
+
+
+def test_unused_dependencies_per_section_porcelain(
+    project: str,
+    capsys: CaptureFixture[Any],  # pyright: ignore[reportExplicitAny]
+) -> None:
+    exit_code = cli.main(
+        ["--venv", project, "--format", "porcelain", "--exclude-dep", "requests"]
+    )
+
+    assert capsys.readouterr().out.splitlines() == ["dependency-groups.test loguru"]
+    assert exit_code == 1
+
+
+def test_options_ignored_with_section_paths(
+    project: str,
+    capsys: CaptureFixture[Any],  # pyright: ignore[reportExplicitAny]
+) -> None:
+    _ = cli.main(["--venv", project, "--path", "lib", "--all-sections"])
+
+    assert "Ignoring --path, --all-sections, as section-paths is configured" in (
+        capsys.readouterr().err
+    )
+
+
+def test_invalid_section_paths_fail_the_run(
+    venv_manager: VenvManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _ = venv_manager.create_deps_file(
+        relative_filepath="pyproject.toml",
+        contents=["[tool.creosote.section-paths]", '"project.dependencies" = 1'],
+    )
+    monkeypatch.chdir(venv_manager.temporary_path)
+
+    assert cli.main([]) == 1
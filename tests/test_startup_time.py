@@ -0,0 +1,51 @@
+"""Guard the time it takes to import the CLI, e.g. when run as a pre-commit hook.
+
+Heavy dependencies must only be imported when a file which needs them is
+actually encountered.
+"""
+
+import subprocess
+import sys
+
+# Generous, as this is about catching regressions rather than benchmarking.
+IMPORT_BUDGET_MICROSECONDS = 500_000
+
+LAZILY_IMPORTED_MODULES = [
+    "jinja2",
+    "nbconvert",
+    "nbformat",
+    "pip_requirements_parser",
+    "creosote.conda",
+    "creosote.known_import_names",
+]
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Return the cumulative import time per module, as reported by -X importtime."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_does_not_import_heavy_dependencies() -> None:
+    times = import_times("creosote.cli")
+
+    assert "creosote.cli" in times
+    assert [m for m in LAZILY_IMPORTED_MODULES if m in times] == []
+
+
+def test_cli_import_time_budget() -> None:
+    times = import_times("creosote.cli")
+
+    assert times["creosote.cli"] < IMPORT_BUDGET_MICROSECONDS
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from creosote import distributions, resolvers
+from creosote.cache import VenvCache
+from creosote.models import ImportInfo
+from tests.fixtures.integration import VenvManager
+
+
+def resolve(venv: Path, cache_dir: Path, dependency_names: list[str]) -> list[str]:
+    return resolvers.DepsResolver(
+        imports=[ImportInfo(module=(), name=("yaml",))],
+        dependency_names=dependency_names,
+        venvs=[str(venv)],
+        venv_cache=VenvCache(str(cache_dir)),
+    ).resolve_unused_dependency_names()
+
+
+def test_unchanged_venv_is_resolved_without_reading_metadata(
+    venv_manager: VenvManager, mocker: MockerFixture
+) -> None:
+    venv, site_packages = venv_manager.create_venv()
+    _ = venv_manager.create_top_level_txt(
+        site_packages, "PyYAML", ["_yaml", "yaml"], version="6.0"
+    )
+    _ = venv_manager.create_record(
+        site_packages, "PyYAML", ["yaml/__init__.py,sha256=abc,123"], version="6.0"
+    )
+    cache_dir = venv_manager.temporary_path / "cache"
+    assert resolve(venv, cache_dir, ["pyyaml", "unused"]) == ["unused"]
+
+    from_venv = mocker.spy(distributions.VenvIndex, "from_venv")
+    read_top_level_txt = mocker.spy(resolvers, "read_top_level_txt")
+    read_record_import_names = mocker.spy(resolvers, "read_record_import_names")
+    assert resolve(venv, cache_dir, ["pyyaml", "unused"]) == ["unused"]
+
+    assert from_venv.call_count == 0
+    assert read_top_level_txt.call_count == 0
+    assert read_record_import_names.call_count == 0
+
+
+def test_venv_cache_is_invalidated_by_installing_a_distribution(
+    venv_manager: VenvManager, mocker: MockerFixture
+) -> None:
+    venv, site_packages = venv_manager.create_venv()
+    _ = venv_manager.create_top_level_txt(
+        site_packages, "PyYAML", ["_yaml", "yaml"], version="6.0"
+    )
+    _ = venv_manager.create_record(
+        site_packages, "PyYAML", ["yaml/__init__.py,sha256=abc,123"], version="6.0"
+    )
+    cache_dir = venv_manager.temporary_path / "cache"
+    assert resolve(venv, cache_dir, ["pyyaml", "loguru"]) == ["loguru"]
+
+    _ = venv_manager.create_top_level_txt(
+        site_packages, "loguru", ["yaml"], version="0.7.2"
+    )
+
+    from_venv = mocker.spy(distributions.VenvIndex, "from_venv")
+    assert resolve(venv, cache_dir, ["pyyaml", "loguru"]) == []
+    assert from_venv.call_count == 1
+
+
+def test_venv_cache_is_not_rewritten_when_unchanged(
+    venv_manager: VenvManager,
+) -> None:
+    venv, site_packages = venv_manager.create_venv()
+    _ = venv_manager.create_top_level_txt(
+        site_packages, "PyYAML", ["_yaml", "yaml"], version="6.0"
+    )
+    _ = venv_manager.create_record(
+        site_packages, "PyYAML", ["yaml/__init__.py,sha256=abc,123"], version="6.0"
+    )
+    cache_dir = venv_manager.temporary_path / "cache"
+    _ = resolve(venv, cache_dir, ["pyyaml"])
+    mtime_ns = (cache_dir / "venvs.json").stat().st_mtime_ns
+
+    _ = resolve(venv, cache_dir, ["pyyaml"])
+
+    assert (cache_dir / "venvs.json").stat().st_mtime_ns == mtime_ns
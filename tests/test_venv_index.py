@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from creosote import cli
+from creosote.distributions import VenvIndex
+from tests.fixtures.integration import VenvManager
+
+
+def test_build_index(venv_manager: VenvManager) -> None:
+    venv, site_packages = venv_manager.create_venv()
+    _ = venv_manager.create_top_level_txt(
+        site_packages, "PyYAML", ["_yaml", "yaml"], version="6.0"
+    )
+    _ = venv_manager.create_record(
+        site_packages, "GitPython", ["git/__init__.py,sha256=abc,100"], version="3.1.0"
+    )
+    tmp_path = venv_manager.temporary_path
+    output = tmp_path / "deps-index.json"
+
+    exit_code = cli.main(["index", "build", "--venv", str(venv), "-o", str(output)])
+
+    assert exit_code == 0
+    contents = json.loads(output.read_text())
+    assert contents["format"] == 1
+    assert [
+        (d["name"], d["version"], d["top_level_import_names"], d["record_import_names"])
+        for d in contents["distributions"]
+    ] == [
+        ("GitPython", "3.1.0", None, ["git"]),
+        ("PyYAML", "6.0", ["_yaml", "yaml"], None),
+    ]
+    # the index must not refer to the venv it was built from
+    assert str(tmp_path) not in output.read_text()
+
+
+def test_resolve_using_index_without_venv(
+    venv_manager: VenvManager, capsys: pytest.CaptureFixture[str]
+) -> None:
+    venv, site_packages = venv_manager.create_venv()
+    _ = venv_manager.create_top_level_txt(
+        site_packages, "PyYAML", ["_yaml", "yaml"], version="6.0"
+    )
+    _ = venv_manager.create_record(
+        site_packages, "GitPython", ["git/__init__.py,sha256=abc,100"], version="3.1.0"
+    )
+    tmp_path = venv_manager.temporary_path
+    output = tmp_path / "deps-index.json"
+    assert cli.main(["index", "build", "--venv", str(venv), "-o", str(output)]) == 0
+    source = tmp_path / "src"
+    source.mkdir()
+    _ = (source / "main.py").write_text("import yaml\n")
+    requirements = tmp_path / "requirements.txt"
+    _ = requirements.write_text("pyyaml\ngitpython\n")
+
+    exit_code = cli.main(
+        [
+            "--path",
+            str(source),
+            "--deps-file",
+            str(requirements),
+            "--venv",
+            str(tmp_path / "missing"),
+            "--venv-index",
+            str(output),
+            "--format",
+            "porcelain",
+            "--no-cache",
+        ]
+    )
+
+    assert exit_code == 1
+    assert capsys.readouterr().out.split() == ["gitpython"]
+
+
+def test_load_index_with_unsupported_format(tmp_path: Path) -> None:
+    output = tmp_path / "deps-index.json"
+    _ = output.write_text(json.dumps({"format": 99, "distributions": []}))
+
+    with pytest.raises(ValueError, match="Unsupported venv index format"):
+        _ = VenvIndex.load(str(output))
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        pytest.param("{", id="truncated"),
+        pytest.param("[]", id="not_an_object"),
+        pytest.param('{"format": 1}', id="missing_distributions"),
+        pytest.param('{"format": 1, "distributions": [{}]}', id="missing_name"),
+        pytest.param('{"format": 1, "distributions": [1]}', id="bad_distribution"),
+    ],
+)
+def test_load_invalid_index(tmp_path: Path, contents: str) -> None:
+    output = tmp_path / "deps-index.json"
+    _ = output.write_text(contents)
+
+    with pytest.raises(ValueError):
+        _ = VenvIndex.load(str(output))
+
+
+def test_invalid_index_fails_the_run(tmp_path: Path) -> None:
+    index = tmp_path / "deps-index.json"
+    _ = index.write_text('{"format": 99, "distributions": []}')
+    requirements = tmp_path / "requirements.txt"
+    _ = requirements.write_text("pyyaml\n")
+
+    exit_code = cli.main(
+        [
+            "--path",
+            str(tmp_path),
+            "--deps-file",
+            str(requirements),
+            "--venv-index",
+            str(index),
+            "--no-cache",
+        ]
+    )
+
+    assert exit_code == 1
@@ -0,0 +1,126 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from creosote.walkers import IgnoreRules, walk_source_files
+
+
+def touch(path: Path, contents: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ = path.write_text(contents)
+    return path
+
+
+def relative(paths: list[Path], root: Path) -> list[str]:
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_walk_finds_python_files_and_notebooks(tmp_path: Path) -> None:
+    _ = touch(tmp_path / "a.py")
+    _ = touch(tmp_path / "b.ipynb")
+    _ = touch(tmp_path / "c.txt")
+    _ = touch(tmp_path / "pkg" / "d.py")
+
+    found = walk_source_files([str(tmp_path)])
+
+    assert relative(found, tmp_path) == ["a.py", "b.ipynb", "pkg/d.py"]
+
+
+def test_walk_prunes_heavy_directories(tmp_path: Path) -> None:
+    _ = touch(tmp_path / "a.py")
+    for name in [".git", "node_modules", ".venv", "__pycache__"]:
+        _ = touch(tmp_path / name / "b.py")
+    _ = touch(tmp_path / "custom_env" / "pyvenv.cfg")
+    _ = touch(tmp_path / "custom_env" / "lib" / "c.py")
+
+    found = walk_source_files([str(tmp_path)])
+
+    assert relative(found, tmp_path) == ["a.py"]
+
+
+def test_walk_does_not_prune_given_root(tmp_path: Path) -> None:
+    _ = touch(tmp_path / ".venv" / "a.py")
+
+    found = walk_source_files([str(tmp_path / ".venv")])
+
+    assert relative(found, tmp_path) == [".venv/a.py"]
+
+
+def test_walk_scans_subpackages_with_generic_names(tmp_path: Path) -> None:
+    _ = touch(tmp_path / "pkg" / "build" / "a.py")
+
+    found = walk_source_files([str(tmp_path)])
+
+    assert relative(found, tmp_path) == ["pkg/build/a.py"]
+
+
+def test_walk_honours_gitignore(tmp_path: Path) -> None:
+    _ = touch(tmp_path / ".gitignore", "generated/\n*_pb2.py\n!keep_pb2.py\n")
+    _ = touch(tmp_path / "a.py")
+    _ = touch(tmp_path / "a_pb2.py")
+    _ = touch(tmp_path / "keep_pb2.py")
+    _ = touch(tmp_path / "generated" / "b.py")
+    _ = touch(tmp_path / "pkg" / ".gitignore", "/local.py\n")
+    _ = touch(tmp_path / "pkg" / "local.py")
+    _ = touch(tmp_path / "pkg" / "sub" / "local.py")
+
+    found = walk_source_files([str(tmp_path)])
+
+    assert relative(found, tmp_path) == ["a.py", "keep_pb2.py", "pkg/sub/local.py"]
+
+
+def test_walk_honours_gitignore_above_root_inside_git_repo(tmp_path: Path) -> None:
+    (tmp_path / ".git").mkdir()
+    _ = touch(tmp_path / ".gitignore", "src/skipped.py\n")
+    _ = touch(tmp_path / "src" / "a.py")
+    _ = touch(tmp_path / "src" / "skipped.py")
+
+    found = walk_source_files([str(tmp_path / "src")])
+
+    assert relative(found, tmp_path) == ["src/a.py"]
+
+
+def test_walk_exclude_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _ = touch(tmp_path / "src" / "a.py")
+    _ = touch(tmp_path / "src" / "migrations" / "0001.py")
+    _ = touch(tmp_path / "src" / "pkg" / "migrations" / "0002.py")
+    _ = touch(tmp_path / "src" / "scratch.ipynb")
+
+    found = walk_source_files(["src"], exclude_paths=["**/migrations", "src/*.ipynb"])
+
+    assert relative(found, tmp_path) == ["src/a.py"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="symlinks require privileges")
+def test_walk_detects_symlink_loops_and_duplicate_files(tmp_path: Path) -> None:
+    _ = touch(tmp_path / "pkg" / "a.py")
+    (tmp_path / "pkg" / "loop").symlink_to(tmp_path, target_is_directory=True)
+    (tmp_path / "alias.py").symlink_to(tmp_path / "pkg" / "a.py")
+
+    found = walk_source_files([str(tmp_path)])
+
+    assert relative(found, tmp_path) == ["alias.py"]
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "is_dir", "expected"),
+    [
+        ("*.py", "a.py", False, True),
+        ("*.py", "pkg/a.py", False, True),
+        ("/a.py", "pkg/a.py", False, None),
+        ("pkg/*.py", "pkg/sub/a.py", False, None),
+        ("pkg/**/a.py", "pkg/sub/deeper/a.py", False, True),
+        ("docs/", "docs", False, None),
+        ("docs/", "docs", True, True),
+        ("a[0-9].py", "a1.py", False, True),
+        ("a?.py", "ab.py", False, True),
+    ],
+)
+def test_ignore_rules_match(
+    pattern: str, path: str, is_dir: bool, expected: bool | None
+) -> None:
+    rules = IgnoreRules.from_lines(base="root", lines=[pattern])
+
+    assert rules.match(os.path.join("root", path), is_dir=is_dir) is expected
@@ -0,0 +1,96 @@
+import zipfile
+from pathlib import Path
+
+from creosote.models import ImportInfo
+from creosote.resolvers import DepsResolver
+from creosote.wheels import index_wheelhouse, read_wheel
+
+
+def make_wheel(directory: Path, filename: str, members: dict[str, str]) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / filename
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as wheel:
+        for name, contents in members.items():
+            wheel.writestr(name, contents)
+    return path
+
+
+def test_read_wheel(tmp_path: Path) -> None:
+    path = make_wheel(
+        tmp_path,
+        "PyYAML-6.0-cp312-cp312-linux_x86_64.whl",
+        {
+            "yaml/__init__.py": "",
+            "_yaml/__init__.py": "",
+            "PyYAML-6.0.dist-info/top_level.txt": "_yaml\nyaml\n",
+            "PyYAML-6.0.dist-info/RECORD": (
+                "yaml/__init__.py,sha256=abc,100\n"
+                "_yaml/__init__.py,sha256=abc,100\n"
+                "PyYAML-6.0.dist-info/RECORD,,\n"
+            ),
+        },
+    )
+
+    distribution = read_wheel(path)
+
+    assert distribution is not None
+    assert (distribution.normalized_name, distribution.version) == ("pyyaml", "6.0")
+    assert distribution.top_level_import_names == ["_yaml", "yaml"]
+    assert distribution.record_import_names == ["yaml", "_yaml"]
+
+
+def test_read_invalid_wheel(tmp_path: Path) -> None:
+    path = tmp_path / "broken-1.0-py3-none-any.whl"
+    _ = path.write_text("not a zip file")
+
+    assert read_wheel(path) is None
+
+
+def test_read_wheel_with_corrupt_member(tmp_path: Path) -> None:
+    path = make_wheel(
+        tmp_path,
+        "six-1.16.0-py3-none-any.whl",
+        {"six-1.16.0.dist-info/RECORD": "six.py,sha256=abc,100\n" * 100},
+    )
+    with zipfile.ZipFile(path) as wheel:
+        info = wheel.getinfo("six-1.16.0.dist-info/RECORD")
+    # overwrite the start of the deflated data with an invalid block type
+    data_offset = info.header_offset + 30 + len(info.filename)
+    contents = bytearray(path.read_bytes())
+    contents[data_offset : data_offset + 8] = b"\xff" * 8
+    _ = path.write_bytes(bytes(contents))
+
+    assert read_wheel(path) is None
+
+
+def test_index_nested_wheel_cache(tmp_path: Path) -> None:
+    _ = make_wheel(
+        tmp_path / "ab" / "cd",
+        "six-1.16.0-py2.py3-none-any.whl",
+        {"six-1.16.0.dist-info/RECORD": "six.py,sha256=abc,100\n"},
+    )
+    _ = make_wheel(
+        tmp_path,
+        "GitPython-3.1.0-py3-none-any.whl",
+        {"GitPython-3.1.0.dist-info/top_level.txt": "git\n"},
+    )
+
+    index = index_wheelhouse(str(tmp_path))
+
+    assert sorted(index.distributions_by_name) == ["gitpython", "six"]
+
+
+def test_resolve_using_wheelhouse_without_venv(tmp_path: Path) -> None:
+    _ = make_wheel(
+        tmp_path / "wheels",
+        "GitPython-3.1.0-py3-none-any.whl",
+        {"GitPython-3.1.0.dist-info/top_level.txt": "git\n"},
+    )
+    resolver = DepsResolver(
+        imports=[ImportInfo(module=(), name=("git",))],
+        dependency_names=["GitPython", "unused"],
+        venvs=[str(tmp_path / "missing")],
+        wheelhouses=[str(tmp_path / "wheels")],
+    )
+
+    assert resolver.resolve_unused_dependency_names() == ["unused"]